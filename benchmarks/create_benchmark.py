@@ -0,0 +1,111 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+"""Benchmark :func:`yahp.create` when no CLI arguments are in play.
+
+Compares the data-only path used by ``create(..., cli_args=False)`` against the argparse path, which builds and
+parses an :class:`~argparse.ArgumentParser` for every nested class even when the CLI is empty.
+
+Usage::
+
+    python benchmarks/create_benchmark.py --number 1000
+"""
+
+import argparse
+import timeit
+from dataclasses import dataclass
+from typing import List, Optional
+
+import yahp as hp
+from yahp.create_object.create_object import _get_hparams
+
+
+@dataclass
+class LayerHparams(hp.Hparams):
+    channels: int = hp.required('Number of channels')
+    kernel_size: int = hp.optional('Kernel size', default=3)
+    bias: bool = hp.optional('Whether to use a bias', default=True)
+    activation: str = hp.optional('Activation', default='relu')
+
+
+@dataclass
+class AdamHparams(hp.Hparams):
+    lr: float = hp.optional('Learning rate', default=1e-3)
+    betas: List[float] = hp.optional('Betas', default_factory=lambda: [0.9, 0.999])
+    weight_decay: float = hp.optional('Weight decay', default=0.0)
+
+
+@dataclass
+class SGDHparams(hp.Hparams):
+    lr: float = hp.optional('Learning rate', default=1e-1)
+    momentum: float = hp.optional('Momentum', default=0.9)
+
+
+@dataclass
+class ModelHparams(hp.Hparams):
+    hparams_registry = {'optimizer': {'adam': AdamHparams, 'sgd': SGDHparams}}
+
+    stem: LayerHparams = hp.required('Stem')
+    optimizer: hp.Hparams = hp.required('Optimizer')
+    head: Optional[LayerHparams] = hp.optional('Head', default=None)
+    name: str = hp.optional('Name', default='model')
+    seed: int = hp.optional('Seed', default=42)
+    tags: List[str] = hp.optional('Tags', default_factory=list)
+
+
+DATA = {
+    'stem': {
+        'channels': 64,
+        'kernel_size': 7
+    },
+    'head': {
+        'channels': 1000,
+        'bias': False
+    },
+    'optimizer': {
+        'adam': {
+            'lr': 3e-4
+        }
+    },
+    'name': 'resnet',
+    'tags': ['a', 'b'],
+}
+
+
+def create_with_argparse():
+    # The path taken by ``create`` before it skipped argparse without CLI args
+    argparsers: List[argparse.ArgumentParser] = []
+    hparams, _ = _get_hparams(ModelHparams,
+                              data=DATA,
+                              f=None,
+                              remaining_cli_args=[],
+                              argparsers=argparsers,
+                              lazy_argparse=False,
+                              executor=None,
+                              lazy=False)
+    # ``_add_help`` now returns early unless help is requested, so build the help parser as ``create`` used to
+    help_argparser = argparse.ArgumentParser(parents=argparsers)
+    help_argparser.parse_known_args(args=[])
+    return hparams
+
+
+def create_without_argparse():
+    return hp.create(ModelHparams, data=DATA, cli_args=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=1000, help='Number of constructions per timing')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timings; the best is reported')
+    args = parser.parse_args()
+
+    assert create_with_argparse() == create_without_argparse()
+
+    results = {}
+    for name, fn in [('argparse', create_with_argparse), ('data-only', create_without_argparse)]:
+        best = min(timeit.repeat(fn, number=args.number, repeat=args.repeat))
+        results[name] = best / args.number
+        print(f'{name:>10}: {results[name] * 1e6:8.1f} us per create()')
+    print(f'   speedup: {results["argparse"] / results["data-only"]:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
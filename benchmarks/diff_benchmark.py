@@ -0,0 +1,152 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+"""Benchmark :func:`yahp.diff` against comparing the :meth:`~yahp.hparams.Hparams.to_dict` of each config.
+
+Times diffing trial configs against a baseline:
+
+* ``one-shot``: each trial is diffed against its own baseline, so the naive approach serializes both.
+* ``sweep``: every trial is diffed against the same baseline, so the naive approach serializes the baseline once.
+
+Usage::
+
+    python benchmarks/diff_benchmark.py --trials 1000
+"""
+
+import argparse
+import copy
+import gc
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import yahp as hp
+
+
+@dataclass
+class AdamHparams(hp.Hparams):
+    lr: float = hp.optional('Learning rate', default=1e-3)
+    betas: List[float] = hp.optional('Betas', default_factory=lambda: [0.9, 0.999])
+
+
+@dataclass
+class SGDHparams(hp.Hparams):
+    lr: float = hp.optional('Learning rate', default=1e-1)
+
+
+@dataclass
+class CallbackHparams(hp.Hparams):
+    name: str = hp.optional('Name', default='')
+    interval: int = hp.optional('Interval', default=1)
+
+
+@dataclass
+class TrainerHparams(hp.Hparams):
+    hparams_registry = {
+        'optimizer': {
+            'adam': AdamHparams,
+            'sgd': SGDHparams,
+        },
+        'callbacks': {
+            'callback': CallbackHparams,
+        },
+    }
+
+    optimizer: Optional[hp.Hparams] = hp.optional('Optimizer', default=None)
+    callbacks: List[CallbackHparams] = hp.optional('Callbacks', default_factory=list)
+    model: Dict[str, Any] = hp.optional('Model', default_factory=dict)
+    epochs: int = hp.optional('Epochs', default=10)
+    seed: int = hp.optional('Seed', default=42)
+
+
+DATA = {
+    'optimizer': {
+        'adam': {
+            'lr': 1e-3
+        }
+    },
+    'callbacks': [{
+        'callback': {
+            'name': f'callback_{i}'
+        }
+    } for i in range(20)],
+    'model': {f'block_{i}': {
+        'channels': [64, 128, 256],
+        'activation': 'relu'
+    } for i in range(20)},
+}
+
+
+def create_trial(i: int) -> TrainerHparams:
+    data = copy.deepcopy(DATA)
+    data['optimizer'] = {'adam': {'lr': i * 1e-4}}
+    return TrainerHparams.create(data=data, cli_args=False)
+
+
+def _flatten(data: Any, path: str, out: Dict[str, Any]) -> Dict[str, Any]:
+    if isinstance(data, dict) and data:
+        for k, v in data.items():
+            _flatten(v, f'{path}.{k}' if path else str(k), out)
+    else:
+        out[path] = data
+    return out
+
+
+def _diff_flat(a_flat: Dict[str, Any], b_flat: Dict[str, Any]) -> List[str]:
+    return [k for k in {**a_flat, **b_flat} if k not in a_flat or k not in b_flat or a_flat[k] != b_flat[k]]
+
+
+def diff_to_dict(a: hp.Hparams, b: hp.Hparams) -> List[str]:
+    # The naive approach: serialize both configs, and compare the flattened dicts
+    return _diff_flat(_flatten(a.to_dict(), '', {}), _flatten(b.to_dict(), '', {}))
+
+
+def time_one_shot(fn: Callable[[hp.Hparams, hp.Hparams], List[str]], num_trials: int, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        pairs = [(create_trial(0), create_trial(i)) for i in range(num_trials)]
+        gc.collect()
+        start = time.perf_counter()
+        for baseline, trial in pairs:
+            fn(baseline, trial)
+        best = min(best, time.perf_counter() - start)
+    return best / num_trials
+
+
+def time_sweep(naive: bool, num_trials: int, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        trials = [create_trial(i) for i in range(num_trials)]
+        baseline = create_trial(0)
+        gc.collect()
+        start = time.perf_counter()
+        if naive:
+            baseline_flat = _flatten(baseline.to_dict(), '', {})
+            for trial in trials:
+                _diff_flat(baseline_flat, _flatten(trial.to_dict(), '', {}))
+        else:
+            for trial in trials:
+                hp.diff(baseline, trial)
+        best = min(best, time.perf_counter() - start)
+    return best / num_trials
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--trials', type=int, default=1000, help='Number of trial configs')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timings; the best is reported')
+    args = parser.parse_args()
+
+    baseline, trial = create_trial(0), create_trial(1)
+    assert hp.diff(baseline, trial) == diff_to_dict(baseline, trial) == ['optimizer.adam.lr']
+
+    timings = {
+        'one-shot': (time_one_shot(diff_to_dict, args.trials,
+                                   args.repeat), time_one_shot(hp.diff, args.trials, args.repeat)),
+        'sweep': (time_sweep(True, args.trials, args.repeat), time_sweep(False, args.trials, args.repeat)),
+    }
+    for scenario, (to_dict_time, diff_time) in timings.items():
+        print(f'{scenario:>8}: to_dict {to_dict_time * 1e6:8.1f} us, diff {diff_time * 1e6:8.1f} us per diff '
+              f'({to_dict_time / diff_time:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -64,6 +64,9 @@ setup(
         'yahp': ['py.typed'],
     },
     install_requires=install_requires,
+    entry_points={
+        'console_scripts': ['yahp-validate = yahp.validate:main'],
+    },
     extras_require=extra_deps,
     python_requires='>=3.7',
     ext_package='yahp',
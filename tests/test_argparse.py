@@ -1,8 +1,15 @@
 # Copyright 2021 MosaicML. All Rights Reserved.
 
+import argparse
+from typing import List
+
 import pytest
+import yaml
 
-from tests.yahp_fixtures import ListHparam, OptionalBooleansHparam, OptionalRequiredParentHparam, YamlInput
+import yahp.create_object.argparse
+from tests.yahp_fixtures import (DoubleNestedHparam, ListHparam, OptionalBooleansHparam, OptionalRequiredParentHparam,
+                                 YamlInput)
+from yahp.create_object.argparse import ParserArgument, cli_args_may_match
 
 
 def test_boolean_overrides_explicit(empty_object_yaml_input: YamlInput):
@@ -70,3 +77,62 @@ def test_optional_required_hparams_both():
     o = OptionalRequiredParentHparam.create(cli_args=args)
     assert o.optional_child is not None
     assert o.optional_child.required_field == 5
+
+
+def test_no_argparse_without_cli_args(monkeypatch: pytest.MonkeyPatch, double_nested_yaml_input: YamlInput):
+
+    def _no_argparse(*args, **kwargs):
+        del args, kwargs  # unused
+        raise AssertionError('argparse should not be used when there are no cli args')
+
+    monkeypatch.setattr(argparse, 'ArgumentParser', _no_argparse)
+    hparams = DoubleNestedHparam.create(double_nested_yaml_input.filename, cli_args=False)
+    assert isinstance(hparams, DoubleNestedHparam)
+    hparams = DoubleNestedHparam.create(data=double_nested_yaml_input.dict_data, cli_args=[])
+    assert isinstance(hparams, DoubleNestedHparam)
+
+
+@pytest.mark.parametrize('cli_args,expected', [
+    [['--intfield', '1'], True],
+    [['--int', '1'], True],
+    [['--intfield=1'], True],
+    [['-fconfig.yaml'], True],
+    [['--floatfield', '1'], False],
+    [['positional'], False],
+    [['--', '--floatfield'], True],
+])
+def test_cli_args_may_match(cli_args: List[str], expected: bool):
+    assert cli_args_may_match(cli_args, ['-f', '--intfield']) == expected
+
+
+def test_help_not_formatted_without_help_flag(monkeypatch: pytest.MonkeyPatch, double_nested_yaml_input: YamlInput):
+
+    def _no_helptext(*args, **kwargs):
+        del args, kwargs  # unused
+        raise AssertionError('help should not be formatted unless --help is passed')
+
+    monkeypatch.setattr(yahp.create_object.argparse, '_get_helptext', _no_helptext)
+    hparams = DoubleNestedHparam.create(
+        double_nested_yaml_input.filename,
+        cli_args=['--nested_hparams.primitive_hparam.intfield', '2'],
+    )
+    assert hparams.nested_hparams.primitive_hparam.intfield == 2
+
+
+def test_help_includes_nested_args(capsys: pytest.CaptureFixture, double_nested_yaml_input: YamlInput):
+    with pytest.raises(SystemExit):
+        DoubleNestedHparam.create(double_nested_yaml_input.filename, cli_args=['--help'])
+    out = capsys.readouterr().out
+    assert '--nested_hparams.primitive_hparam.intfield' in out
+    assert '--save_template' in out
+
+
+def test_parser_argument_str():
+    arg = ParserArgument(full_name='model.depth', get_helptext=lambda: 'Depth of the model', nargs=None)
+    assert yaml.safe_load(str(arg)) == {
+        'full_name': 'model.depth',
+        'helptext': 'Depth of the model',
+        'nargs': None,
+        'choices': None,
+        'short_name': None,
+    }
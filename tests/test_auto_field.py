@@ -127,3 +127,39 @@ def test_bad_docstring_ignore_errors(constructor: Callable, mock_required_field:
 def test_bad_docstring_raise_exceptions(constructor: Callable):
     with pytest.raises((docstring_parser.ParseError, ValueError)):
         hp.auto(constructor, 'foo')
+
+
+@pytest.mark.parametrize('constructor', [FooClassDocstring, FooClassAndInitDocstring, foo_func])
+def test_auto_fields(constructor: Callable):
+    fields = hp.auto_fields(constructor)
+    assert list(fields) == ['required', 'optional']
+    assert fields['required'].metadata['doc'] == 'Required parameter.'
+    assert fields['optional'].metadata['doc'] == 'Optional parameter. (default: ``5``)'
+    assert fields['optional'].default == 5
+
+
+def test_docstring_parsed_once(monkeypatch: pytest.MonkeyPatch):
+    mock = Mock(wraps=docstring_parser.parse)
+    monkeypatch.setattr(docstring_parser, 'parse', mock)
+
+    class Foo:
+        """Foo.
+
+        Args:
+            a (int): A.
+            b (int): B.
+            c (int, optional): C.
+        """
+
+        def __init__(self, a: int, b: int, c: int = 0):
+            del a, b, c  # unused
+
+    hp.auto_fields(Foo)
+    hp.auto(Foo, 'a')
+    hp.auto(Foo, 'b')
+    assert mock.call_count == 1
+
+    # Changing the docstring invalidates the cache
+    Foo.__doc__ = Foo.__doc__.replace('A.', 'New A.')
+    assert hp.auto(Foo, 'a').metadata['doc'] == 'New A.'
+    assert mock.call_count == 2
@@ -1,11 +1,14 @@
 import abc
 import dataclasses
+import gc
 import sys
+import weakref
 from typing import Any, Callable, Dict, Optional, TextIO, Type, Union
 
 import pytest
 
 import yahp as hp
+import yahp.auto_hparams
 from yahp.auto_hparams import generate_hparams_cls
 from yahp.serialization import serialize
 from yahp.types import JSON
@@ -356,3 +359,113 @@ def test_any_arg(any_arg: Any):
     assert type(instance.any_arg) == type(any_arg)
     assert instance.any_arg == any_arg
     assert serialize(instance) == config
+
+
+def test_ensure_hparams_cls_is_cached():
+    hparams_cls = hp.ensure_hparams_cls(PrimitiveClass)
+    assert hp.ensure_hparams_cls(PrimitiveClass) is hparams_cls
+    assert hp.ensure_hparams_cls(PrimitiveClass, ignore_docstring_errors=True) is not hparams_cls
+
+    hp.clear_hparams_cls_cache(PrimitiveClass)
+    assert hp.ensure_hparams_cls(PrimitiveClass) is not hparams_cls
+
+
+def test_ensure_hparams_cls_cache_releases_cleared_constructors():
+
+    def make_constructor():
+
+        class TransientClass:
+            """Class
+
+            Args:
+                int_arg: Docstring
+            """
+
+            def __init__(self, int_arg: int) -> None:
+                self.int_arg = int_arg
+
+        return TransientClass
+
+    constructor = make_constructor()
+    hparams_cls = hp.ensure_hparams_cls(constructor)
+    constructor_ref = weakref.ref(constructor)
+    del constructor
+    gc.collect()
+    # The cached class keeps its constructor alive, so it can still be initialized
+    assert hparams_cls(int_arg=42).initialize_object().int_arg == 42
+
+    constructor = constructor_ref()
+    assert constructor in yahp.auto_hparams._generated_hparams_cls_cache
+    hp.clear_hparams_cls_cache(constructor)
+    del constructor, hparams_cls
+    gc.collect()
+    assert constructor_ref() is None
+
+
+def test_ensure_hparams_cls_cache_is_bounded(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(yahp.auto_hparams, '_GENERATED_HPARAMS_CLS_CACHE_SIZE', 2)
+
+    def make_constructor():
+
+        def constructor(int_arg: int):
+            """Constructor
+
+            Args:
+                int_arg: Docstring
+            """
+            return int_arg
+
+        return constructor
+
+    first = make_constructor()
+    first_ref = weakref.ref(first)
+    hparams_cls = hp.ensure_hparams_cls(first)
+    # Constructors defined locally are released once they are the least recently used
+    for _ in range(2):
+        hp.ensure_hparams_cls(make_constructor())
+    assert len(yahp.auto_hparams._generated_hparams_cls_cache) <= 2
+    assert first not in yahp.auto_hparams._generated_hparams_cls_cache
+    del first, hparams_cls
+    gc.collect()
+    assert first_ref() is None
+
+
+class PrimitiveFactory:
+
+    def make(self, int_arg: int) -> PrimitiveClass:
+        """Make
+
+        Args:
+            int_arg: Docstring
+        """
+        return PrimitiveClass(int_arg)
+
+
+def test_ensure_hparams_cls_bound_method():
+    hparams_cls = hp.ensure_hparams_cls(PrimitiveFactory().make)
+    gc.collect()
+    assert hparams_cls(int_arg=42).initialize_object().int_arg == 42
+    assert len([k for k in yahp.auto_hparams._generated_hparams_cls_cache if isinstance(k, PrimitiveFactory)]) == 0
+
+
+def test_ensure_hparams_cls_reads_registry_on_use():
+
+    class RegistryClass:
+        """Class
+
+        Args:
+            item: Docstring
+        """
+
+        hparams_registry = {'item': {'concrete': ConcreteClass}}
+
+        def __init__(self, item: AbstractClass) -> None:
+            self.item = item
+
+    hparams_cls = hp.ensure_hparams_cls(RegistryClass)
+    assert hparams_cls.hparams_registry is RegistryClass.hparams_registry
+    RegistryClass.hparams_registry = {'item': {'other': ConcreteClass}}
+    assert hparams_cls.hparams_registry is RegistryClass.hparams_registry
+    instance = hp.create(RegistryClass, {'item': {'other': {'int_arg': 1}}}, cli_args=False)
+    assert instance.item.int_arg == 1
+    hp.clear_hparams_cls_cache(RegistryClass)
@@ -0,0 +1,220 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import pytest
+
+import yahp as hp
+from tests.yahp_fixtures import (BearsHparams, ChoiceThreeHparam, DoubleNestedHparam, HairyBearsHparams,
+                                 KitchenSinkHparams, ListHparam, OptionalBooleansHparam, OptionalRequiredParentHparam,
+                                 PrimitiveHparam, YamlInput)
+from yahp.inheritance import load_yaml_with_inheritance
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'commented_map.yaml')
+
+
+def _assert_equivalent(constructor: Callable, data: Dict[str, Any]):
+    """Assert that ``compile_create`` and ``create`` produce the same object, or raise the same error."""
+    try:
+        expected = hp.create(constructor, data=data, cli_args=False)
+    except Exception as e:
+        with pytest.raises(type(e)) as exc_info:
+            hp.compile_create(constructor)(data)
+        assert str(exc_info.value) == str(e)
+    else:
+        actual = hp.compile_create(constructor)(data)
+        assert type(actual) is type(expected)
+        if isinstance(expected, hp.Hparams):
+            assert actual == expected
+            assert actual.to_dict() == expected.to_dict()
+        return actual
+
+
+def test_compiled_primitives(primitive_yaml_input: YamlInput):
+    _assert_equivalent(PrimitiveHparam, primitive_yaml_input.dict_data)
+
+
+def test_compiled_nested(double_nested_yaml_input: YamlInput):
+    _assert_equivalent(DoubleNestedHparam, double_nested_yaml_input.dict_data)
+
+
+def test_compiled_choice(choice_three_two_yaml_input: YamlInput, choice_three_one_yaml_input: YamlInput):
+    _assert_equivalent(ChoiceThreeHparam, choice_three_two_yaml_input.dict_data)
+    _assert_equivalent(ChoiceThreeHparam, choice_three_one_yaml_input.dict_data)
+
+
+def test_compiled_kitchen_sink():
+    data = load_yaml_with_inheritance(FIXTURE_PATH)
+    data['required_int_field'] = 2
+    data['required_bool_field'] = False
+    data['required_choice'] = {'one': {'commonfield': True, 'intfield': 5}}
+    data['required_choice_list'] = {'one': {'commonfield': True, 'intfield': 5}, 'one+1': {'commonfield': False}}
+    _assert_equivalent(KitchenSinkHparams, data)
+
+
+@pytest.mark.parametrize('data', [
+    {},
+    {
+        'optional_child': {}
+    },
+    {
+        'optional_child': None
+    },
+    {
+        'optional_child': {
+            'required_field': 5
+        }
+    },
+    {
+        'optional_child': {
+            'required_field': 5
+        },
+        'unknown_field': 1
+    },
+])
+def test_compiled_optional_required(data: Dict[str, Any]):
+    _assert_equivalent(OptionalRequiredParentHparam, data)
+
+
+@pytest.mark.parametrize('data', [
+    {
+        'bears': [{
+            'shaved_bears': {
+                'first_action': 'a',
+                'last_action': 'b'
+            }
+        }, {
+            'unshaved_bears': {
+                'second_action': 'c',
+                'third_action': 'd'
+            }
+        }]
+    },
+    {
+        'bears': {
+            'shaved_bears': {
+                'first_action': 'a',
+                'last_action': 'b'
+            },
+            'shaved_bears+1': {
+                'first_action': 'c',
+                'last_action': 'd'
+            },
+        }
+    },
+    {
+        'bears': None
+    },
+    {
+        'bears': 'shaved_bears'
+    },
+])
+def test_compiled_registry_list(data: Dict[str, Any]):
+    _assert_equivalent(BearsHparams, data)
+
+
+def test_compiled_concrete_list():
+    data = {'bears': [{'second_action': 'a', 'third_action': 'b'}, {'second_action': 'c', 'third_action': 'd'}]}
+    _assert_equivalent(HairyBearsHparams, data)
+
+
+@pytest.mark.parametrize('data', [
+    {},
+    {
+        'list_of_str': ['a', 'b'],
+        'list_of_int': [1, '2'],
+        'list_of_bool': ['true', False],
+    },
+    {
+        'list_of_int': 'not_an_int'
+    },
+])
+def test_compiled_lists(data: Dict[str, Any]):
+    _assert_equivalent(ListHparam, data)
+
+
+def test_compiled_env_var(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv('DEFAULT_FALSE', 'true')
+    actual = _assert_equivalent(OptionalBooleansHparam, {})
+    assert actual.default_false is True
+
+
+class Conv:
+    """Conv Docstring
+
+    Args:
+        channels (int): Number of channels.
+        bias (bool, optional): Whether to use a bias.
+    """
+
+    def __init__(self, channels: int, bias: bool = True):
+        self.channels = channels
+        self.bias = bias
+
+
+class Model:
+    """Model Docstring
+
+    Args:
+        backbone (Conv): The backbone.
+        head (Conv, optional): The head.
+    """
+
+    def __init__(self, backbone: Conv, head: Optional[Conv] = None):
+        self.backbone = backbone
+        self.head = head
+
+
+def test_compiled_auto_yahp():
+    create_model = hp.compile_create(Model)
+    model = create_model({'backbone': {'channels': 3}, 'head': {'channels': 8, 'bias': False}})
+    assert isinstance(model, Model)
+    assert (model.backbone.channels, model.backbone.bias) == (3, True)
+    assert (model.head.channels, model.head.bias) == (8, False)
+    assert hp.serialize(model) == hp.serialize(hp.create(Model, data=hp.serialize(model), cli_args=False))
+
+
+def test_compiled_missing_required():
+    with pytest.raises(ValueError, match='required fields were not included'):
+        hp.compile_create(Conv)({})
+
+
+def test_compiled_is_reusable():
+    create_model = hp.compile_create(Model)
+    first = create_model({'backbone': {'channels': 1}})
+    second = create_model({'backbone': {'channels': 1}})
+    assert first is not second
+    assert first.backbone is not second.backbone
+    assert first.head is None
+
+
+@dataclass
+class RecursiveHparams(hp.Hparams):
+    child: Optional['RecursiveHparams'] = hp.optional('child', default=None)
+
+
+def test_compiled_recursive():
+    _assert_equivalent(RecursiveHparams, {'child': {'child': {'child': None}}})
+
+
+def test_compiled_non_dict_data():
+    with pytest.raises(TypeError):
+        hp.compile_create(PrimitiveHparam)(['not', 'a', 'dict'])  # type: ignore
+
+
+class Sequences:
+    """Sequences.
+
+    Args:
+        values (Sequence[int]): The values.
+    """
+
+    def __init__(self, values: Sequence[int]):
+        self.values = values
+
+
+def test_compiled_abstract_type():
+    # Abstract types from ``typing`` raise the same error as ``create``
+    _assert_equivalent(Sequences, {'values': {'a': 1}})
@@ -0,0 +1,101 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+
+import concurrent.futures
+import threading
+from dataclasses import dataclass
+from typing import List, Optional
+
+import pytest
+
+import yahp as hp
+
+_barrier: Optional[threading.Barrier] = None
+
+
+class Dataset:
+    """Dataset
+
+    Args:
+        name (str): The name.
+    """
+
+    def __init__(self, name: str):
+        if _barrier is not None:
+            # Block until all siblings are being initialized at the same time
+            _barrier.wait()
+        if name == 'error':
+            raise RuntimeError('Failed to load the dataset')
+        self.name = name
+
+
+class Trainer:
+    """Trainer
+
+    Args:
+        train (Dataset): The train dataset.
+        eval (Dataset): The eval dataset.
+        extra (List[Dataset], optional): Extra datasets.
+    """
+
+    def __init__(self, train: Dataset, eval: Dataset, extra: Optional[List[Dataset]] = None):
+        self.train = train
+        self.eval = eval
+        self.extra = extra
+
+
+@dataclass
+class TrainerHparams(hp.Hparams):
+    hparams_registry = {'datasets': {'dataset': Dataset}}
+
+    datasets: List[Dataset] = hp.required('Datasets')
+
+
+@pytest.fixture
+def barrier(monkeypatch: pytest.MonkeyPatch):
+    barrier = threading.Barrier(2, timeout=10)
+    monkeypatch.setitem(globals(), '_barrier', barrier)
+    return barrier
+
+
+def test_executor_initializes_siblings_concurrently(barrier: threading.Barrier):
+    del barrier  # unused
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        trainer = hp.create(Trainer,
+                            data={
+                                'train': {
+                                    'name': 'train'
+                                },
+                                'eval': {
+                                    'name': 'eval'
+                                }
+                            },
+                            cli_args=False,
+                            executor=executor)
+    assert trainer.train.name == 'train'
+    assert trainer.eval.name == 'eval'
+    assert hp.serialize(trainer) == {'train': {'name': 'train'}, 'eval': {'name': 'eval'}, 'extra': None}
+
+
+@pytest.mark.parametrize('cli_args', [False, ['--datasets', 'dataset', 'dataset+1', 'dataset+2']])
+def test_executor_preserves_order(cli_args):
+    data = {'datasets': [{'dataset': {'name': 'a'}}, {'dataset+1': {'name': 'b'}}, {'dataset+2': {'name': 'c'}}]}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+        hparams = TrainerHparams.create(data=data, cli_args=cli_args, executor=executor)
+    assert [x.name for x in hparams.datasets] == ['a', 'b', 'c']
+    assert hparams.to_dict() == TrainerHparams.create(data=data, cli_args=False).to_dict()
+
+
+def test_executor_propagates_errors():
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        with pytest.raises(RuntimeError, match='Failed to load the dataset'):
+            hp.create(Trainer,
+                      data={
+                          'train': {
+                              'name': 'train'
+                          },
+                          'eval': {
+                              'name': 'error'
+                          }
+                      },
+                      cli_args=False,
+                      executor=executor)
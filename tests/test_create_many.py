@@ -0,0 +1,116 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+
+import io
+import itertools
+import json
+import pathlib
+from typing import Any, Dict, List
+
+import pytest
+import yaml
+
+import yahp as hp
+from tests.yahp_fixtures import ChoiceThreeHparam, OptionalRequiredParentHparam, YamlInput
+
+
+def _get_datas(n: int) -> List[Dict[str, Any]]:
+    return [{'optional_child': {'required_field': i}} for i in range(n)]
+
+
+@pytest.mark.parametrize('num_workers', [0, 2])
+def test_create_many(num_workers: int):
+    datas = _get_datas(10)
+    results = list(hp.create_many(OptionalRequiredParentHparam, datas, num_workers=num_workers, chunksize=3))
+    expected = [OptionalRequiredParentHparam.create(data=data, cli_args=False) for data in datas]
+    assert results == expected
+
+
+def test_create_many_in_pool_is_bounded():
+    datas = ({'optional_child': {'required_field': i}} for i in itertools.count())
+    results = hp.create_many(OptionalRequiredParentHparam, datas, num_workers=2, chunksize=2)
+    values = [x.optional_child.required_field for x in itertools.islice(results, 5)]
+    assert values == [0, 1, 2, 3, 4]
+    results.close()
+
+
+def test_create_many_is_lazy():
+    results = hp.create_many(OptionalRequiredParentHparam, [{'optional_child': {}}])
+    with pytest.raises(ValueError, match='optional_child.required_field'):
+        next(results)
+
+
+def test_create_many_from_files(tmp_path: pathlib.Path, choice_three_one_yaml_input: YamlInput):
+    filepath = tmp_path / 'data.yaml'
+    with open(filepath, 'w') as f:
+        yaml.safe_dump(_get_datas(1)[0], f)
+    parent, empty = list(hp.create_many(OptionalRequiredParentHparam, [filepath, None]))
+    assert parent.optional_child is not None
+    assert parent.optional_child.required_field == 0
+    assert empty.optional_child is None
+
+    choice, = hp.create_many(ChoiceThreeHparam, [choice_three_one_yaml_input.filename])
+    assert choice == ChoiceThreeHparam.create(choice_three_one_yaml_input.filename, cli_args=False)
+
+
+@pytest.mark.parametrize('kwargs', [{'num_workers': -1}, {'chunksize': 0}])
+def test_create_many_invalid_args(kwargs: Dict[str, int]):
+    with pytest.raises(ValueError):
+        hp.create_many(OptionalRequiredParentHparam, [], **kwargs)
+
+
+@pytest.mark.parametrize('file_format', ['yaml', 'jsonl', 'json'])
+def test_create_iter(tmp_path: pathlib.Path, file_format: str):
+    # A JSON file holds a single document
+    datas = _get_datas(1 if file_format == 'json' else 5)
+    filepath = tmp_path / f'manifest.{file_format}'
+    with open(filepath, 'w') as f:
+        if file_format == 'yaml':
+            yaml.safe_dump_all(datas + [None], f)
+        elif file_format == 'json':
+            json.dump(datas[0], f)
+        else:
+            for data in datas:
+                f.write(json.dumps(data) + '\n\n')
+    expected = [OptionalRequiredParentHparam.create(data=data, cli_args=False) for data in datas]
+    assert list(hp.create_iter(OptionalRequiredParentHparam, filepath)) == expected
+    assert list(OptionalRequiredParentHparam.create_stream(str(filepath))) == expected
+    with open(filepath, 'r') as f:
+        assert list(OptionalRequiredParentHparam.create_stream(f, file_format=file_format)) == expected
+
+
+def test_create_iter_is_lazy():
+    # Documents after an invalid one are not read until the iterator reaches them
+    manifest = io.StringIO('optional_child: {required_field: 1}\n---\noptional_child: {}\n---\n[not, yaml: [\n')
+    results = OptionalRequiredParentHparam.create_stream(manifest)
+    first = next(results)
+    assert first.optional_child is not None and first.optional_child.required_field == 1
+    with pytest.raises(ValueError, match='optional_child.required_field'):
+        next(results)
+
+
+def test_create_iter_inheritance(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    with open(tmp_path / 'base.yaml', 'w') as f:
+        yaml.safe_dump({'optional_child': {'required_field': 7}}, f)
+    with open(tmp_path / 'manifest.yaml', 'w') as f:
+        yaml.safe_dump_all([{'inherits': 'base.yaml'}, {'optional_child': {'inherits': 'base.yaml'}}], f)
+
+    # The base is read once, no matter how many documents inherit from it
+    num_opens = 0
+    builtin_open = open
+
+    def counting_open(file, *args, **kwargs):
+        nonlocal num_opens
+        num_opens += 1
+        return builtin_open(file, *args, **kwargs)
+
+    monkeypatch.setattr('builtins.open', counting_open)
+    results = list(hp.create_iter(OptionalRequiredParentHparam, tmp_path / 'manifest.yaml'))
+    assert [result.optional_child.required_field for result in results] == [7, 7]
+    assert num_opens == 2
+
+
+def test_create_iter_invalid():
+    with pytest.raises(ValueError, match='file_format must be one of'):
+        hp.create_iter(OptionalRequiredParentHparam, io.StringIO(''), file_format='csv')
+    with pytest.raises(TypeError, match='Document 1 of .* must be a dict'):
+        list(hp.create_iter(OptionalRequiredParentHparam, io.StringIO('{}\n---\n[1, 2]\n')))
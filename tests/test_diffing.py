@@ -0,0 +1,208 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+
+import copy
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+import yahp as hp
+from yahp import serialization
+
+
+@dataclass
+class DiffOptimizerHparams(hp.Hparams):
+    lr: float = hp.optional('lr', default=0.1)
+    betas: List[float] = hp.optional('betas', default_factory=lambda: [0.9, 0.99])
+
+
+@dataclass
+class DiffOtherOptimizerHparams(hp.Hparams):
+    lr: float = hp.optional('lr', default=0.1)
+
+
+@dataclass
+class DiffCallbackHparams(hp.Hparams):
+    name: str = hp.optional('name', default='')
+
+
+@dataclass
+class DiffTrainerHparams(hp.Hparams):
+    hparams_registry = {
+        'optimizer': {
+            'adam': DiffOptimizerHparams,
+            'sgd': DiffOtherOptimizerHparams,
+        },
+        'callbacks': {
+            'callback': DiffCallbackHparams,
+        },
+    }
+
+    optimizer: Optional[hp.Hparams] = hp.optional('optimizer', default=None)
+    callbacks: List[DiffCallbackHparams] = hp.optional('callbacks', default_factory=list)
+    steps: List[DiffCallbackHparams] = hp.optional('steps', default_factory=list)
+    extra: Dict[str, Any] = hp.optional('extra', default_factory=dict)
+    epochs: int = hp.optional('epochs', default=10)
+
+
+_BASELINE = {
+    'optimizer': {
+        'adam': {
+            'lr': 0.1,
+        }
+    },
+    'callbacks': [{
+        'callback': {
+            'name': 'a'
+        }
+    }, {
+        'callback': {
+            'name': 'b'
+        }
+    }],
+    'steps': [{
+        'name': 'x'
+    }],
+    'extra': {
+        'model': {
+            'depth': 4,
+            'width': 8,
+        },
+    },
+}
+
+
+def _create(**overrides: Any) -> DiffTrainerHparams:
+    data = copy.deepcopy(_BASELINE)
+    data.update(overrides)
+    return DiffTrainerHparams.create(data=data, cli_args=False)
+
+
+@pytest.mark.parametrize('overrides,expected', [
+    ({}, []),
+    ({
+        'epochs': 20
+    }, ['epochs']),
+    ({
+        'optimizer': {
+            'adam': {
+                'lr': 0.01
+            }
+        }
+    }, ['optimizer.adam.lr']),
+    ({
+        'optimizer': {
+            'adam': {
+                'betas': [0.9, 0.9]
+            }
+        }
+    }, ['optimizer.adam.betas.1']),
+    ({
+        'optimizer': {
+            'sgd': {}
+        }
+    }, ['optimizer.adam', 'optimizer.sgd']),
+    ({
+        'callbacks': [{
+            'callback': {
+                'name': 'a'
+            }
+        }, {
+            'callback': {
+                'name': 'c'
+            }
+        }]
+    }, ['callbacks.callback+1.name']),
+    ({
+        'callbacks': [{
+            'callback': {
+                'name': 'a'
+            }
+        }]
+    }, ['callbacks.callback+1']),
+    ({
+        'steps': [{
+            'name': 'y'
+        }]
+    }, ['steps.0.name']),
+    ({
+        'steps': [{
+            'name': 'x'
+        }, {
+            'name': 'y'
+        }]
+    }, ['steps']),
+    ({
+        'extra': {
+            'model': {
+                'depth': 4,
+                'width': 16
+            },
+            'seed': 1
+        }
+    }, ['extra.model.width', 'extra.seed']),
+])
+def test_diff(overrides: Dict[str, Any], expected: List[str]):
+    baseline = _create()
+    trial = _create(**overrides)
+    assert hp.diff(baseline, trial) == expected
+    assert sorted(hp.diff(trial, baseline)) == sorted(expected)
+    # Diffing again uses the cached keys, and gives the same result
+    assert hp.diff(baseline, trial) == expected
+
+
+def test_diff_without_registry_keys():
+    # Hparams constructed directly are not tracked, so the keys are found from the registry
+    baseline = DiffTrainerHparams(optimizer=DiffOptimizerHparams())
+    trial = DiffTrainerHparams(optimizer=DiffOptimizerHparams(lr=0.5))
+    assert hp.diff(baseline, trial) == ['optimizer.adam.lr']
+    assert hp.diff(trial, DiffTrainerHparams(optimizer=None)) == ['optimizer']
+
+
+def test_diff_different_classes():
+    assert hp.diff(DiffOptimizerHparams(), DiffOtherOptimizerHparams()) == ['betas']
+    assert hp.diff(DiffOtherOptimizerHparams(), DiffOtherOptimizerHparams()) == []
+
+
+def test_diff_compares_values():
+    # Values are compared by their canonical JSON, as in the fingerprint
+    nan = DiffOtherOptimizerHparams(lr=float('nan'))
+    assert hp.diff(nan, DiffOtherOptimizerHparams(lr=float('nan'))) == []
+    assert hp.diff(nan, DiffOtherOptimizerHparams(lr=0.1)) == ['lr']
+    assert hp.diff(DiffOtherOptimizerHparams(lr=1), DiffOtherOptimizerHparams(lr=1.0)) == ['lr']
+    assert hp.diff(DiffOtherOptimizerHparams(lr=0.0), DiffOtherOptimizerHparams(lr=-0.0)) == ['lr']
+    assert hp.diff(_create(extra={'seed': 1}), _create(extra={'seed': True})) == ['extra.seed']
+    assert hp.diff(_create(extra={'a': [1], 'b': 2}), _create(extra={'b': 2, 'a': [1]})) == []
+
+
+@pytest.mark.parametrize('x,y', [(1, 1.0), (0.0, -0.0), (True, 1), (float('nan'), float('nan')), (0.1, 0.1)])
+def test_diff_matches_fingerprint(x: Any, y: Any):
+    a, b = _create(extra={'value': [x]}), _create(extra={'value': [y]})
+    assert (hp.diff(a, b) == []) == (a.fingerprint() == b.fingerprint())
+
+
+def test_diff_detects_modifications():
+    baseline, trial = _create(), _create()
+    assert hp.diff(baseline, trial) == []
+    trial.optimizer.lr = 0.5
+    assert hp.diff(baseline, trial) == ['optimizer.adam.lr']
+    trial.optimizer.lr = 0.1
+    trial.epochs = 5
+    assert hp.diff(baseline, trial) == ['epochs']
+    trial.epochs = baseline.epochs
+    trial.optimizer.betas.append(0.5)
+    assert hp.diff(baseline, trial) == ['optimizer.adam.betas']
+
+
+def test_diff_skips_identical_subtrees(monkeypatch: pytest.MonkeyPatch):
+    baseline = _create()
+    trial = _create(epochs=20)
+    trial.optimizer = baseline.optimizer
+
+    def fail(cls):
+        raise AssertionError('to_dict should not be called')
+
+    # Nested hparams are compared field by field, and the same instance is skipped, so nothing is serialized
+    monkeypatch.setattr(serialization, 'get_to_dict_serializer', fail)
+    assert hp.diff(baseline, trial) == ['epochs']
+    assert hp.diff(baseline, _create(epochs=30)) == ['epochs']
@@ -0,0 +1,58 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+
+import dataclasses
+from typing import List, Optional
+
+import pytest
+
+import yahp as hp
+from yahp.utils.field_plan import clear_hparams_plan_cache, get_hparams_plan
+from yahp.utils.type_helpers import HparamsType
+
+
+@dataclasses.dataclass
+class PlanChildHparams(hp.Hparams):
+    x: int = hp.optional('x', default=1)
+
+
+@dataclasses.dataclass
+class PlanParentHparams(hp.Hparams):
+    hparams_registry = {'children': {'child': PlanChildHparams}}
+
+    name: str = hp.required('name')
+    children: Optional[List[PlanChildHparams]] = hp.optional('children', default=None)
+    not_init: int = dataclasses.field(init=False, default=0)
+
+
+def test_hparams_plan():
+    plan = get_hparams_plan(PlanParentHparams)
+    assert [f.name for f in plan.fields] == ['name', 'children']
+    assert plan.required_names == {'name'}
+
+    name_plan = plan.by_name['name']
+    assert name_plan.required
+    assert name_plan.doc == 'name'
+    assert name_plan.registry is None
+    assert name_plan.hparams_type.type is str
+
+    children_plan = plan.by_name['children']
+    assert not children_plan.required
+    assert children_plan.get_default_value() is None
+    assert children_plan.registry is PlanParentHparams.hparams_registry['children']
+    assert isinstance(children_plan.hparams_type, HparamsType)
+    assert children_plan.hparams_type.is_list and children_plan.hparams_type.is_optional
+
+
+def test_hparams_plan_is_cached():
+    plan = get_hparams_plan(PlanParentHparams)
+    assert get_hparams_plan(PlanParentHparams) is plan
+    clear_hparams_plan_cache(PlanParentHparams)
+    assert get_hparams_plan(PlanParentHparams) is not plan
+
+
+def test_hparams_plan_rebuilt_on_registry_reassignment(monkeypatch: pytest.MonkeyPatch):
+    plan = get_hparams_plan(PlanParentHparams)
+    monkeypatch.setattr(PlanParentHparams, 'hparams_registry', None)
+    new_plan = get_hparams_plan(PlanParentHparams)
+    assert new_plan is not plan
+    assert new_plan.by_name['children'].registry is None
@@ -1,14 +1,125 @@
 # Copyright 2021 MosaicML. All Rights Reserved.
 
+import collections.abc
 import copy
+import json
 import os
 import pathlib
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 import pytest
 import yaml
 
-from yahp.inheritance import (_OverriddenValue, _recursively_update_leaf_data_items, _unwrap_overridden_value_dict,
-                              load_yaml_with_inheritance, preprocess_yaml_with_inheritance)
+from yahp.inheritance import (_data_by_path, _get_inherits_paths, clear_yaml_cache, load_yaml_with_inheritance,
+                              preprocess_yaml_with_inheritance)
+from yahp.types import JSON
+from yahp.utils import yaml_helpers
+from yahp.utils.iter_helpers import ListOfSingleItemDict, is_list_of_single_item_dicts
+
+# The original implementation of inheritance, which walks from the root of the document for each inherited leaf,
+# wraps inherited values in ``_OverriddenValue``, and then unwraps them in a final pass. ``_InheritanceMerger``
+# replaces it with a single pass; it is kept here as the reference that the merger is tested against.
+
+
+def _ensure_path_exists(namespace: JSON, argument_path: Sequence[Union[int, str]]) -> None:
+    for key in argument_path:
+        if isinstance(namespace, dict):
+            assert isinstance(key, str)
+            namespace = namespace.setdefault(key, {})
+        elif is_list_of_single_item_dicts(namespace):  #type: ignore
+            assert isinstance(key, str)
+            namespace = ListOfSingleItemDict(namespace)  # type: ignore
+            if key not in namespace:
+                namespace[key] = {}
+            namespace = namespace[key]
+        elif isinstance(namespace, list):
+            assert isinstance(key, int)
+            # TODO: try except to verify key in range
+            namespace = namespace[key]  # type: ignore
+        else:
+            raise ValueError('Path must be empty unless if list or dict')
+
+
+class _OverriddenValue:
+
+    def __init__(self, val: JSON):
+        self.val = val
+
+
+def _unwrap_overridden_value_dict(data: Dict[str, JSON]):
+    for key, val in data.items():
+        if isinstance(val, collections.abc.Mapping):
+            _unwrap_overridden_value_dict(val)
+        elif is_list_of_single_item_dicts(val):
+            for item in val:  # type: ignore
+                _unwrap_overridden_value_dict(item)
+        elif isinstance(val, _OverriddenValue):
+            data[key] = val.val
+
+
+def _recursively_update_leaf_data_items(
+    update_namespace: Dict[str, JSON],
+    update_data: JSON,
+    update_argument_path: List[str],
+):
+    if isinstance(update_data, collections.abc.Mapping):
+        # This is still a branch point
+        _ensure_path_exists(update_namespace, update_argument_path)
+        for key, val in update_data.items():
+            _recursively_update_leaf_data_items(
+                update_namespace=update_namespace,
+                update_data=val,
+                update_argument_path=update_argument_path + [key],
+            )
+    else:
+        # Must be a leaf
+        inner_namespace = update_namespace
+
+        # Traverse the tree to the final branch
+        for key in update_argument_path[:-1]:
+            key_element: Optional[Union[Dict[str, JSON], ListOfSingleItemDict]] = None
+            if isinstance(inner_namespace, collections.abc.Mapping):
+                # Simple dict
+                key_element = inner_namespace.get(key)  # type: ignore
+            elif is_list_of_single_item_dicts(inner_namespace):
+                # List of single-item dicts
+                assert isinstance(inner_namespace, list)  # ensure type for pyright
+                inner_namespace = ListOfSingleItemDict(inner_namespace)
+                if key in inner_namespace:
+                    key_element = inner_namespace[key]
+            # key_element is None otherwise
+
+            # This needs to be a branch, so make it an empty dict
+            # This overrides simple types if the inheritance specifies a branch
+            if key_element is None or not (isinstance(key_element, dict) or is_list_of_single_item_dicts(key_element)):
+                key_element = {}
+                inner_namespace[key] = key_element
+
+            assert isinstance(key_element, dict) or is_list_of_single_item_dicts(key_element)
+            inner_namespace = key_element
+
+        key = update_argument_path[-1]
+        if isinstance(inner_namespace, collections.abc.Mapping):
+            existing_value = inner_namespace.get(key)
+        else:
+            # List of single-item dicts
+            assert isinstance(inner_namespace, list)
+            inner_namespace = ListOfSingleItemDict(inner_namespace)
+            if key in inner_namespace:
+                existing_value = inner_namespace[key]
+            else:
+                existing_value = None
+
+        is_empty = (existing_value is None)  # Empty values should be filled in
+        is_lower_priority = isinstance(existing_value, _OverriddenValue)  # Further inheritance should override previous
+        is_inherits_dict = isinstance(existing_value,
+                                      dict) and 'inherits' in existing_value  # Not sure about this one...
+
+        if is_empty or is_lower_priority or is_inherits_dict:
+            inner_namespace[key] = _OverriddenValue(update_data)  # type: ignore
 
 
 def test_yaml_inheritance(tmpdir: pathlib.Path):
@@ -330,3 +441,260 @@ def test_inheritance_sort_order(nested_dict, simple_update, list_update, tmpdir,
         target['a']['d'] = simple_update['a']['d']
     output = load_yaml_with_inheritance(base_file)
     assert output == target
+
+
+@pytest.fixture
+def diamond_yaml(tmpdir) -> str:
+    # main inherits 'a' and 'b' from left.yaml and right.yaml, which both inherit from base.yaml
+    with open(os.path.join(tmpdir, 'base.yaml'), 'w') as fh:
+        yaml.dump({'a': {'lr': 0.1, 'items': [{'x': 1}]}, 'b': {'lr': 0.2}}, fh)
+    for side in ('left', 'right'):
+        with open(os.path.join(tmpdir, f'{side}.yaml'), 'w') as fh:
+            yaml.dump({'a': {'inherits': 'base.yaml', 'side': side}, 'b': {'inherits': 'base.yaml'}}, fh)
+    main_file = os.path.join(tmpdir, 'main.yaml')
+    with open(main_file, 'w') as fh:
+        yaml.dump({'a': {'inherits': ['left.yaml']}, 'b': {'inherits': ['right.yaml']}}, fh)
+    return main_file
+
+
+@pytest.mark.parametrize('cache', ['none', 'call', 'process'])
+def test_inheritance_cache_scopes(diamond_yaml: str, cache: str, monkeypatch: pytest.MonkeyPatch):
+    clear_yaml_cache()
+    monkeypatch.delenv('YAHP_CACHE_DIR', raising=False)
+    num_loads = 0
+    full_load = yaml_helpers.full_load
+
+    def counting_full_load(stream):
+        nonlocal num_loads
+        num_loads += 1
+        return full_load(stream)
+
+    monkeypatch.setattr(yaml_helpers, 'full_load', counting_full_load)
+    expected = {'a': {'lr': 0.1, 'items': [{'x': 1}], 'side': 'left'}, 'b': {'lr': 0.2}}
+    assert load_yaml_with_inheritance(diamond_yaml, cache=cache) == expected
+    assert num_loads == (7 if cache == 'none' else 4)
+    assert load_yaml_with_inheritance(diamond_yaml, cache=cache) == expected
+    assert num_loads == {'none': 14, 'call': 8, 'process': 4}[cache]
+    clear_yaml_cache()
+
+
+def test_inheritance_cache_returns_copies(diamond_yaml: str):
+    clear_yaml_cache()
+    first = load_yaml_with_inheritance(diamond_yaml, cache='process')
+    first['a']['items'][0]['x'] = 'corrupted'
+    del first['b']
+    second = load_yaml_with_inheritance(diamond_yaml, cache='process')
+    assert second == {'a': {'lr': 0.1, 'items': [{'x': 1}], 'side': 'left'}, 'b': {'lr': 0.2}}
+    clear_yaml_cache()
+
+
+def test_inheritance_process_cache_detects_changes(diamond_yaml: str):
+    clear_yaml_cache()
+    assert load_yaml_with_inheritance(diamond_yaml, cache='process')['b'] == {'lr': 0.2}
+    base_file = os.path.join(os.path.dirname(diamond_yaml), 'base.yaml')
+    with open(base_file, 'w') as fh:
+        yaml.dump({'a': {'lr': 0.1}, 'b': {'lr': 0.25, 'momentum': 0.9}}, fh)
+    assert load_yaml_with_inheritance(diamond_yaml, cache='process')['b'] == {'lr': 0.25, 'momentum': 0.9}
+    clear_yaml_cache()
+
+
+def test_inheritance_invalid_cache_scope(diamond_yaml: str):
+    with pytest.raises(ValueError, match='cache must be one of'):
+        load_yaml_with_inheritance(diamond_yaml, cache='forever')
+
+
+def test_inheritance_cache_dir(diamond_yaml: str, tmpdir: pathlib.Path, monkeypatch: pytest.MonkeyPatch,
+                               caplog: pytest.LogCaptureFixture):
+    cache_dir = os.path.join(tmpdir, 'cache')
+    monkeypatch.setenv('YAHP_CACHE_DIR', cache_dir)
+    num_loads = 0
+    full_load = yaml_helpers.full_load
+
+    def counting_full_load(stream):
+        nonlocal num_loads
+        num_loads += 1
+        return full_load(stream)
+
+    monkeypatch.setattr(yaml_helpers, 'full_load', counting_full_load)
+    expected = {'a': {'lr': 0.1, 'items': [{'x': 1}], 'side': 'left'}, 'b': {'lr': 0.2}}
+    assert load_yaml_with_inheritance(diamond_yaml) == expected
+    assert num_loads == 4
+    assert len(os.listdir(cache_dir)) == 4
+
+    # Later calls (e.g. in other processes) are served from the cache directory, without parsing
+    assert load_yaml_with_inheritance(diamond_yaml) == expected
+    assert num_loads == 4
+
+    # Touching a file without changing it does not invalidate the cache
+    base_file = os.path.join(os.path.dirname(diamond_yaml), 'base.yaml')
+    stat = os.stat(base_file)
+    os.utime(base_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_yaml_with_inheritance(diamond_yaml) == expected
+    assert num_loads == 4
+
+    # Changing an inherited file invalidates the entries of everything that inherits from it
+    with open(base_file, 'w') as fh:
+        yaml.dump({'a': {'lr': 0.1}, 'b': {'lr': 0.25}}, fh)
+    assert load_yaml_with_inheritance(diamond_yaml)['b'] == {'lr': 0.25}
+    assert num_loads == 4 + 4
+
+    # Corrupt entries are ignored
+    for entry in os.listdir(cache_dir):
+        with open(os.path.join(cache_dir, entry), 'w') as fh:
+            fh.write('corrupted')
+    assert load_yaml_with_inheritance(diamond_yaml)['b'] == {'lr': 0.25}
+    assert num_loads == 4 + 4 + 4
+    assert 'Ignoring the unreadable YAML cache entry' in caplog.text
+
+    # The cache directory is not used without caching
+    assert load_yaml_with_inheritance(diamond_yaml, cache='none')['b'] == {'lr': 0.25}
+    assert num_loads == 4 + 4 + 4 + 7
+
+
+def test_inheritance_cache_dir_stores_json(tmpdir: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    cache_dir = os.path.join(tmpdir, 'cache')
+    monkeypatch.setenv('YAHP_CACHE_DIR', cache_dir)
+    plain_file = os.path.join(tmpdir, 'plain.yaml')
+    with open(plain_file, 'w') as fh:
+        fh.write('a: {lr: 0.1, items: [1, two]}\n')
+    dated_file = os.path.join(tmpdir, 'dated.yaml')
+    with open(dated_file, 'w') as fh:
+        fh.write('date: 2021-01-01\n')
+
+    assert load_yaml_with_inheritance(plain_file) == {'a': {'lr': 0.1, 'items': [1, 'two']}}
+    assert os.stat(cache_dir).st_mode & 0o777 == 0o700 & ~_get_umask()
+    entries = os.listdir(cache_dir)
+    assert len(entries) == 1
+    with open(os.path.join(cache_dir, entries[0])) as fh:
+        assert json.load(fh)[2] == {'a': {'lr': 0.1, 'items': [1, 'two']}}
+
+    # Data that JSON cannot represent exactly is not cached on disk
+    assert 'date' in load_yaml_with_inheritance(dated_file)
+    assert os.listdir(cache_dir) == entries
+
+
+def _get_umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def _reference_load_yaml_with_inheritance(yaml_path: str) -> Dict[str, Any]:
+    """The original implementation of :func:`load_yaml_with_inheritance`, which re-walks the tree for each leaf."""
+    abs_path = os.path.abspath(yaml_path)
+    with open(abs_path, 'r') as f:
+        data = yaml.full_load(f) or {}
+    inherit_paths = sorted(_get_inherits_paths(data, []), key=lambda x: len(x[0]))
+    for nested_keys, inherit_yamls in inherit_paths:
+        for inherit_yaml in inherit_yamls:
+            inherit_yaml = os.path.join(os.path.dirname(abs_path), inherit_yaml)
+            inherit_data_full = _reference_load_yaml_with_inheritance(inherit_yaml)
+            try:
+                inherit_data = _data_by_path(namespace=inherit_data_full, argument_path=nested_keys)
+            except KeyError:
+                continue
+            _recursively_update_leaf_data_items(data, inherit_data, nested_keys)
+        inherits_key_dict = _data_by_path(namespace=data, argument_path=nested_keys)
+        if isinstance(inherits_key_dict, dict) and 'inherits' in inherits_key_dict:
+            del inherits_key_dict['inherits']
+    _unwrap_overridden_value_dict(data)
+    return data
+
+
+def _random_tree(rng: random.Random, num_files: int, file_index: int, depth: int) -> Dict[str, Any]:
+    # Use a small set of keys, so that the trees from different files overlap
+    tree: Dict[str, Any] = {}
+    for key in rng.sample(['a', 'b', 'c', 'd'], rng.randint(0, 3)):
+        choice = rng.random()
+        if depth < 3 and choice < 0.4:
+            tree[key] = _random_tree(rng, num_files, file_index, depth + 1)
+        elif choice < 0.5:
+            tree[key] = [{rng.choice('ab'): rng.randint(0, 9)} for _ in range(rng.randint(0, 2))]
+        elif choice < 0.6:
+            tree[key] = [rng.randint(0, 9)]
+        elif choice < 0.7:
+            tree[key] = None
+        else:
+            tree[key] = rng.randint(0, 9)
+    # Files can only inherit from files with a higher index, so there are no cycles
+    if file_index + 1 < num_files and rng.random() < 0.5:
+        tree['inherits'] = [
+            f'{i}.yaml' for i in rng.sample(range(file_index + 1, num_files), min(2, num_files - file_index - 1))
+        ]
+    return tree
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_inheritance_randomized_equivalence(tmpdir: pathlib.Path, seed: int):
+    rng = random.Random(seed)
+    num_compared = 0
+    for trial in range(100):
+        trial_dir = os.path.join(tmpdir, str(trial))
+        os.makedirs(trial_dir)
+        num_files = rng.randint(2, 5)
+        for file_index in range(num_files):
+            with open(os.path.join(trial_dir, f'{file_index}.yaml'), 'w') as fh:
+                yaml.dump(_random_tree(rng, num_files, file_index, depth=0), fh)
+        main_file = os.path.join(trial_dir, '0.yaml')
+        try:
+            expected = _reference_load_yaml_with_inheritance(main_file)
+        except (AssertionError, KeyError, TypeError, ValueError):
+            # The reference implementation raises on some structural conflicts (such as a branch in one file
+            # being a scalar in another), depending on the order of the keys. These cases are not compared.
+            continue
+        assert load_yaml_with_inheritance(main_file, cache='none') == expected
+        assert load_yaml_with_inheritance(main_file, num_workers=3) == expected
+        num_compared += 1
+    assert num_compared > 50
+
+
+@pytest.mark.parametrize('cache', ['none', 'call', 'process'])
+def test_inheritance_num_workers(tmpdir: pathlib.Path, cache: str, monkeypatch: pytest.MonkeyPatch):
+    clear_yaml_cache()
+    monkeypatch.delenv('YAHP_CACHE_DIR', raising=False)
+    # main.yaml inherits from 8 files at the root and at 'model', which all set the same keys
+    num_files = 8
+    for i in range(num_files):
+        with open(os.path.join(tmpdir, f'{i}.yaml'), 'w') as fh:
+            yaml.dump({'lr': i, f'key_{i}': i, 'model': {'depth': i}}, fh)
+    main_file = os.path.join(tmpdir, 'main.yaml')
+    with open(main_file, 'w') as fh:
+        inherits = [f'{i}.yaml' for i in range(num_files)]
+        yaml.dump({'inherits': inherits, 'model': {'inherits': inherits[::-1]}}, fh)
+
+    # Record the maximum number of files being parsed at the same time
+    lock = threading.Lock()
+    num_active = 0
+    max_active = 0
+    full_load = yaml_helpers.full_load
+
+    def slow_full_load(stream):
+        nonlocal num_active, max_active
+        with lock:
+            num_active += 1
+            max_active = max(max_active, num_active)
+        time.sleep(0.01)
+        with lock:
+            num_active -= 1
+        return full_load(stream)
+
+    monkeypatch.setattr(yaml_helpers, 'full_load', slow_full_load)
+    expected = load_yaml_with_inheritance(main_file, cache='none')
+    assert expected['lr'] == num_files - 1
+    assert expected['model'] == {'depth': 0}
+    assert max_active == 1
+
+    clear_yaml_cache()
+    assert load_yaml_with_inheritance(main_file, cache=cache, num_workers=4) == expected
+    assert max_active == 4
+    clear_yaml_cache()
+
+
+def test_inheritance_num_workers_missing_file(tmpdir: pathlib.Path):
+    main_file = os.path.join(tmpdir, 'main.yaml')
+    with open(main_file, 'w') as fh:
+        yaml.dump({'a': {'inherits': ['missing.yaml']}}, fh)
+    with pytest.raises(FileNotFoundError):
+        load_yaml_with_inheritance(main_file, num_workers=2)
+    with pytest.raises(ValueError, match='num_workers must be non-negative'):
+        load_yaml_with_inheritance(main_file, num_workers=-1)
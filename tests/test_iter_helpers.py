@@ -1,6 +1,8 @@
+import concurrent.futures
+
 import pytest
 
-from yahp.utils.iter_helpers import ListOfSingleItemDict
+from yahp.utils.iter_helpers import ListOfSingleItemDict, executor_map_bounded
 
 
 def test_getitem():
@@ -63,3 +65,19 @@ def test_shared_memory_overwrite():
     y = ListOfSingleItemDict(x)
     y['a'] = 'baz'
     assert x[0] == {'a': 'baz'}
+
+
+def test_executor_map_bounded():
+    consumed = []
+
+    def items():
+        for i in range(100):
+            consumed.append(i)
+            yield i
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        results = executor_map_bounded(executor, lambda x: x * 2, items(), max_pending=2, chunksize=3)
+        assert next(results) == 0
+        # Only the chunks within the window have been read from the iterable
+        assert len(consumed) <= 2 * 3 + 1
+        assert list(results) == [x * 2 for x in range(1, 100)]
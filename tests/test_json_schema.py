@@ -3,18 +3,19 @@ import json
 import os
 import pathlib
 import textwrap
+from dataclasses import dataclass
 from typing import Type
 
 import pytest
 import yaml
 from jsonschema import ValidationError
 
+import yahp as hp
 from tests.yahp_fixtures import (BearsHparams, ChoiceHparamParent, KitchenSinkHparams, PrimitiveHparam,
                                  ShavingBearsHparam)
-from yahp.hparams import Hparams
+from yahp.hparams import Hparams, clear_json_schema_cache, get_registry_version
 
-
-@pytest.mark.parametrize('hparam_class,success,data', [
+VALIDATION_CASES = [
     [
         PrimitiveHparam, True,
         textwrap.dedent("""
@@ -214,7 +215,10 @@ from yahp.hparams import Hparams
                     last_action: "Release bears into wild with stylish new haircuts"
         """)
     ],
-])
+]
+
+
+@pytest.mark.parametrize('hparam_class,success,data', VALIDATION_CASES)
 def test_validate_json_schema_from_strings(hparam_class: Type[Hparams], success: bool, data: str):
     with contextlib.nullcontext() if success else pytest.raises(ValidationError):
         hparam_class.validate_yaml(data=yaml.safe_load(data))
@@ -260,3 +264,88 @@ def test_write_and_read_json_schema_from_file(hparam_class: Type[Hparams], tmp_p
         loaded_schema = json.load(f)
     generated_schema = hparam_class.get_json_schema()
     assert loaded_schema == generated_schema
+
+
+@dataclass
+class SchemaCacheChildAHparams(hp.Hparams):
+    a: int = hp.optional(doc='a', default=0)
+
+
+@dataclass
+class SchemaCacheChildBHparams(hp.Hparams):
+    b: int = hp.optional(doc='b', default=0)
+
+
+@dataclass
+class SchemaCacheParentHparams(hp.Hparams):
+    hparams_registry = {'child': {'a': SchemaCacheChildAHparams}}
+
+    child: Hparams = hp.required(doc='child')
+
+
+@dataclass
+class SchemaCacheRootHparams(hp.Hparams):
+    parent: SchemaCacheParentHparams = hp.required(doc='parent')
+
+
+def test_json_schema_cache():
+    data = {'parent': {'child': {'b': {'b': 1}}}}
+    schema = SchemaCacheRootHparams._get_cached_json_schema()
+    assert SchemaCacheRootHparams._get_cached_json_schema() is schema
+    with pytest.raises(ValidationError):
+        SchemaCacheRootHparams.validate_yaml(data=data)
+
+    # get_json_schema returns a copy, so the cached schema can't be modified
+    SchemaCacheRootHparams.get_json_schema()['$defs'].clear()
+    assert SchemaCacheRootHparams.get_json_schema() == schema
+
+    # Registering a class in a reachable registry invalidates the cached schema
+    version = get_registry_version()
+    SchemaCacheParentHparams.register_class('child', SchemaCacheChildBHparams, 'b')
+    assert get_registry_version() > version
+    assert SchemaCacheRootHparams._get_cached_json_schema() is not schema
+    SchemaCacheRootHparams.validate_yaml(data=data)
+
+    # Registries modified directly require the cache to be cleared
+    schema = SchemaCacheRootHparams._get_cached_json_schema()
+    del SchemaCacheParentHparams.hparams_registry['child']['b']
+    assert SchemaCacheRootHparams._get_cached_json_schema() is schema
+    clear_json_schema_cache()
+    with pytest.raises(ValidationError):
+        SchemaCacheRootHparams.validate_yaml(data=data)
+
+
+def test_validate_many(tmp_path: pathlib.Path):
+    for hparam_class in {case[0] for case in VALIDATION_CASES}:
+        cases = [case for case in VALIDATION_CASES if case[0] is hparam_class]
+        datas = [yaml.safe_load(case[2]) for case in cases]
+        # Also validate from files
+        filepath = tmp_path / 'data.yaml'
+        with open(filepath, 'w') as f:
+            f.write(cases[0][2])
+        errors = hparam_class.validate_many(datas + [filepath, str(filepath)])
+        assert [error is None for error in errors] == [case[1] for case in cases] + [cases[0][1]] * 2
+        for data, error in zip(datas, errors):
+            if error is not None:
+                # validate_yaml raises the same error
+                with pytest.raises(ValidationError) as exc_info:
+                    hparam_class.validate_yaml(data=data)
+                assert str(exc_info.value) == str(error)
+
+
+def test_get_validator_is_cached():
+    validator = SchemaCacheRootHparams.get_validator()
+    assert SchemaCacheRootHparams.get_validator() is validator
+    assert validator.schema is SchemaCacheRootHparams._get_cached_json_schema()
+    clear_json_schema_cache()
+    assert SchemaCacheRootHparams.get_validator() is not validator
+
+
+def test_validator_enum_pattern():
+    validator = PrimitiveHparam.get_validator()
+    schema = validator.schema['$defs']
+    enum_schema = next(v for k, v in schema.items() if k.startswith('EnumStringField'))
+    enum_validator = type(validator)(enum_schema)
+    assert enum_validator.is_valid('PYTORCH_LIGHTNING')
+    assert enum_validator.is_valid('ptl')
+    assert not enum_validator.is_valid('pytorch')
@@ -0,0 +1,173 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+
+import io
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, List
+
+import pytest
+
+import yahp as hp
+from yahp.lazy import LazyObject, Thunk, is_lazy, resolve
+
+_num_initialized = 0
+
+
+class Callback:
+    """Callback
+
+    Args:
+        name (str): The name.
+    """
+
+    def __init__(self, name: str):
+        global _num_initialized
+        _num_initialized += 1
+        self.name = name
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+
+class Trainer:
+    """Trainer
+
+    Args:
+        train_callback (Callback): Used for training.
+        eval_callback (Callback): Only used for evaluation.
+    """
+
+    def __init__(self, train_callback: Callback, eval_callback: Callback):
+        self.train_callback = train_callback
+        self.eval_callback = eval_callback
+
+
+class ThunkTrainer(Trainer):
+    """ThunkTrainer
+
+    Args:
+        train_callback (Callback): Used for training.
+        eval_callback (Callback): Only used for evaluation; a thunk.
+    """
+
+    hparams_thunk_fields = ('eval_callback',)
+
+
+@dataclass
+class CallbacksHparams(hp.Hparams):
+    hparams_registry = {'callbacks': {'callback': Callback}}
+
+    callbacks: List[Callback] = hp.required('Callbacks')
+
+
+@pytest.fixture(autouse=True)
+def reset_num_initialized(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(globals(), '_num_initialized', 0)
+
+
+_DATA = {'train_callback': {'name': 'train'}, 'eval_callback': {'name': 'eval'}}
+
+
+def test_lazy_objects_are_initialized_on_first_use():
+    trainer = hp.create(Trainer, data=_DATA, cli_args=False, lazy=True)
+    assert _num_initialized == 0
+    assert is_lazy(trainer.train_callback)
+    assert is_lazy(trainer.eval_callback)
+
+    assert trainer.train_callback.name == 'train'
+    assert _num_initialized == 1
+    assert isinstance(trainer.train_callback, Callback)
+    assert len(trainer.train_callback) == 5
+    assert _num_initialized == 1
+
+    assert isinstance(resolve(trainer.eval_callback), Callback)
+    assert _num_initialized == 2
+
+
+def test_lazy_objects_serialize_without_initialization():
+    trainer = hp.create(Trainer, data=_DATA, cli_args=False, lazy=True)
+    assert hp.serialize(trainer) == _DATA
+    assert hp.serialize(trainer.eval_callback) == {'name': 'eval'}
+    assert _num_initialized == 0
+
+
+def test_lazy_registry_list():
+    data = {'callbacks': [{'callback': {'name': 'a'}}, {'callback+1': {'name': 'b'}}]}
+    hparams = CallbacksHparams.create(data=data, cli_args=False, lazy=True)
+    assert hparams.to_dict() == {'callbacks': {'callback': {'name': 'a'}, 'callback+1': {'name': 'b'}}}
+    assert _num_initialized == 0
+    assert [x.name for x in hparams.callbacks] == ['a', 'b']
+    assert _num_initialized == 2
+
+
+def test_thunk_fields():
+    trainer = hp.create(ThunkTrainer, data=_DATA, cli_args=False)
+    assert _num_initialized == 1
+    assert isinstance(trainer.train_callback, Callback)
+    assert isinstance(trainer.eval_callback, hp.Thunk)
+    assert hp.serialize(trainer) == _DATA
+
+    eval_callback = trainer.eval_callback()
+    assert isinstance(eval_callback, Callback)
+    assert trainer.eval_callback() is eval_callback
+    assert _num_initialized == 2
+
+
+def _create_with(entry_point: str, constructor: Callable, lazy: bool) -> Any:
+    if entry_point == 'create':
+        return hp.create(constructor, data=_DATA, cli_args=False, lazy=lazy)
+    if entry_point == 'compile_create':
+        return hp.compile_create(constructor, lazy=lazy)(_DATA)
+    if entry_point == 'create_many':
+        return next(hp.create_many(constructor, [_DATA], lazy=lazy))
+    assert entry_point == 'create_iter'
+    return next(hp.create_iter(constructor, io.StringIO(json.dumps(_DATA)), file_format='jsonl', lazy=lazy))
+
+
+@pytest.mark.parametrize('entry_point', ['create', 'compile_create', 'create_many', 'create_iter'])
+@pytest.mark.parametrize('lazy', [False, True])
+def test_entry_points_agree_on_lazy_and_thunk_fields(entry_point: str, lazy: bool):
+    trainer = _create_with(entry_point, ThunkTrainer, lazy)
+    assert is_lazy(trainer.train_callback) == lazy
+    assert isinstance(trainer.eval_callback, hp.Thunk)
+    assert _num_initialized == (0 if lazy else 1)
+    assert hp.serialize(trainer) == _DATA
+    assert trainer.train_callback.name == 'train'
+    assert trainer.eval_callback().name == 'eval'
+    assert _num_initialized == 2
+
+
+def test_create_many_lazy_requires_no_workers():
+    with pytest.raises(ValueError, match='num_workers'):
+        hp.create_many(Trainer, [_DATA], num_workers=2, lazy=True)
+
+
+def test_lazy_object_operators():
+    three, one = LazyObject(Thunk(lambda: 3)), LazyObject(Thunk(lambda: 1))
+    assert (three + 1, 1 + three, three - one, three * 2, three / 2, three // 2, three % 2) == (4, 4, 2, 6, 1.5, 1, 1)
+    assert (three**2, 2**three, divmod(three, 2), -three, abs(-three), ~three) == (9, 8, (1, 1), -3, 3, -4)
+    assert (three & 1, three | 4, three ^ 1, three << 1, three >> 1) == (1, 7, 2, 6, 1)
+    assert one < three <= 3 and three > one >= 1
+    assert sorted([three, 2, one]) == [1, 2, 3]
+    assert (int(three), float(three), round(three), [0, 1, 2, 3][three]) == (3, 3.0, 3, 3)
+
+    items = LazyObject(Thunk(lambda: [1, 2]))
+    alias = items
+    items += [3]
+    # In-place operators on mutable objects modify the object, and keep the proxy
+    assert items is alias
+    assert list(reversed(items)) == [3, 2, 1]
+    three += 1
+    assert three == 4 and not is_lazy(three)
+
+
+def test_thunk_reentry_raises():
+    thunk: Thunk = Thunk(lambda: thunk())
+    with pytest.raises(RuntimeError, match='while initializing its own object'):
+        thunk()
+
+    first: Thunk = Thunk(lambda: second() + 1)
+    second: Thunk = Thunk(lambda: first() + 1)
+    with pytest.raises(RuntimeError, match='while initializing its own object'):
+        first()
+    assert not first.initialized
@@ -0,0 +1,148 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+
+import gc
+import weakref
+from dataclasses import dataclass
+from typing import List, Optional
+
+import pytest
+
+import yahp as hp
+from yahp.hparams import clear_json_schema_cache
+from yahp.utils import registry_index
+from yahp.utils.iter_helpers import list_to_deduplicated_dict
+from yahp.utils.registry_index import RegistryIndex, get_registry_index
+
+
+@dataclass
+class IndexItemHparams(hp.Hparams):
+    value: int = hp.optional('value', default=0)
+
+
+@dataclass
+class IndexOtherItemHparams(hp.Hparams):
+    value: int = hp.optional('value', default=0)
+
+
+class IndexItem:
+    """Index Item
+
+    Args:
+        value (int, optional): Value.
+    """
+
+    def __init__(self, value: int = 0):
+        self.value = value
+
+
+@dataclass
+class IndexRootHparams(hp.Hparams):
+    hparams_registry = {
+        'items': {
+            'item': IndexItemHparams,
+        },
+        'objs': {
+            'item': IndexItem,
+            'alias': IndexItem,
+        },
+        'obj': {
+            'item': IndexItem,
+            'alias': IndexItem,
+        },
+    }
+
+    items: List[IndexItemHparams] = hp.optional('items', default_factory=list)
+    objs: List[IndexItem] = hp.optional('objs', default_factory=list)
+    obj: Optional[IndexItem] = hp.optional('obj', default=None)
+
+
+def test_registry_index():
+    registry = {'a': IndexItemHparams, 'b': IndexOtherItemHparams, 'c': IndexItemHparams}
+    index = RegistryIndex(registry)
+    assert index.get_keys(IndexItemHparams) == ('a', 'c')
+    assert index.get_key(IndexItemHparams) == 'c'
+    assert index.get_key(IndexOtherItemHparams) == 'b'
+    assert index.get_key(IndexRootHparams) is None
+    assert index.get_keys(IndexRootHparams) == ()
+
+    registry['d'] = IndexOtherItemHparams
+    index.add('d', IndexOtherItemHparams)
+    assert index.get_keys(IndexOtherItemHparams) == ('b', 'd')
+
+    # Direct modifications are detected
+    del registry['c']
+    assert index.get_key(IndexItemHparams) == 'a'
+    registry['e'] = registry.pop('a')
+    assert index.get_key(IndexItemHparams) == 'e'
+
+
+def test_registry_index_register_class():
+    registry = IndexRootHparams.hparams_registry['items']
+    index = get_registry_index(IndexRootHparams, 'items')
+    assert get_registry_index(IndexRootHparams, 'items') is index
+    try:
+        IndexRootHparams.register_class('items', IndexOtherItemHparams, 'other')
+        assert index.get_key(IndexOtherItemHparams) == 'other'
+
+        # Replacing the class for a key keeps the size of the registry, so the index must be cleared
+        registry['other'] = IndexRootHparams
+        clear_json_schema_cache()
+        assert get_registry_index(IndexRootHparams, 'items').get_key(IndexRootHparams) == 'other'
+        assert get_registry_index(IndexRootHparams, 'items').get_key(IndexOtherItemHparams) is None
+    finally:
+        del registry['other']
+        clear_json_schema_cache()
+
+
+def test_registry_index_is_released_with_its_class():
+
+    def make_cls():
+
+        @dataclass
+        class TransientHparams(hp.Hparams):
+            hparams_registry = {'items': {'item': IndexItemHparams}}
+
+            items: List[IndexItemHparams] = hp.optional('items', default_factory=list)
+
+        return TransientHparams
+
+    cls = make_cls()
+    assert cls(items=[IndexItemHparams(1)]).to_dict() == {'items': {'item': {'value': 1}}}
+    assert cls in registry_index._registry_indices
+    cls_ref = weakref.ref(cls)
+    del cls
+    gc.collect()
+    assert cls_ref() is None
+
+
+def test_registry_index_reassigned_registry():
+
+    @dataclass
+    class ReassignedHparams(hp.Hparams):
+        hparams_registry = {'items': {'item': IndexItemHparams}}
+
+        items: List[hp.Hparams] = hp.optional('items', default_factory=list)
+
+    assert get_registry_index(ReassignedHparams, 'items').get_key(IndexItemHparams) == 'item'
+    # A new registry of the same size never reuses the index of the old one
+    ReassignedHparams.hparams_registry = {'items': {'other': IndexOtherItemHparams}}
+    index = get_registry_index(ReassignedHparams, 'items')
+    assert index.registry is ReassignedHparams.hparams_registry['items']
+    assert index.get_key(IndexItemHparams) is None
+    assert index.get_key(IndexOtherItemHparams) == 'other'
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+@pytest.mark.parametrize('key', ['item', 'alias'])
+def test_class_registered_under_several_keys(key: str, compiled: bool):
+    data = {'objs': [{key: {'value': 1}}, {'alias': {'value': 2}}], 'obj': {key: {'value': 3}}}
+    if compiled:
+        hparams = hp.compile_create(IndexRootHparams)(data)
+    else:
+        hparams = IndexRootHparams.create(data=data, cli_args=False)
+    # The key used to create each object is preserved
+    assert hparams.to_dict()['objs'] == list_to_deduplicated_dict(data['objs'])
+    assert hparams.to_dict()['obj'] == data['obj']
+
+    # Objects not created by yahp use the most recently registered key
+    assert IndexRootHparams(items=[IndexItemHparams(4)]).to_dict()['items'] == {'item': {'value': 4}}
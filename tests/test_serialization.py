@@ -0,0 +1,108 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+
+import copy
+import gc
+from dataclasses import dataclass
+from typing import List
+
+import yahp as hp
+from yahp import serialization
+from yahp.serialization import get_key_for_instance_and_registry, register_hparams_registry_key_for_instance, serialize
+
+
+@dataclass
+class SerializedItem:
+    """Serialized Item
+
+    Dataclasses that compare by value are not hashable.
+
+    Args:
+        value (int): Value.
+    """
+    value: int
+
+
+@dataclass
+class SerializedItemHparams(hp.Hparams):
+    value: int = hp.optional('value', default=0)
+
+
+@dataclass
+class SerializedRootHparams(hp.Hparams):
+    hparams_registry = {
+        'items': {
+            'item': SerializedItemHparams,
+            'alias': SerializedItemHparams,
+        },
+    }
+
+    items: List[SerializedItemHparams] = hp.optional('items', default_factory=list)
+    obj: SerializedItem = hp.optional('obj', default_factory=lambda: SerializedItem(0))
+
+
+def test_serialize_unhashable():
+    hparams = SerializedRootHparams.create(data={'obj': {'value': 1}}, cli_args=False)
+    assert serialize(hparams.obj) == {'value': 1}
+    # Tracking is by identity, not equality
+    assert serialize(SerializedItem(1)) == str(SerializedItem(1))
+
+
+def test_registry_key_preserved_for_hparams():
+    data = {'items': [{'alias': {'value': 1}}, {'item': {'value': 2}}], 'obj': {'value': 0}}
+    hparams = SerializedRootHparams.create(data=data, cli_args=False)
+    assert hparams.to_dict()['items'] == {'alias': {'value': 1}, 'item': {'value': 2}}
+
+
+def test_tracking_does_not_leak():
+    gc.collect()
+    num_objects = len(serialization._initialized_object_to_hparams_instance)
+    num_keys = len(serialization._object_registry_keys)
+    for i in range(10):
+        SerializedRootHparams.create(data={'items': [{'item': {'value': i}}], 'obj': {'value': i}}, cli_args=False)
+    gc.collect()
+    assert len(serialization._initialized_object_to_hparams_instance) == num_objects
+    assert len(serialization._object_registry_keys) == num_keys
+
+
+def test_registry_key_tracking_is_per_registry():
+    item = SerializedItem(1)
+    registry = {'a': SerializedItem}
+    other_registry = {'a': SerializedItem}
+    register_hparams_registry_key_for_instance(item, registry, 'a')
+    assert get_key_for_instance_and_registry(item, registry) == 'a'
+    assert get_key_for_instance_and_registry(item, other_registry) is None
+    register_hparams_registry_key_for_instance(item, other_registry, 'b')
+    register_hparams_registry_key_for_instance(item, registry, 'c')
+    assert get_key_for_instance_and_registry(item, registry) == 'c'
+    assert get_key_for_instance_and_registry(item, other_registry) == 'b'
+
+    # Registries are compared by identity, so an equal registry does not see the keys
+    assert get_key_for_instance_and_registry(item, {'a': SerializedItem}) is None
+
+
+def test_fingerprint(monkeypatch):
+    data = {'items': [{'item': {'value': 1}}, {'alias': {'value': 2}}], 'obj': {'value': 3}}
+    reordered = {'obj': {'value': 3}, 'items': [{'item': {'value': 1}}, {'alias': {'value': 2}}]}
+    hparams = SerializedRootHparams.create(data=data, cli_args=False)
+    fingerprint = hparams.fingerprint()
+    assert len(fingerprint) == 64
+    assert SerializedRootHparams.create(data=reordered, cli_args=False).fingerprint() == fingerprint
+
+    # Registry keys are part of the fingerprint
+    data['items'][1] = {'item': {'value': 2}}
+    assert SerializedRootHparams.create(data=data, cli_args=False).fingerprint() != fingerprint
+
+    # Copies are fingerprinted separately
+    copied = copy.deepcopy(hparams)
+    copied.obj.value = 4
+    assert copied.fingerprint() != fingerprint
+
+    # The fingerprint is cached
+    monkeypatch.setattr(SerializedRootHparams, 'to_dict', lambda self: {})
+    assert hparams.fingerprint() == fingerprint
+
+
+def test_fingerprint_includes_class():
+    assert SerializedItemHparams(1).fingerprint() != SerializedRootHparams().fingerprint()
+    assert SerializedItemHparams(1).fingerprint() == SerializedItemHparams(1).fingerprint()
+    assert SerializedItemHparams(1).fingerprint() != SerializedItemHparams(2).fingerprint()
@@ -0,0 +1,79 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+
+import json
+import pathlib
+
+import pytest
+
+from tests.yahp_fixtures import PrimitiveHparam
+from yahp.validate import find_yaml_files, main, validate_files
+
+_VALID_YAML = """\
+intfield: 1
+strfield: hello
+floatfield: 0.5
+boolfield: true
+enumintfield: ONE
+enumstringfield: mosaic
+jsonfield: {}
+"""
+
+
+@pytest.fixture
+def config_dir(tmp_path: pathlib.Path) -> pathlib.Path:
+    (tmp_path / 'nested').mkdir()
+    (tmp_path / 'valid.yaml').write_text(_VALID_YAML)
+    (tmp_path / 'nested' / 'inherited.yml').write_text('inherits: ../valid.yaml\nintfield: 2\n')
+    (tmp_path / 'nested' / 'wrong_type.yaml').write_text('inherits: ../valid.yaml\nintfield: one\n')
+    (tmp_path / 'nested' / 'missing_base.yaml').write_text('inherits: missing.yaml\n')
+    (tmp_path / 'nested' / 'notes.txt').write_text('not a config')
+    return tmp_path
+
+
+def test_find_yaml_files(config_dir: pathlib.Path):
+    files = find_yaml_files([config_dir])
+    assert [pathlib.Path(f).relative_to(config_dir).as_posix() for f in files] == [
+        'nested/inherited.yml',
+        'nested/missing_base.yaml',
+        'nested/wrong_type.yaml',
+        'valid.yaml',
+    ]
+    assert find_yaml_files([config_dir / 'nested' / 'notes.txt']) == [str(config_dir / 'nested' / 'notes.txt')]
+    assert len(find_yaml_files([config_dir], patterns=['*.yml'])) == 1
+
+
+@pytest.mark.parametrize('num_workers', [0, 2])
+def test_validate_files(config_dir: pathlib.Path, num_workers: int):
+    files = find_yaml_files([config_dir])
+    results = {
+        pathlib.Path(result.path).name: result
+        for result in validate_files(PrimitiveHparam, files, num_workers=num_workers, chunksize=1)
+    }
+    assert results['valid.yaml'].valid
+    assert results['inherited.yml'].valid
+    assert results['wrong_type.yaml'].location == 'intfield'
+    assert 'is not of type' in str(results['wrong_type.yaml'].error)
+    assert str(results['missing_base.yaml'].error).startswith('FileNotFoundError')
+    assert results['missing_base.yaml'].location is None
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_main(config_dir: pathlib.Path, jobs: int, capsys: pytest.CaptureFixture):
+    exit_code = main(['tests.yahp_fixtures:PrimitiveHparam', str(config_dir), '--jobs', str(jobs)])
+    summary = json.loads(capsys.readouterr().out)
+    assert exit_code == 1
+    assert summary['class'] == 'tests.yahp_fixtures:PrimitiveHparam'
+    assert (summary['total'], summary['valid'], summary['invalid']) == (4, 2, 2)
+    assert sorted(pathlib.Path(error['path']).name for error in summary['errors']) == [
+        'missing_base.yaml',
+        'wrong_type.yaml',
+    ]
+
+    assert main(['tests.yahp_fixtures:PrimitiveHparam', str(config_dir / 'valid.yaml')]) == 0
+    assert json.loads(capsys.readouterr().out)['invalid'] == 0
+
+
+@pytest.mark.parametrize('target', ['tests.yahp_fixtures', 'tests.yahp_fixtures:MissingHparams'])
+def test_main_invalid_target(target: str, config_dir: pathlib.Path):
+    with pytest.raises(SystemExit):
+        main([target, str(config_dir)])
@@ -1,5 +1,9 @@
 # Copyright 2021 MosaicML. All Rights Reserved.
 
+import io
+import json
+import pathlib
+
 import pytest
 
 from tests.yahp_fixtures import PrimitiveHparam, YamlInput
@@ -67,3 +71,28 @@ def test_primitive_hparams_json(primitive_hparam: PrimitiveHparam):
     assert isinstance(primitive_hparam.jsonfield['random_item2'], str)
     assert isinstance(primitive_hparam.jsonfield['random_item3'], bool)
     assert isinstance(primitive_hparam.jsonfield['random_item4'], float)
+
+
+def test_primitive_hparams_to_json(primitive_hparam: PrimitiveHparam, tmp_path: pathlib.Path):
+    assert json.loads(primitive_hparam.to_json()) == primitive_hparam.to_dict()
+    filepath = tmp_path / 'hparams.json'
+    filepath.write_text(primitive_hparam.to_json(indent=2))
+    assert PrimitiveHparam.create(f=filepath, cli_args=False) == primitive_hparam
+    with open(filepath) as f:
+        assert PrimitiveHparam.create(f=f, cli_args=False) == primitive_hparam
+    assert PrimitiveHparam.create(f=io.StringIO(primitive_hparam.to_json()), cli_args=False) == primitive_hparam
+
+
+def test_primitive_hparams_json_inheritance(primitive_hparam: PrimitiveHparam, tmp_path: pathlib.Path):
+    (tmp_path / 'base.json').write_text(primitive_hparam.to_json())
+    (tmp_path / 'child.yaml').write_text('inherits: base.json\nintfield: 42\n')
+    (tmp_path / 'grandchild.json').write_text(json.dumps({'inherits': 'child.yaml', 'strfield': 'json'}))
+    hparams = PrimitiveHparam.create(f=tmp_path / 'grandchild.json', cli_args=False)
+    assert (hparams.intfield, hparams.strfield, hparams.jsonfield) == (42, 'json', primitive_hparam.jsonfield)
+
+
+def test_primitive_hparams_dump_json(primitive_hparam: PrimitiveHparam, tmp_path: pathlib.Path):
+    filepath = tmp_path / 'dump.json'
+    with pytest.raises(SystemExit):
+        PrimitiveHparam.create(data=primitive_hparam.to_dict(), cli_args=['--dump', str(filepath)])
+    assert json.loads(filepath.read_text()) == primitive_hparam.to_dict()
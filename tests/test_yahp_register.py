@@ -1,9 +1,11 @@
 # Copyright 2021 MosaicML. All Rights Reserved.
 
-from typing import Dict
+from dataclasses import dataclass
+from typing import Dict, List
 
 import pytest
 
+import yahp as hp
 from tests.yahp_fixtures import ChoiceHparamRoot, ChoiceOneHparam, EmptyHparam, NestedHparam, PrimitiveHparam, YamlInput
 from yahp.types import JSON
 
@@ -57,3 +59,55 @@ def test_register_existing_primative():
             register_class=EmptyHparam,
             class_key='empty',
         )
+
+
+@dataclass
+class SerializeItemHparams(hp.Hparams):
+    value: int = hp.optional('value', default=0)
+
+
+@dataclass
+class SerializeOtherItemHparams(SerializeItemHparams):
+    pass
+
+
+@dataclass
+class SerializeCustomItemHparams(SerializeItemHparams):
+
+    def to_dict(self) -> Dict[str, JSON]:
+        return {'custom': self.value}
+
+
+@dataclass
+class SerializeRootHparams(hp.Hparams):
+    hparams_registry = {'items': {'item': SerializeItemHparams}}
+
+    items: List[SerializeItemHparams] = hp.optional('items', default_factory=list)
+    item: SerializeItemHparams = hp.optional('item', default_factory=SerializeItemHparams)
+
+
+def test_to_dict_after_registering():
+    root = SerializeRootHparams(items=[SerializeItemHparams(1), SerializeOtherItemHparams(2)],
+                                item=SerializeCustomItemHparams(3))
+    # The key for the unregistered class cannot be determined
+    assert 'other' not in root.to_dict()['items']
+
+    SerializeRootHparams.register_class('items', SerializeOtherItemHparams, 'other')
+    assert root.to_dict() == {
+        'items': {
+            'item': {
+                'value': 1
+            },
+            'other': {
+                'value': 2
+            },
+        },
+        'item': {
+            'custom': 3
+        },
+    }
+
+    # Modifying the registry directly is also reflected
+    SerializeRootHparams.hparams_registry['items']['renamed'] = SerializeRootHparams.hparams_registry['items'].pop(
+        'other')
+    assert list(root.to_dict()['items']) == ['item', 'renamed']
@@ -0,0 +1,259 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+
+import datetime
+import glob
+import io
+import math
+import os
+import random
+import textwrap
+from typing import Any, Callable, Iterator
+
+import pytest
+import yaml
+
+from yahp.hparams import Hparams
+from yahp.inheritance import load_yaml_with_inheritance
+from yahp.utils import yaml_helpers
+
+requires_libyaml = pytest.mark.skipif(not yaml.__with_libyaml__, reason='PyYAML was built without libyaml')
+
+YAML_FILES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '**', '*.yaml'), recursive=True))
+
+YAML_DOCUMENTS = [
+    '',
+    'null',
+    'foo: bar',
+    'a: {b: [1, 2.5, -3e4, 0x1f, 0o17, .inf, -.inf, .nan]}',
+    'flags: [yes, no, on, off, true, False, ~, null]',
+    'date: 2021-10-17\ntime: 2021-10-17T12:34:56.789+02:00',
+    'base: &base {lr: 0.1, momentum: 0.9}\nderived:\n  <<: *base\n  lr: 0.2',
+    'text: |\n  line one\n  line two\nfolded: >-\n  folded\n  text',
+    'unicode: "caf\\u00e9 \\U0001F600"\nquoted: \'it\'\'s\'\nempty: ""',
+    '- {one: {intfield: 1}}\n- {two: {intfield: 2}}',
+    'tuple: !!python/tuple [1, 2]',
+]
+
+DUMP_DATA = [
+    {},
+    {
+        'int': 1,
+        'float': 1.5,
+        'exp': 1e-8,
+        'inf': float('inf'),
+        'none': None,
+        'bool': True
+    },
+    {
+        'str': 'hello',
+        'number_like': '123',
+        'bool_like': 'yes',
+        'empty': '',
+        'colon': 'a: b'
+    },
+    {
+        'unicode': 'café 😀',
+        'multiline': 'line one\nline two\n',
+        'long': 'word ' * 40
+    },
+    {
+        'nested': {
+            'list': [1, [2, 3], {
+                'a': None
+            }],
+            'empty_list': [],
+            'empty_dict': {}
+        }
+    },
+    {
+        'date': datetime.date(2021, 10, 17),
+        'tuple': (1, 2)
+    },
+]
+
+
+@pytest.fixture
+def use_implementation() -> Iterator[Callable[[str], None]]:
+    original = yaml_helpers.get_yaml_implementation()
+    yield yaml_helpers.set_yaml_implementation
+    yaml_helpers.set_yaml_implementation(original)
+
+
+def _normalize(data: Any) -> Any:
+    # NaN != NaN, so compare it by representation
+    if isinstance(data, float) and math.isnan(data):
+        return 'nan'
+    if isinstance(data, dict):
+        return {_normalize(k): _normalize(v) for k, v in data.items()}
+    if isinstance(data, (list, tuple)):
+        return type(data)(_normalize(v) for v in data)
+    return data
+
+
+def _load_with_each_implementation(load: Callable[[str], Any], use_implementation: Callable[[str], None], doc: str):
+    use_implementation('python')
+    expected = load(doc)
+    use_implementation('c')
+    actual = load(doc)
+    assert _normalize(actual) == _normalize(expected)
+    assert type(actual) is type(expected)
+
+
+@requires_libyaml
+@pytest.mark.parametrize('doc', YAML_DOCUMENTS)
+def test_full_load_equivalence(doc: str, use_implementation: Callable[[str], None]):
+    _load_with_each_implementation(yaml_helpers.full_load, use_implementation, doc)
+
+
+@requires_libyaml
+@pytest.mark.parametrize('doc', [doc for doc in YAML_DOCUMENTS if '!!python' not in doc])
+def test_safe_load_equivalence(doc: str, use_implementation: Callable[[str], None]):
+    _load_with_each_implementation(yaml_helpers.safe_load, use_implementation, doc)
+
+
+@requires_libyaml
+@pytest.mark.parametrize('filename', YAML_FILES, ids=lambda x: os.path.basename(x))
+def test_file_load_equivalence(filename: str, use_implementation: Callable[[str], None]):
+    use_implementation('python')
+    expected = load_yaml_with_inheritance(filename, cache='none')
+    use_implementation('c')
+    assert load_yaml_with_inheritance(filename, cache='none') == expected
+
+
+@requires_libyaml
+@pytest.mark.parametrize('data', DUMP_DATA)
+@pytest.mark.parametrize('default_flow_style', [False, None])
+def test_dump_equivalence(data: Any, default_flow_style: bool, use_implementation: Callable[[str], None]):
+    use_implementation('python')
+    expected = yaml_helpers.dump(data, default_flow_style=default_flow_style)
+    use_implementation('c')
+    actual = yaml_helpers.dump(data, default_flow_style=default_flow_style)
+    assert actual == expected
+    assert _normalize(yaml_helpers.full_load(actual)) == _normalize(data)
+
+
+@requires_libyaml
+@pytest.mark.parametrize('hparams_fixture', ['primitive_hparam', 'double_nested_hparams', 'choice_one_hparams'])
+def test_hparams_to_yaml_equivalence(hparams_fixture: str, request: pytest.FixtureRequest,
+                                     use_implementation: Callable[[str], None]):
+    hparams: Hparams = request.getfixturevalue(hparams_fixture)
+    use_implementation('python')
+    expected = (hparams.to_yaml(), str(hparams))
+    use_implementation('c')
+    assert (hparams.to_yaml(), str(hparams)) == expected
+
+
+def test_set_yaml_implementation(use_implementation: Callable[[str], None]):
+    use_implementation('python')
+    assert yaml_helpers.get_yaml_implementation() == 'python'
+    use_implementation('auto')
+    assert yaml_helpers.get_yaml_implementation() == ('c' if yaml.__with_libyaml__ else 'python')
+    with pytest.raises(ValueError, match='must be one of'):
+        use_implementation('rust')
+
+
+_RANDOM_WORDS = [
+    'foo', 'bar_baz', 'a/b/c.yaml', 'x-y', 'name+1', 'a=b', 'yes', 'No', 'null', '~', '=', '<<', '1e5', '1.5', '0x1f',
+    '0o17', '1_000', '2021-10-17', '.inf', '-x', '.hidden', 'café', 'a: b', 'a #b', "it's", '"quoted"', 'multi\nline',
+    ' lead', 'trail ', 'two  spaces', '', '_', '12abc', 'True', 'on'
+]
+
+
+def _random_str(rng: random.Random) -> str:
+    if rng.random() < 0.15:
+        # Long strings with spaces are folded by PyYAML
+        return ' '.join(rng.choice(['word', 'another_word', 'w']) for _ in range(rng.randrange(5, 30)))
+    if rng.random() < 0.05:
+        return 'k' * rng.randrange(100, 140)
+    return rng.choice(_RANDOM_WORDS)
+
+
+def _random_scalar(rng: random.Random):
+    return rng.choice([
+        lambda: _random_str(rng),
+        lambda: rng.randrange(-10**20, 10**20),
+        lambda: rng.choice([0.0, -0.0, 1e17, 1e-8, 0.1, -2.5e300,
+                            float('inf'), -float('inf'),
+                            float('nan')]),
+        lambda: rng.random() * 10**rng.randrange(-10, 20),
+        lambda: rng.choice([True, False, None]),
+    ])()
+
+
+def _random_data(rng: random.Random, depth: int):
+    if depth == 0 or rng.random() < 0.3:
+        return _random_scalar(rng)
+    if rng.random() < 0.5:
+        return [_random_data(rng, depth - 1) for _ in range(rng.randrange(4))]
+    return {_random_str(rng): _random_data(rng, depth - 1) for _ in range(rng.randrange(4))}
+
+
+FAST_DUMP_DATA = [
+    {
+        'a': {
+            'b': [1, [2, [3, {}]], {
+                'c': [],
+                'd': {
+                    'e': [{
+                        'f': None
+                    }]
+                }
+            }]
+        }
+    },
+    {
+        'z': 1,
+        'a': 2,
+        'M': [[], [[]], [{}]]
+    },
+    {
+        'path': 'checkpoints/run_1/ep0.pt',
+        'nested': {
+            'text': 'word ' * 15 + 'end'
+        }
+    },
+    {
+        'k' * 122: 'a b',
+        'short': 'words ' * 12 + 'end',
+    },
+    # Keys of mixed types cannot be sorted, so PyYAML keeps their order
+    {
+        1: 'a',
+        'b': 2
+    },
+    {
+        'json': {
+            'b': [2],
+            1: 'a'
+        }
+    },
+]
+
+
+@pytest.mark.parametrize('data', FAST_DUMP_DATA + DUMP_DATA)
+def test_dump_fast_path(data: Any, use_implementation: Callable[[str], None]):
+    expected = yaml.dump(data, Dumper=yaml.Dumper)
+    for implementation in ('python', 'auto'):
+        use_implementation(implementation)
+        assert yaml_helpers.dump(data) == expected
+        stream = io.StringIO()
+        yaml_helpers.dump(data, stream)
+        assert stream.getvalue() == expected
+        assert yaml_helpers.dump_indented(data, '  ') == textwrap.indent(expected.strip(), '  ')
+
+
+@pytest.mark.parametrize('implementation', ['python', pytest.param('c', marks=requires_libyaml)])
+@pytest.mark.parametrize('seed', range(3))
+def test_dump_fast_path_random(seed: int, implementation: str, use_implementation: Callable[[str], None]):
+    rng = random.Random(seed)
+    use_implementation(implementation)
+    dumper = yaml.CDumper if implementation == 'c' else yaml.Dumper
+    for _ in range(100):
+        data = {_random_str(rng): _random_data(rng, depth=4) for _ in range(rng.randrange(6))}
+        if rng.random() < 0.1 and data:
+            # Repeated objects are written as anchors and aliases
+            shared = [1, 2]
+            data[next(iter(data))] = [shared, {'x': shared}]
+        expected = yaml.dump(data, Dumper=dumper)
+        assert yaml_helpers.dump(data) == expected
+        assert yaml_helpers.dump_indented(data, '  ') == textwrap.indent(expected.strip(), '  ')
@@ -1,9 +1,11 @@
 # Copyright 2021 MosaicML. All Rights Reserved.
 
-from yahp.auto_hparams import ensure_hparams_cls, generate_hparams_cls
-from yahp.create_object import create, get_argparse
-from yahp.field import auto, optional, required
+from yahp.auto_hparams import clear_hparams_cls_cache, ensure_hparams_cls, generate_hparams_cls
+from yahp.create_object import compile_create, create, create_iter, create_many, get_argparse
+from yahp.diffing import diff
+from yahp.field import auto, auto_fields, optional, required
 from yahp.hparams import Hparams
+from yahp.lazy import LazyObject, Thunk
 from yahp.serialization import serialize
 
 from .version import __version__
@@ -12,10 +14,18 @@ __all__ = [
     'Hparams',
     'ensure_hparams_cls',
     'generate_hparams_cls',
+    'clear_hparams_cls_cache',
     'create',
+    'compile_create',
+    'create_many',
+    'create_iter',
     'get_argparse',
     'auto',
+    'auto_fields',
     'optional',
     'required',
     'serialize',
+    'diff',
+    'LazyObject',
+    'Thunk',
 ]
@@ -1,8 +1,11 @@
 # Copyright 2021 MosaicML. All Rights Reserved.
 
+import collections
 import dataclasses
+import functools
 import inspect
-from typing import Any, Callable, Type, get_type_hints
+import threading
+from typing import Any, Callable, Dict, Optional, Type, get_type_hints
 
 import yahp.field
 from yahp.hparams import Hparams
@@ -11,22 +14,32 @@ from yahp.utils.type_helpers import HparamsType
 __all__ = [
     'generate_hparams_cls',
     'ensure_hparams_cls',
+    'clear_hparams_cls_cache',
 ]
 
+# Maps a constructor to the hparams classes generated for it, keyed by ``ignore_docstring_errors``, in the order
+# that they were last used. The generated classes reference their constructor, so the cache cannot be weakly keyed.
+# Instead, it is bounded, and the least recently used constructor is released when it is full.
+_generated_hparams_cls_cache: 'collections.OrderedDict[Callable, Dict[bool, Type[Hparams]]]' = collections.OrderedDict()
+_generated_hparams_cls_cache_lock = threading.Lock()
+_GENERATED_HPARAMS_CLS_CACHE_SIZE = 256
 
-def generate_hparams_cls(constructor: Callable, ignore_docstring_errors: bool = False) -> Type[Hparams]:
-    """Generate a :class:`.Hparams` from the signature and docstring of a callable.
 
-    Args:
-        constructor (Callable): A function or class
-        auto_initialize (bool, optional): Whether to auto-initialize the class when instantiating it from
-            configuration.
-        ignore_docstring_errors (bool, optional): Whether to ignore any docstring errors.
+class _ConstructorRegistry:
+    """Class attribute that reads the ``hparams_registry`` of the constructor whenever it is accessed.
 
-    Returns:
-        Type[Hparams]: A subclass of :class:`.Hparams` where :meth:`.Hparams.initialize_object()` returns
-            invokes the ``constructor``.
+    Generated classes are cached, so the registry must not be captured when the class is generated;
+    otherwise, reassigning ``constructor.hparams_registry`` would be ignored.
     """
+
+    def __init__(self, constructor: Callable) -> None:
+        self.constructor = constructor
+
+    def __get__(self, instance: Any, owner: Any = None) -> Any:
+        return getattr(self.constructor, 'hparams_registry', None)
+
+
+def _build_hparams_cls(constructor: Callable, ignore_docstring_errors: bool) -> Type[Hparams]:
     # dynamically generate an hparams class from an init signature
 
     # Extract the fields from the init signature
@@ -36,6 +49,7 @@ def generate_hparams_cls(constructor: Callable, ignore_docstring_errors: bool =
     sig = inspect.signature(constructor)
     parameters = sig.parameters
 
+    param_annotations = {}
     for param_name in parameters:
         # Using the `type_hints` dictionary to ensure that forward references are resolved
         # If it is untyped, resolve to 'Any'
@@ -48,10 +62,12 @@ def generate_hparams_cls(constructor: Callable, ignore_docstring_errors: bool =
             raise TypeError(
                 f'Type annotation {param_annotation} for field {constructor.__name__}.{param_name} is not supported'
             ) from e
+        param_annotations[param_name] = param_annotation
 
-        auto_field = yahp.field.auto(constructor, param_name, ignore_docstring_errors=ignore_docstring_errors)
-
-        field_list.append((param_name, param_annotation, auto_field))
+    # Build all fields at once, so the docstring is only parsed once
+    auto_fields = yahp.field.auto_fields(constructor, ignore_docstring_errors=ignore_docstring_errors)
+    for param_name, param_annotation in param_annotations.items():
+        field_list.append((param_name, param_annotation, auto_fields[param_name]))
 
     # Build the hparams class dynamically
 
@@ -60,9 +76,9 @@ def generate_hparams_cls(constructor: Callable, ignore_docstring_errors: bool =
         fields=field_list,
         bases=(Hparams,),
         namespace={
-            # If there was a registry, bind it -- otherwise set it to None
+            # If there is a registry, use it -- otherwise it is None
             'hparams_registry':
-                getattr(constructor, 'hparams_registry', None),
+                _ConstructorRegistry(constructor),
 
             # Set the initialize_object function to something that, when invoked, calls the
             # constructor
@@ -74,18 +90,90 @@ def generate_hparams_cls(constructor: Callable, ignore_docstring_errors: bool =
     return hparams_cls
 
 
-def ensure_hparams_cls(constructor: Callable) -> Type[Hparams]:
+def generate_hparams_cls(constructor: Callable, ignore_docstring_errors: bool = False) -> Type[Hparams]:
+    """Generate a :class:`.Hparams` from the signature and docstring of a callable.
+
+    Unlike :func:`ensure_hparams_cls`, this function always builds a new class.
+
+    Args:
+        constructor (Callable): A function or class
+        auto_initialize (bool, optional): Whether to auto-initialize the class when instantiating it from
+            configuration.
+        ignore_docstring_errors (bool, optional): Whether to ignore any docstring errors.
+
+    Returns:
+        Type[Hparams]: A subclass of :class:`.Hparams` where :meth:`.Hparams.initialize_object()` returns
+            invokes the ``constructor``.
+    """
+    return _build_hparams_cls(constructor, ignore_docstring_errors)
+
+
+def _is_cacheable(constructor: Callable) -> bool:
+    # Bound methods and partials are usually created on the fly, so a new object is passed on every call.
+    # Caching them would keep their targets alive, without ever being hit again.
+    return not inspect.ismethod(constructor) and not isinstance(constructor, functools.partial)
+
+
+def ensure_hparams_cls(constructor: Callable, ignore_docstring_errors: bool = False) -> Type[Hparams]:
     """Ensure that ``constructor`` is a :class:`.Hparams` class.
 
+    Generated classes are cached per ``constructor`` and ``ignore_docstring_errors``, so repeated calls return
+    the same class. A cached class keeps its constructor alive, so the cache is bounded: the classes of the least
+    recently used constructor are released once 256 constructors are cached. See :func:`clear_hparams_cls_cache` to
+    invalidate the cache (e.g. after modifying the signature or docstring of a constructor, or to release a
+    constructor). Bound methods and :func:`functools.partial` objects are not cached.
+
     Args:
         constructor (Callable): A class, function, or existing :class:`.Hparams` class.
             If an existing :class:`.Hparams`, it will be returned as-is; otherwise
             :func:`generate_hparams_cls` will be used to dynamically create a
             :class:`.Hparams` from the docstring and signature.
+        ignore_docstring_errors (bool, optional): Whether to ignore any docstring errors
+            when generating the class.
     Returns:
         Type[Hparams]: A :class:`.Hparams` class.
     """
     if isinstance(constructor, type) and issubclass(constructor, Hparams):
         return constructor
-    else:
-        return generate_hparams_cls(constructor)
+    if not _is_cacheable(constructor):
+        return generate_hparams_cls(constructor, ignore_docstring_errors=ignore_docstring_errors)
+    try:
+        hash(constructor)
+    except TypeError:
+        # The constructor is not hashable, so do not cache the generated class
+        return generate_hparams_cls(constructor, ignore_docstring_errors=ignore_docstring_errors)
+    with _generated_hparams_cls_cache_lock:
+        generated_classes = _generated_hparams_cls_cache.get(constructor)
+        if generated_classes is not None:
+            _generated_hparams_cls_cache.move_to_end(constructor)
+            if ignore_docstring_errors in generated_classes:
+                return generated_classes[ignore_docstring_errors]
+    # Generated without holding the lock, as it can be slow
+    hparams_cls = generate_hparams_cls(constructor, ignore_docstring_errors=ignore_docstring_errors)
+    with _generated_hparams_cls_cache_lock:
+        generated_classes = _generated_hparams_cls_cache.get(constructor)
+        if generated_classes is None:
+            generated_classes = {}
+            _generated_hparams_cls_cache[constructor] = generated_classes
+            while len(_generated_hparams_cls_cache) > _GENERATED_HPARAMS_CLS_CACHE_SIZE:
+                _generated_hparams_cls_cache.popitem(last=False)
+        # If another thread generated the class first, return that one, so every call returns the same class
+        return generated_classes.setdefault(ignore_docstring_errors, hparams_cls)
+
+
+def clear_hparams_cls_cache(constructor: Optional[Callable] = None) -> None:
+    """Invalidate the classes cached by :func:`ensure_hparams_cls`.
+
+    Args:
+        constructor (Callable, optional): If specified, only invalidate the classes generated for this
+            constructor. Otherwise, invalidate the entire cache.
+    """
+    with _generated_hparams_cls_cache_lock:
+        if constructor is None:
+            _generated_hparams_cls_cache.clear()
+            return
+        try:
+            _generated_hparams_cls_cache.pop(constructor, None)
+        except TypeError:
+            # Constructors that are not hashable are never cached
+            pass
@@ -1,5 +1,7 @@
 # Copyright 2021 MosaicML. All Rights Reserved.
 
+from yahp.create_object.compiled import CompiledCreate, compile_create
+from yahp.create_object.create_many import create_iter, create_many
 from yahp.create_object.create_object import create, get_argparse
 
-__all__ = ['create', 'get_argparse']
+__all__ = ['create', 'get_argparse', 'compile_create', 'CompiledCreate', 'create_many', 'create_iter']
@@ -3,16 +3,17 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import logging
-from dataclasses import _MISSING_TYPE, MISSING, asdict, dataclass, fields
+from dataclasses import _MISSING_TYPE, MISSING, dataclass, field
 from enum import Enum
-from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, Union, get_type_hints
-
-import yaml
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
 
 import yahp as hp
 from yahp.create_object.create_object import ensure_hparams_cls
-from yahp.utils.type_helpers import HparamsType, get_default_value, is_field_required, safe_issubclass
+from yahp.utils import yaml_helpers
+from yahp.utils.field_plan import FieldPlan, get_hparams_plan
+from yahp.utils.type_helpers import safe_issubclass
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +22,8 @@ logger = logging.getLogger(__name__)
 class ParserArgument:
     # ParserArgument represents an argument to add to argparse.
     full_name: str
-    helptext: str
+    # The helptext is formatted lazily, as it is only needed when printing help
+    get_helptext: Callable[[], str] = field(repr=False, compare=False)
     nargs: Optional[str]
     choices: Optional[List[str]] = None
     short_name: Optional[str] = None
@@ -34,12 +36,22 @@ class ParserArgument:
         return ans
 
     def __str__(self) -> str:
-        return yaml.dump(asdict(self))
-
-    def add_to_argparse(self, container: argparse._ActionsContainer) -> None:
+        return yaml_helpers.dump({
+            'full_name': self.full_name,
+            'helptext': self.get_helptext(),
+            'nargs': self.nargs,
+            'choices': self.choices,
+            'short_name': self.short_name,
+        })
+
+    def get_option_strings(self) -> List[str]:
         names = [f'--{self.full_name}']
         if self.short_name is not None and self.short_name != self.full_name:
             names.insert(0, f'--{self.short_name}')
+        return names
+
+    def add_to_argparse(self, container: argparse._ActionsContainer, add_helptext: bool = True) -> None:
+        names = self.get_option_strings()
         # not using argparse choices as they are too strict (e.g. case sensitive)
         metavar = self.full_name.split('.')[-1].upper()
         if self.choices is not None:
@@ -55,7 +67,7 @@ class ParserArgument:
             const=True if self.nargs == '?' else None,
             # Replacing all % with %% to escape, so argparse does not attempt to
             # interpolate it with an argparse variable
-            help=self.helptext.replace('%', '%%'),
+            help=self.get_helptext().replace('%', '%%') if add_helptext else None,
             metavar=metavar,
         )
 
@@ -114,22 +126,48 @@ class ArgparseNameRegistry:
         return x in self._shortnames
 
 
+def cli_args_may_match(cli_args: Sequence[str], option_strings: Sequence[str]) -> bool:
+    # Cheaply check whether any of the ``cli_args`` could be parsed by an argparse option in ``option_strings``.
+    # This errs on the side of returning True; e.g. it accounts for argparse's prefix matching of abbreviations.
+    for cli_arg in cli_args:
+        if cli_arg == '--':
+            # Everything after ``--`` is positional; let argparse handle it
+            return True
+        if cli_arg.startswith('--'):
+            name = cli_arg.split('=', 1)[0]
+            if any(x.startswith(name) for x in option_strings if x.startswith('--')):
+                return True
+        elif cli_arg.startswith('-'):
+            # Single-dash options can have the value attached, e.g. ``-fconfig.yaml``
+            if any(cli_arg.startswith(x) for x in option_strings if not x.startswith('--')):
+                return True
+    return False
+
+
+def is_help_requested(cli_args: Sequence[str]) -> bool:
+    # Whether the ``cli_args`` contain (or may contain) the ``--help`` flag
+    return cli_args_may_match(cli_args, ('-h', '--help'))
+
+
 def get_hparams_file_from_cli(
     *,
     cli_args: List[str],
     argparse_name_registry: ArgparseNameRegistry,
     argument_parsers: List[argparse.ArgumentParser],
+    lazy: bool = False,
 ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    argparse_name_registry.reserve('f', 'file', 'd', 'dump', 'validate')
+    if lazy and not cli_args_may_match(cli_args, ('-f', '--file', '-d', '--dump', '--validate')):
+        return None, None, False
     parser = argparse.ArgumentParser(add_help=False)
     argument_parsers.append(parser)
-    argparse_name_registry.reserve('f', 'file', 'd', 'dump', 'validate')
     parser.add_argument('-f',
                         '--file',
                         type=str,
                         default=None,
                         dest='file',
                         required=False,
-                        help='Load data from this YAML file into the Hparams.')
+                        help='Load data from this YAML file into the Hparams. A .json file is loaded as JSON.')
     parser.add_argument(
         '-d',
         '--dump',
@@ -139,7 +177,8 @@ def get_hparams_file_from_cli(
         default=None,
         required=False,
         metavar='stdout',
-        help='Dump the resulting Hparams to the specified YAML file (defaults to `stdout`) and exit.',
+        help='Dump the resulting Hparams to the specified YAML file (defaults to `stdout`) and exit. '
+        'A .json file is written as JSON.',
     )
     parser.add_argument(
         '--validate',
@@ -155,12 +194,16 @@ def get_commented_map_options_from_cli(
     cli_args: List[str],
     argparse_name_registry: ArgparseNameRegistry,
     argument_parsers: List[argparse.ArgumentParser],
+    lazy: bool = False,
 ) -> Optional[Tuple[str, bool, bool]]:
+    argparse_name_registry.reserve('s', 'save_template', 'i', 'interactive', 'c', 'concise')
+    if lazy and not cli_args_may_match(cli_args, ('-s', '--save_template')):
+        # ``--interactive`` and ``--concise`` are only applicable with ``--save_template``
+        return None
+
     parser = argparse.ArgumentParser(add_help=False)
     argument_parsers.append(parser)
 
-    argparse_name_registry.reserve('s', 'save_template', 'i', 'interactive', 'c', 'concise')
-
     parser.add_argument(
         '-s',
         '--save_template',
@@ -205,6 +248,21 @@ def cli_parse(val: Union[str, _MISSING_TYPE]) -> Union[str, None, _MISSING_TYPE]
     return val
 
 
+def _get_helptext(f: FieldPlan) -> str:
+    type_name = str(f.hparams_type)
+    helptext = f'<{type_name}> {f.doc}'
+
+    default = f.get_default_value()
+    if f.required:
+        helptext = f'(required): {helptext}'
+    if default != MISSING:
+        if default is None or safe_issubclass(type(default), (int, float, str, Enum)):
+            helptext = f'{helptext} (Default: {default}).'
+        elif safe_issubclass(type(default), hp.Hparams):
+            helptext = f'{helptext} (Default: {type(default).__name__}).'
+    return helptext
+
+
 def retrieve_args(
     constructor: Callable,
     prefix: List[str],
@@ -214,34 +272,13 @@ def retrieve_args(
 
     # Create a dummy hparams class, and then parse from that
     cls = ensure_hparams_cls(constructor)
-    field_types = get_type_hints(cls)
     ans: List[ParserArgument] = []
 
-    for f in fields(cls):
-        if not f.init:
-            continue
-        ftype = HparamsType(field_types[f.name])
+    for f in get_hparams_plan(cls).fields:
+        ftype = f.hparams_type
         full_name = '.'.join(prefix + [f.name])
-        type_name = str(ftype)
-        helptext = f"<{type_name}> {f.metadata['doc']}"
-
-        required = is_field_required(f)
-        default = get_default_value(f)
-        if required:
-            helptext = f'(required): {helptext}'
-        if default != MISSING:
-            if default is None or safe_issubclass(type(default), (int, float, str, Enum)):
-                helptext = f'{helptext} (Default: {default}).'
-            elif safe_issubclass(type(default), hp.Hparams):
-                helptext = f'{helptext} (Default: {type(default).__name__}).'
-
-        # Assumes that if a field default is supposed to be None it will not appear in the namespace
-        if safe_issubclass(type(default), hp.Hparams):
-            # if the default is hparams, set the argparse default to the hparams registry key
-            # for this hparams object
-            if cls.hparams_registry is not None and f.name in cls.hparams_registry:
-                inverted_field_registry = {v: k for (k, v) in cls.hparams_registry[f.name].items()}
-                default = inverted_field_registry[type(default)]
+        required = f.required
+        get_helptext = functools.partial(_get_helptext, f)
 
         nargs = None
         if not ftype.is_recursive:
@@ -261,12 +298,12 @@ def retrieve_args(
                 full_name=full_name,
                 nargs=nargs,
                 choices=choices,
-                helptext=helptext,
+                get_helptext=get_helptext,
             )
             ans.append(arg)
         else:
             # Split into choose one
-            if cls.hparams_registry is None or f.name not in cls.hparams_registry:
+            if f.registry is None:
                 # Defaults to direct nesting if missing from hparams_registry
                 if ftype.is_list:
                     # if it's a list of singletons, then print a warning and skip it
@@ -277,12 +314,12 @@ def retrieve_args(
                     arg = ParserArgument(
                         full_name=full_name,
                         nargs=nargs,
-                        helptext=helptext,
+                        get_helptext=get_helptext,
                     )
                     ans.append(arg)
             else:
                 # Found in registry
-                registry_entry = cls.hparams_registry[f.name]
+                registry_entry = f.registry
                 choices = sorted(list(registry_entry.keys()))
                 if ftype.is_list:
                     nargs = '+' if required else '*'
@@ -291,7 +328,7 @@ def retrieve_args(
                     full_name=full_name,
                     nargs=nargs,
                     choices=choices,
-                    helptext=helptext,
+                    get_helptext=get_helptext,
                 )
                 ans.append(arg)
     argparse_name_registry.add(*ans)
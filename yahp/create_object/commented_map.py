@@ -2,15 +2,17 @@
 
 from __future__ import annotations
 
-from dataclasses import MISSING, fields
+from dataclasses import MISSING
 from enum import Enum
-from typing import TYPE_CHECKING, Callable, List, NamedTuple, Optional, Type, get_type_hints
+from typing import TYPE_CHECKING, Callable, List, NamedTuple, Optional, Type
 
 import yahp as hp
 from yahp.create_object.create_object import ensure_hparams_cls
+from yahp.utils.field_plan import get_hparams_plan
 from yahp.utils.interactive import query_with_options
 from yahp.utils.iter_helpers import ensure_tuple, list_to_deduplicated_dict
-from yahp.utils.type_helpers import HparamsType, get_default_value, is_field_required, safe_issubclass
+from yahp.utils.registry_index import get_registry_index
+from yahp.utils.type_helpers import safe_issubclass
 
 if TYPE_CHECKING:
     from yahp.types import JSON, HparamsField
@@ -155,16 +157,13 @@ def to_commented_map(
     # Convert the class to an hparams class if a constructor was passed in
     cls = ensure_hparams_cls(constructor)
     output = CommentedMap()
-    field_types = get_type_hints(cls)
-    for f in fields(cls):
-        if not f.init:
-            continue
+    for f in get_hparams_plan(cls).fields:
         path_with_fname = list(path) + [f.name]
-        ftype = HparamsType(field_types[f.name])
-        helptext = f.metadata.get('doc')
+        ftype = f.hparams_type
+        helptext = f.doc
         helptext_suffix = f' Description: {helptext}.' if helptext is not None else ''
-        required = is_field_required(f)
-        default = get_default_value(f)
+        required = f.required
+        default = f.get_default_value()
         default_suffix = ''
         optional_prefix = ' (Required)'
         if not required:
@@ -174,8 +173,8 @@ def to_commented_map(
             elif safe_issubclass(default, hp.Hparams):
                 default_suffix = f' Defaults to {type(default).__name__}.'
             # Don't print the default, it's too big
-        if default == MISSING and 'template_default' in f.metadata:
-            default = f.metadata['template_default']
+        if default == MISSING and 'template_default' in f.field.metadata:
+            default = f.field.metadata['template_default']
         choices = []
 
         # The hparams type could be a primitive, enum, hparams class, custom object, or a list
@@ -192,7 +191,7 @@ def to_commented_map(
             else:
                 output[f.name] = None
         # it's a dataclass, or list of dataclasses
-        elif cls.hparams_registry is None or f.name not in cls.hparams_registry:
+        elif f.registry is None:
             # non-abstract hparams
             if default is None:
                 output[f.name] = None
@@ -211,8 +210,8 @@ def to_commented_map(
                 else:
                     output[f.name] = output[f.name]
         else:
-            inverted_hparams = {v: k for (k, v) in cls.hparams_registry[f.name].items()}
-            choices = [x.__name__ for x in cls.hparams_registry[f.name].values()]
+            registry_index = get_registry_index(cls, f.name)
+            choices = [x.__name__ for x in f.registry.values()]
             if default is None:
                 output[f.name] = None
             elif default == MISSING:
@@ -220,11 +219,12 @@ def to_commented_map(
             else:
                 if ftype.is_list:
                     output[f.name] = list_to_deduplicated_dict([{
-                        inverted_hparams[type(x)]: x.to_dict() if isinstance(x, hp.Hparams) else {}
+                        registry_index.get_key(type(x)): x.to_dict() if isinstance(x, hp.Hparams) else {}
                     } for x in ensure_tuple(default)])
                 else:
                     output[f.name] = {
-                        inverted_hparams[type(default)]: default.to_dict() if isinstance(default, hp.Hparams) else {},
+                        registry_index.get_key(type(default)):
+                            default.to_dict() if isinstance(default, hp.Hparams) else {},
                     }
         if options.add_docs:
             _add_commenting(cm=output,
@@ -0,0 +1,393 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+"""Code-generated constructors for building :class:`~yahp.hparams.Hparams` trees from data."""
+
+from __future__ import annotations
+
+import linecache
+import os
+from dataclasses import MISSING
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from yahp.auto_hparams import ensure_hparams_cls
+from yahp.create_object.create_object import (_get_registry_key_and_data, _get_split_key, _iter_concrete_list_items,
+                                              _iter_registry_list_items, _MissingRequiredFieldException)
+from yahp.hparams import Hparams
+from yahp.lazy import LazyObject, Thunk, is_lazy
+from yahp.serialization import register_hparams_for_instance, register_hparams_registry_key_for_instance
+from yahp.utils.field_plan import FieldPlan, get_hparams_plan
+from yahp.utils.type_helpers import is_none_like
+
+if TYPE_CHECKING:
+    from yahp.types import JSON
+
+__all__ = ['CompiledCreate', 'compile_create']
+
+TObject = TypeVar('TObject')
+
+# A compiled node takes the data for a class and the CLI-style prefix (e.g. ``'model.encoder.'``) for its fields,
+# and returns an hparams instance.
+_CompiledNode = Callable[[Dict[str, 'JSON'], str], Hparams]
+
+# (constructor, allow_recursion) -> compiled node
+_NodeKey = Tuple[Callable, bool]
+
+# (field name, registry, is_list, initialize, thunk, [(node, data, prefix, registry key), ...])
+_DeferredCreateCalls = Tuple[str, Optional[Dict[str, Callable]], bool, bool, bool,
+                             List[Tuple[_CompiledNode, Dict[str, 'JSON'], str, Optional[str]]]]
+
+
+def _is_hparams_cls(constructor: Any) -> bool:
+    return isinstance(constructor, type) and issubclass(constructor, Hparams)
+
+
+def _construct_deferred(kwargs: Dict[str, Any], deferred: List[_DeferredCreateCalls], lazy: bool) -> None:
+    # Equivalent of the deferred create calls in ``_create``, for when there are no CLI args
+    for fname, registry, is_list, initialize, thunk, create_calls in deferred:
+        sub_objs = []
+        for node, sub_data, sub_prefix, registry_key in create_calls:
+            obj_hparams = node(sub_data, sub_prefix)
+            if not initialize:
+                obj = obj_hparams
+            elif thunk:
+                obj = Thunk(obj_hparams.initialize_object)
+            elif lazy:
+                obj = LazyObject(Thunk(obj_hparams.initialize_object))
+            else:
+                obj = obj_hparams.initialize_object()
+            if is_lazy(obj) or not isinstance(obj, Hparams):
+                register_hparams_for_instance(obj, obj_hparams)
+            sub_objs.append(obj)
+            if registry is not None:
+                assert registry_key is not None
+                register_hparams_registry_key_for_instance(obj, registry, registry_key)
+        kwargs[fname] = sub_objs if is_list else sub_objs[0]
+
+
+class _NodeCompiler:
+    """Generates, and caches, one Python function per ``(constructor, allow_recursion)`` pair.
+
+    Child nodes are compiled lazily, the first time they are needed, so an unused registry entry that
+    cannot be converted into an :class:`.Hparams` does not prevent compilation.
+
+    Args:
+        lazy (bool): Whether nested objects are passed to their parent as :class:`.LazyObject` proxies,
+            as for ``create(..., lazy=True)``.
+    """
+
+    def __init__(self, lazy: bool) -> None:
+        self._nodes: Dict[_NodeKey, _CompiledNode] = {}
+        self._lazy = lazy
+
+    def get_node(self, constructor: Callable, allow_recursion: bool) -> _CompiledNode:
+        key = (constructor, allow_recursion)
+        node = self._nodes.get(key)
+        if node is None:
+            node = self._compile(constructor, allow_recursion)
+            self._nodes[key] = node
+        return node
+
+    def _compile(self, constructor: Callable, allow_recursion: bool) -> _CompiledNode:
+        # Like ``_create``, check whether the constructor is abstract before converting it
+        if constructor.__module__ in ('typing', 'typing_extensions', 'types'):
+            return self._compile_abstract(constructor)
+        cls = ensure_hparams_cls(constructor)
+        plan = get_hparams_plan(cls)
+        namespace: Dict[str, Any] = {
+            'MISSING': MISSING,
+            'Hparams': Hparams,
+            'os': os,
+            'cls': cls,
+            'names': plan.names,
+            'is_none_like': is_none_like,
+            'get_node': self.get_node,
+            'iter_concrete_list_items': _iter_concrete_list_items,
+            'get_registry_key_and_data': _get_registry_key_and_data,
+            'iter_registry_list_items': _iter_registry_list_items,
+            'get_split_key': _get_split_key,
+            'construct_deferred': _construct_deferred,
+            'lazy': self._lazy,
+            'MissingRequiredFieldException': _MissingRequiredFieldException,
+        }
+        lines = [
+            'def create(data, prefix):',
+            '    if not names.issuperset(data):',
+            '        cls.validate_keys(list(data.keys()), allow_missing_keys=True)',
+            '    kwargs = {}',
+            '    deferred = []',
+        ]
+        child_allow_recursion = _is_hparams_cls(constructor)
+        # Constructors can opt in to receiving thunks, rather than initialized objects, for some fields
+        thunk_fields = getattr(constructor, 'hparams_thunk_fields', ())
+        for i, f in enumerate(plan.fields):
+            lines.extend(
+                _generate_field(
+                    f,
+                    i,
+                    namespace,
+                    constructor=constructor,
+                    allow_recursion=allow_recursion,
+                    child_allow_recursion=child_allow_recursion,
+                    thunk=f.name in thunk_fields,
+                ))
+        required_names = tuple(
+            f.name for f in plan.fields if f.field.default == MISSING and f.field.default_factory == MISSING)
+        namespace['required_names'] = required_names
+        lines.extend([
+            '    if deferred:',
+            '        construct_deferred(kwargs, deferred, lazy)',
+        ])
+        if len(required_names) > 0:
+            lines.extend([
+                '    missing_required_fields = [prefix + name for name in required_names if name not in kwargs]',
+                '    if missing_required_fields:',
+                '        raise MissingRequiredFieldException(*missing_required_fields)',
+            ])
+        lines.append('    return cls(**kwargs)')
+        return _exec_function('\n'.join(lines) + '\n', namespace, name=f'{cls.__qualname__}.create')
+
+    def _compile_abstract(self, constructor: Callable) -> _CompiledNode:
+        # YAHP cannot instantiate abstract types from `typing`, `typing_extensions`, or `types`
+        def create(data: Dict[str, JSON], prefix: str) -> Hparams:
+            del data  # unused
+            raise TypeError((f'Argument {prefix[:-1]} with type annotation {constructor} is abstract; however, '
+                             'abstract types are not supported without the concrete implementations defined in the '
+                             'hparams_registry.'))
+
+        return create
+
+
+def _exec_function(source: str, namespace: Dict[str, Any], name: str) -> _CompiledNode:
+    filename = f'<yahp compiled {name}>'
+    # Register the source so tracebacks through generated code are readable
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    exec(compile(source, filename, 'exec'), namespace)
+    return namespace['create']
+
+
+def _get_exact_types(f: FieldPlan) -> Tuple[type, ...]:
+    # Types for which ``HparamsType.convert`` returns the value as-is. Strings are excluded for optional
+    # fields, as ``''`` and ``'none'`` are converted into None.
+    if f.hparams_type.is_list:
+        return ()
+    exact_types = []
+    for t in f.hparams_type.types:
+        if f.hparams_type.is_optional and issubclass(t, str):
+            continue
+        if t in (bool, int, float, str) or (isinstance(t, type) and issubclass(t, Enum)):
+            exact_types.append(t)
+    return tuple(exact_types)
+
+
+def _generate_field(
+    f: FieldPlan,
+    i: int,
+    namespace: Dict[str, Any],
+    *,
+    constructor: Callable,
+    allow_recursion: bool,
+    child_allow_recursion: bool,
+    thunk: bool,
+) -> List[str]:
+    ftype = f.hparams_type
+    name = repr(f.name)
+    lines = [f'    # {f.name}: {ftype}']
+
+    if not allow_recursion and not _is_hparams_cls(constructor) and ftype.is_recursive:
+        # See ``_create``: without recursion, only primitive, json, enum, and hparams fields are allowed
+        try:
+            is_allowed = all(issubclass(x, Hparams) for x in ftype.types)
+        except TypeError as e:
+            namespace[f'error_{i}'] = TypeError(*e.args)
+            return lines + [f'    raise error_{i}']
+        if not is_allowed:
+            namespace[f'error_{i}'] = TypeError(
+                (f'Type annotation {ftype} for field {constructor.__name__}.{f.name} is not allowed. '
+                 'For nested non-primitive types, please create a YAHP Hparams dataclass.'))
+            return lines + [f'    raise error_{i}']
+
+    # Values come from the data, then environment variables
+    lines.extend([
+        f'    if {name} in data:',
+        f'        val = data[{name}]',
+        '    else:',
+        f"        env_name = (prefix + {name}).upper().replace('.', '_')",
+        '        val = os.environ[env_name] if env_name in os.environ else MISSING',
+    ])
+
+    if not ftype.is_recursive:
+        namespace[f'ftype_{i}'] = ftype
+        namespace[f'exact_types_{i}'] = _get_exact_types(f)
+        lines.append('    if val is MISSING:')
+        if f.required:
+            # let the missing field check error
+            lines.append('        pass')
+        elif f.field.default is not MISSING:
+            namespace[f'default_{i}'] = f.field.default
+            lines.append(f'        kwargs[{name}] = default_{i}')
+        else:
+            namespace[f'default_factory_{i}'] = f.field.default_factory
+            lines.append(f'        kwargs[{name}] = default_factory_{i}()')
+        lines.extend([
+            f'    elif val.__class__ in exact_types_{i}:',
+            f'        kwargs[{name}] = val',
+            '    else:',
+            f'        kwargs[{name}] = ftype_{i}.convert(val, prefix + {name})',
+        ])
+        return lines
+
+    namespace[f'initialize_{i}'] = not _is_hparams_cls(ftype.type)
+    namespace[f'thunk_{i}'] = thunk
+    body: List[str] = []
+    if f.registry is None and not ftype.is_list:
+        # concrete, singleton hparams
+        namespace[f'type_{i}'] = ftype.type
+        body = [
+            f'sub_data = data.get({name})',
+            'if sub_data is None:',
+            '    sub_data = {}',
+            'if not isinstance(sub_data, dict):',
+            f"    raise ValueError(prefix + {name} + ' must be a dict in the yaml')",
+            f'node = get_node(type_{i}, {child_allow_recursion})',
+            f'deferred.append(({name}, None, False, initialize_{i}, thunk_{i},',
+            f"                 [(node, sub_data, prefix + {name} + '.', None)]))",
+        ]
+    elif f.registry is None:
+        # list of concrete hparams
+        namespace[f'type_{i}'] = ftype.type
+        body = [
+            'create_calls = []',
+            f'for j, sub_data in enumerate(iter_concrete_list_items(data.get({name}, []), prefix + {name})):',
+            f'    assert issubclass(type_{i}, Hparams)',
+            f'    node = get_node(type_{i}, {child_allow_recursion})',
+            f"    create_calls.append((node, sub_data, prefix + {name} + '.' + str(j) + '.', None))",
+            f'deferred.append(({name}, None, True, initialize_{i}, thunk_{i}, create_calls))',
+        ]
+    elif not ftype.is_list:
+        # abstract, singleton hparams
+        namespace[f'registry_{i}'] = f.registry
+        body = [
+            f'key, sub_data = get_registry_key_and_data(val, data.get({name}), prefix + {name})',
+            f'sub_constructor = registry_{i}[key]',
+            f'node = get_node(sub_constructor, {child_allow_recursion})',
+            f'deferred.append(({name}, registry_{i}, False, initialize_{i}, thunk_{i},',
+            f"                 [(node, sub_data, prefix + {name} + '.' + key + '.', key)]))",
+        ]
+    else:
+        # list of abstract hparams
+        namespace[f'registry_{i}'] = f.registry
+        body = [
+            'create_calls = []',
+            f'for key, sub_data in iter_registry_list_items(val, data.get({name}), prefix + {name}):',
+            '    split_key, _ = get_split_key(key)',
+            f'    sub_constructor = registry_{i}[split_key]',
+            f'    node = get_node(sub_constructor, {child_allow_recursion})',
+            f"    create_calls.append((node, sub_data, prefix + {name} + '.' + key + '.', split_key))",
+            f'deferred.append(({name}, registry_{i}, True, initialize_{i}, thunk_{i}, create_calls))',
+        ]
+
+    # Abstract hparams use the default if missing
+    condition = 'val is not MISSING' if f.registry is not None else None
+    if ftype.is_optional:
+        lines.extend([
+            f'    if is_none_like(val, allow_list={ftype.is_list}):',
+            f'        kwargs[{name}] = None',
+            f'    elif {condition}:' if condition is not None else '    else:',
+        ])
+    elif condition is not None:
+        lines.append(f'    if {condition}:')
+    else:
+        return lines + ['    ' + line for line in body]
+    return lines + ['        ' + line for line in body]
+
+
+class CompiledCreate(Generic[TObject]):
+    """A specialized constructor for ``constructor``, returned by :func:`compile_create`.
+
+    Calling an instance is equivalent to ``create(constructor, data=data, cli_args=False, lazy=lazy)``.
+
+    Args:
+        constructor (type | callable): Class or function.
+        lazy (bool, optional): Whether nested objects that are not :class:`.Hparams` are passed to their parent
+            as :class:`.LazyObject` proxies. (default: ``False``)
+    """
+
+    def __init__(self, constructor: Callable[..., TObject], lazy: bool = False) -> None:
+        self.constructor = constructor
+        self.lazy = lazy
+        self._compiler = _NodeCompiler(lazy)
+        self._root = self._compiler.get_node(constructor, allow_recursion=True)
+
+    def __call__(self, data: Optional[Dict[str, JSON]] = None) -> TObject:
+        """Construct the object from ``data``.
+
+        Args:
+            data (Optional[Dict[str, JSON]], optional): Data dictionary.
+
+        Returns:
+            The constructed object.
+        """
+        if data is None:
+            data = {}
+        if not isinstance(data, dict):
+            raise TypeError('`data` must be a dict or None')
+        try:
+            hparams = self._root(data, '')
+        except _MissingRequiredFieldException as e:
+            missing_fields = f"{', '.join(e.args)}"
+            raise ValueError(
+                f'The following required fields were not included in the yaml nor the CLI arguments: {missing_fields}'
+            ) from e
+        if _is_hparams_cls(self.constructor):
+            return hparams  # type: ignore
+        constructed_obj = hparams.initialize_object()
+        register_hparams_for_instance(constructed_obj, hparams)
+        return constructed_obj
+
+
+def compile_create(constructor: Callable[..., TObject], *, lazy: bool = False) -> CompiledCreate[TObject]:
+    """Compile ``constructor`` into a specialized function that builds it from a data dictionary.
+
+    The per-field branches of :func:`.create` (primitive, nested, registry, list, and optional fields) are
+    resolved once, ahead of time, into generated Python code for each class in the tree. Classes are compiled
+    lazily, as they are first encountered. The result produces the same objects, and raises the same errors,
+    as ``create(constructor, data=data, cli_args=False, lazy=lazy)``, without any YAML or CLI handling. Fields
+    listed in ``hparams_thunk_fields`` receive a :class:`.Thunk`, as with :func:`.create`.
+
+    This is useful when constructing the same class many times, such as in a hyperparameter search:
+
+    .. testcode::
+
+        import yahp as hp
+
+        class Foo:
+            '''Foo Docstring
+
+            Args:
+                arg (int): Integer variable.
+            '''
+
+            def __init__(self, arg: int):
+                self.arg = arg
+
+        create_foo = hp.compile_create(Foo)
+
+    .. doctest::
+
+        >>> [create_foo({'arg': i}).arg for i in range(3)]
+        [0, 1, 2]
+
+    .. note::
+
+        Compiled constructors capture the fields of each class when the class is first compiled. Registry
+        entries are looked up on every call. If a class or its docstring is modified, compile it again.
+
+    Args:
+        constructor (type | callable): Class or function.
+        lazy (bool, optional): Whether nested objects that are not :class:`.Hparams` are passed to their parent
+            as :class:`.LazyObject` proxies, as for :func:`.create`. (default: ``False``)
+
+    Returns:
+        CompiledCreate: A callable which takes a data dictionary and returns the constructed object.
+    """
+    return CompiledCreate(constructor, lazy=lazy)
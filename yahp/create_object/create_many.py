@@ -0,0 +1,186 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+"""Bulk construction of many objects of the same class, e.g. for hyperparameter sweeps."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import pathlib
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, Optional, TextIO, TypeVar, Union
+
+from yahp.create_object.compiled import CompiledCreate, compile_create
+from yahp.inheritance import iter_yaml_with_inheritance, load_yaml_with_inheritance
+from yahp.utils.iter_helpers import executor_map_bounded
+
+if TYPE_CHECKING:
+    from yahp.types import JSON
+
+__all__ = ['create_many', 'create_iter']
+
+TObject = TypeVar('TObject')
+
+# A data dictionary, a path to a YAML file, or None (equivalent to an empty dictionary)
+_DataOrPath = Union[Dict[str, 'JSON'], str, pathlib.PurePath, None]
+
+# The compiled constructor for the current worker process. Set by ``_init_worker``.
+_worker_create: Optional[CompiledCreate] = None
+
+# With worker processes, the number of chunks per worker that are submitted ahead of the results being consumed
+_PENDING_CHUNKS_PER_WORKER = 2
+
+
+def _load_data(data: _DataOrPath) -> Optional[Dict[str, JSON]]:
+    if isinstance(data, pathlib.PurePath):
+        data = str(data)
+    if isinstance(data, str):
+        return load_yaml_with_inheritance(data, cache='process')
+    return data
+
+
+def _init_worker(constructor: Callable) -> None:
+    global _worker_create
+    _worker_create = compile_create(constructor)
+
+
+def _create_in_worker(data: _DataOrPath) -> object:
+    assert _worker_create is not None, 'the worker was not initialized'
+    return _worker_create(_load_data(data))
+
+
+def create_many(
+    constructor: Callable[..., TObject],
+    datas: Iterable[_DataOrPath],
+    *,
+    num_workers: int = 0,
+    chunksize: int = 1,
+    lazy: bool = False,
+) -> Iterator[TObject]:
+    """Create many instances of a class (or invoke a function many times) with arguments from data or YAML files.
+
+    Each item is constructed as if by ``create(constructor, data=data, cli_args=False, lazy=lazy)`` (for
+    dictionaries) or ``create(constructor, f=f, cli_args=False, lazy=lazy)`` (for YAML file paths). However, the
+    per-class setup -- type introspection, docstring parsing, and registry lookups -- is done only once for the batch,
+    via :func:`.compile_create`. YAML files are loaded with ``cache='process'`` (see
+    :func:`.load_yaml_with_inheritance`), so base files shared by many configs are read only once per process. For
+    example:
+
+    .. testcode::
+
+        import yahp as hp
+
+        class Foo:
+            '''Foo Docstring
+
+            Args:
+                arg (int): Integer variable.
+            '''
+
+            def __init__(self, arg: int):
+                self.arg = arg
+
+    .. doctest::
+
+        >>> [foo.arg for foo in hp.create_many(Foo, [{'arg': 1}, {'arg': 2}])]
+        [1, 2]
+
+    Args:
+        constructor (type | callable): Class or function.
+        datas (Iterable[Dict[str, JSON] | str | pathlib.PurePath | None]): The data dictionaries or YAML
+            file paths, one per object to construct. ``None`` is treated as an empty dictionary.
+        num_workers (int, optional): If positive, construct the objects in a pool of this many worker processes.
+            The ``constructor``, the data, and the constructed objects must be picklable. Objects created
+            in a worker process are not registered for :func:`.serialize` in the calling process, unless
+            they are :class:`.Hparams` instances. (default: ``0``, to construct the objects in this process)
+        chunksize (int, optional): When using worker processes, the number of items sent to a worker at a time.
+            Larger chunks reduce the inter-process overhead for large batches. Only a few chunks per worker are
+            submitted ahead of the results being consumed, so ``datas`` can be large or unbounded.
+            (default: ``1``)
+        lazy (bool, optional): Whether nested objects that are not :class:`.Hparams` are passed to their parent
+            as :class:`.LazyObject` proxies, as for :func:`.create`. Lazy objects cannot be sent between processes,
+            so ``num_workers`` must be ``0``. (default: ``False``)
+
+    Returns:
+        Iterator[TObject]: An iterator over the constructed objects, in the same order as ``datas``.
+            Objects are constructed as the iterator is consumed; wrap it in ``list()`` to construct them all.
+    """
+    if num_workers < 0:
+        raise ValueError(f'num_workers must be non-negative; got {num_workers}')
+    if chunksize < 1:
+        raise ValueError(f'chunksize must be positive; got {chunksize}')
+    if num_workers == 0:
+        return map(compile_create(constructor, lazy=lazy), map(_load_data, datas))  # type: ignore
+    if lazy:
+        raise ValueError('lazy=True is not supported with worker processes; set num_workers=0')
+    return _create_many_in_pool(constructor, datas, num_workers=num_workers, chunksize=chunksize)
+
+
+def _create_many_in_pool(
+    constructor: Callable[..., TObject],
+    datas: Iterable[_DataOrPath],
+    *,
+    num_workers: int,
+    chunksize: int,
+) -> Iterator[TObject]:
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=num_workers,
+            initializer=_init_worker,
+            initargs=(constructor,),
+    ) as executor:
+        yield from executor_map_bounded(
+            executor,
+            _create_in_worker,
+            datas,
+            max_pending=num_workers * _PENDING_CHUNKS_PER_WORKER,
+            chunksize=chunksize,
+        )  # type: ignore
+
+
+def create_iter(
+    constructor: Callable[..., TObject],
+    f: Union[str, TextIO, pathlib.PurePath],
+    *,
+    file_format: Optional[str] = None,
+    lazy: bool = False,
+) -> Iterator[TObject]:
+    """Lazily create an instance of a class (or invoke a function) for each document in a multi-document file.
+
+    The file can be a multi-document YAML file (documents separated by ``---``), a JSON-lines file (one JSON
+    object per line), or a JSON file (a single document). Documents are read, parsed, and constructed one at a time,
+    as the iterator is consumed, so memory usage stays bounded no matter how many documents the file holds. Each
+    document is constructed as if by ``create(constructor, data=document, cli_args=False, lazy=lazy)``, via
+    :func:`.compile_create`, and can use ``inherits`` (see :func:`.iter_yaml_with_inheritance`). For example:
+
+    .. testcode::
+
+        import io
+        import yahp as hp
+
+        class Foo:
+            '''Foo Docstring
+
+            Args:
+                arg (int): Integer variable.
+            '''
+
+            def __init__(self, arg: int):
+                self.arg = arg
+
+    .. doctest::
+
+        >>> manifest = io.StringIO('arg: 1\n---\narg: 2\n')
+        >>> [foo.arg for foo in hp.create_iter(Foo, manifest)]
+        [1, 2]
+
+    Args:
+        constructor (type | callable): Class or function.
+        f (str | TextIO | pathlib.PurePath): A filepath or file-like object.
+        file_format (str, optional): ``'yaml'``, ``'jsonl'``, or ``'json'``. (default: inferred from the file
+            extension by :func:`.get_file_format`, where ``.jsonl`` and ``.ndjson`` are JSON lines, ``.json`` is JSON,
+            and anything else is YAML)
+        lazy (bool, optional): Whether nested objects that are not :class:`.Hparams` are passed to their parent
+            as :class:`.LazyObject` proxies, as for :func:`.create`. (default: ``False``)
+
+    Returns:
+        Iterator[TObject]: An iterator over the constructed objects, in the order of the documents.
+    """
+    return map(compile_create(constructor, lazy=lazy),
+               iter_yaml_with_inheritance(f, file_format=file_format))  # type: ignore
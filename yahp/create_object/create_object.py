@@ -3,26 +3,30 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import json
 import logging
 import os
 import pathlib
 import sys
 import textwrap
 import warnings
-from dataclasses import MISSING, dataclass, fields
-from typing import (TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, TextIO, Tuple, Type, TypeVar, Union,
-                    cast, get_type_hints)
-
-import yaml
+from dataclasses import MISSING, dataclass
+from typing import (TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple, Type,
+                    TypeVar, Union, cast)
 
 from yahp.auto_hparams import ensure_hparams_cls
-from yahp.create_object.argparse import (ArgparseNameRegistry, ParserArgument, get_commented_map_options_from_cli,
-                                         get_hparams_file_from_cli, retrieve_args)
+from yahp.create_object.argparse import (ArgparseNameRegistry, ParserArgument, cli_args_may_match,
+                                         get_commented_map_options_from_cli, get_hparams_file_from_cli,
+                                         is_help_requested, retrieve_args)
 from yahp.hparams import Hparams
-from yahp.inheritance import load_yaml_with_inheritance
+from yahp.inheritance import get_file_format, load_yaml_with_inheritance
+from yahp.lazy import LazyObject, Thunk, is_lazy
 from yahp.serialization import register_hparams_for_instance, register_hparams_registry_key_for_instance
+from yahp.utils import yaml_helpers
+from yahp.utils.field_plan import get_hparams_plan
 from yahp.utils.iter_helpers import ensure_tuple, extract_only_item_from_dict, list_to_deduplicated_dict
-from yahp.utils.type_helpers import HparamsType, get_default_value, is_field_required, is_none_like
+from yahp.utils.type_helpers import is_none_like
 
 if TYPE_CHECKING:
     from yahp.types import JSON, HparamsField
@@ -43,6 +47,7 @@ class _DeferredCreateCall:
     prefix: List[str]
     parser_args: Optional[Sequence[ParserArgument]]
     initialize: bool
+    registry_key: Optional[str] = None
 
 
 def _get_split_key(key: str, splitter: str = '+') -> Tuple[str, Any]:
@@ -55,19 +60,140 @@ def _get_split_key(key: str, splitter: str = '+') -> Tuple[str, Any]:
         return (splits[0], None)
 
 
+def _iter_concrete_list_items(sub_yaml: JSON, full_name: str) -> Iterator[Dict[str, JSON]]:
+    """Yields the data for each item of a list of concrete hparams.
+
+    Handles the deprecated dictionary and phantom key syntaxes. ``None`` items are converted into empty dictionaries.
+    """
+    if isinstance(sub_yaml, dict):
+        # Deprecated syntax, where it is a dict of items. It should be a list of items
+        warnings.warn(DeprecationWarning(f'{full_name} should be a list, not a dictionary'))
+        sub_yaml = list(sub_yaml.values())
+
+    # check for and unpack phantom keys for backward compatability
+    if isinstance(sub_yaml, list):
+        # check all items in list are phantom keys. If old syntax is being used, verify it
+        # is used everywhere so we don't accidentally unpack a valid yaml based on this
+        # heuristic
+        is_list_of_phantom_keys = True
+        unpacked_sub_yaml = []
+        for sub_yaml_item in sub_yaml:
+            # heuristic for phantom keys: single key dict with dict value
+            if isinstance(sub_yaml_item, dict) and len(sub_yaml_item) == 1 and isinstance(
+                    list(sub_yaml_item.values())[0], dict):
+                unpacked_sub_yaml.append(list(sub_yaml_item.values())[0])
+            else:
+                is_list_of_phantom_keys = False
+                break
+        # unpack phantom keys
+        if is_list_of_phantom_keys:
+            key_list = ', '.join(
+                [list(sub_yaml_item.keys())[0] for sub_yaml_item in sub_yaml if isinstance(sub_yaml_item, dict)])
+            warnings.warn(
+                DeprecationWarning(
+                    f'Ignoring the following keys: {key_list}. When specifying an object in a yaml, the object should be directly encoded instead of adding a phantom key. See https://stackoverflow.com/questions/33989612/yaml-equivalent-of-array-of-objects-in-json for an extended explanation.'
+                ))
+            sub_yaml = unpacked_sub_yaml
+
+    if not isinstance(sub_yaml, list):
+        raise TypeError(f'{full_name} must be a list in the yaml')
+
+    for sub_yaml_item in sub_yaml:
+        if sub_yaml_item is None:
+            sub_yaml_item = {}
+        if not isinstance(sub_yaml_item, dict):
+            raise TypeError(f'{full_name} must be a dict in the yaml')
+        yield sub_yaml_item
+
+
+def _get_registry_key_and_data(argparse_or_yaml_value: JSON, yaml_val: JSON,
+                               full_name: str) -> Tuple[str, Dict[str, JSON]]:
+    """Returns the registry key and the data for an abstract, singleton hparams.
+
+    ``argparse_or_yaml_value`` is a str if argparse, or a dict if yaml. ``yaml_val`` is the value for the field
+    in the yaml.
+    """
+    # look up type in the registry
+    # should only have one key in the dict
+    if argparse_or_yaml_value is None:
+        raise ValueError(f'Field {full_name} is required and cannot be None.')
+    if isinstance(argparse_or_yaml_value, str):
+        key = argparse_or_yaml_value
+    else:
+        if not isinstance(argparse_or_yaml_value, dict):
+            raise ValueError(f'Field {full_name} must be a dict with just one key if specified in the yaml')
+        try:
+            key, _ = extract_only_item_from_dict(argparse_or_yaml_value)
+        except ValueError as e:
+            raise ValueError(f'Field {full_name} ' + e.args[0])
+    if yaml_val is None:
+        yaml_val = {}
+    if not isinstance(yaml_val, dict):
+        raise ValueError(f'Field {full_name} must be a dict if specified in the yaml')
+    yaml_val = yaml_val.get(key)
+    if yaml_val is None:
+        yaml_val = {}
+    if not isinstance(yaml_val, dict):
+        raise ValueError(f'Field {full_name}.{key} must be a dict if specified in the yaml')
+    return key, yaml_val
+
+
+def _iter_registry_list_items(argparse_or_yaml_value: JSON, yaml_val: JSON,
+                              full_name: str) -> Iterator[Tuple[str, Dict[str, JSON]]]:
+    """Yields the (possibly deduplicated) registry key and the data for each item of a list of abstract hparams.
+
+    ``argparse_or_yaml_value`` is a List[str] if argparse, or a List[Dict[str, Hparams]] if yaml. ``yaml_val`` is
+    the value for the field in the yaml.
+    """
+    # First get the keys
+    # Argparse has precedence. If there are keys defined in argparse, use only those
+    # These keys will determine what is loaded
+    if argparse_or_yaml_value is None:
+        raise ValueError(f'Field {full_name} is required and cannot be None.')
+    if isinstance(argparse_or_yaml_value, list):
+        # Convert from list of single element dictionaries to dict, preserving duplicates
+        argparse_or_yaml_value = list_to_deduplicated_dict(argparse_or_yaml_value, allow_str=True)
+
+    if not isinstance(argparse_or_yaml_value, dict):
+        raise ValueError(f'Field {full_name} should be a dict')
+
+    keys = list(argparse_or_yaml_value.keys())
+
+    # Now, load the values for these keys
+    if yaml_val is None:
+        yaml_val = {}
+    if isinstance(yaml_val, list):
+        yaml_val = list_to_deduplicated_dict(yaml_val)
+    if not isinstance(yaml_val, dict):
+        raise ValueError(f'Field {full_name} must be a dict if specified in the yaml')
+
+    for key in keys:
+        # Use the order of keys
+        key_yaml = yaml_val.get(key)
+        if key_yaml is None:
+            key_yaml = {}
+        if not isinstance(key_yaml, dict):
+            raise ValueError(
+                textwrap.dedent(f"""Field {full_name}.{key}
+                must be a dict if specified in the yaml"""))
+        yield key, key_yaml
+
+
 logger = logging.getLogger(__name__)
 
 
-def _construct_object_from_deferred_create(
+def _create_hparams_from_deferred_create(
     create_call: _DeferredCreateCall,
     argparse_name_registry,
     parsed_arg_dict,
     argparsers: List[argparse.ArgumentParser],
     cli_args: Optional[List[str]],
     allow_recursion: bool,
-):
-
-    obj_hparams = _create(
+    lazy_argparse: bool,
+    executor: Optional[concurrent.futures.Executor],
+    lazy: bool,
+) -> Hparams:
+    return _create(
         constructor=create_call.constructor,
         data=create_call.data,
         parsed_args=parsed_arg_dict,
@@ -76,16 +202,54 @@ def _construct_object_from_deferred_create(
         argparse_name_registry=argparse_name_registry,
         argparsers=argparsers,
         allow_recursion=allow_recursion,
+        lazy_argparse=lazy_argparse,
+        executor=executor,
+        lazy=lazy,
     )
-    if create_call.initialize:
-        obj = obj_hparams.initialize_object()
-    else:
-        obj = obj_hparams
 
-    if not isinstance(obj, Hparams):
-        register_hparams_for_instance(obj, obj_hparams)
 
-    return obj
+def _initialize_deferred_create(
+    create_call: _DeferredCreateCall,
+    obj_hparams: Hparams,
+    executor: Optional[concurrent.futures.Executor],
+    lazy: bool,
+    thunk: bool,
+) -> Union[object, concurrent.futures.Future]:
+    # Initialize the object for ``create_call``.
+    # If ``thunk``, a :class:`.Thunk` is returned. Otherwise, if ``lazy``, a :class:`.LazyObject` is returned.
+    # Otherwise, if an ``executor`` is given, the object is initialized asynchronously, and a future is returned.
+    if not create_call.initialize:
+        return obj_hparams
+    if thunk:
+        return Thunk(obj_hparams.initialize_object)
+    if lazy:
+        return LazyObject(Thunk(obj_hparams.initialize_object))
+    if executor is None:
+        return obj_hparams.initialize_object()
+    return executor.submit(obj_hparams.initialize_object)
+
+
+def _parse_cli_args(
+    *,
+    parser_args: Sequence[ParserArgument],
+    title: str,
+    description: Optional[str],
+    cli_args: List[str],
+    argparsers: List[argparse.ArgumentParser],
+    lazy_argparse: bool,
+) -> Dict[str, Any]:
+    # Parse the ``parser_args`` from ``cli_args``, removing the parsed arguments from ``cli_args`` in-place
+    if lazy_argparse and not cli_args_may_match(cli_args, [x for arg in parser_args for x in arg.get_option_strings()]):
+        # None of the arguments are on the CLI, so skip building a parser. Unspecified arguments are
+        # omitted from the parsed args, as if they were parsed as MISSING.
+        return {}
+    parser = argparse.ArgumentParser(add_help=False)
+    argparsers.append(parser)
+    group = parser.add_argument_group(title=title, description=description)
+    for arg in parser_args:
+        arg.add_to_argparse(group, add_helptext=not lazy_argparse)
+    parsed_arg_namespace, cli_args[:] = parser.parse_known_args(cli_args)
+    return vars(parsed_arg_namespace)
 
 
 def _create(
@@ -98,6 +262,9 @@ def _create(
     argparse_name_registry: ArgparseNameRegistry,
     argparsers: List[argparse.ArgumentParser],
     allow_recursion: bool,
+    lazy_argparse: bool,
+    executor: Optional[concurrent.futures.Executor],
+    lazy: bool,
 ) -> Hparams:
     """Helper method that returns an instance of an hparams class from ``constructor``.
 
@@ -127,6 +294,13 @@ def _create(
             a subclass of :class:`.Hparams`. If ``false``, and the signautre of ``constructor``
             contains a non-primitive class, then a :exc:`TypeError` will be raised.
             Recursion is always allowed for :class:`.Hparams`.
+        lazy_argparse (bool): If true, only construct an :class:`~argparse.ArgumentParser` for a class
+            if ``cli_args`` may contain one of its arguments. Otherwise, always construct the parsers
+            (with help text), so they can be used for ``--help`` or returned by :func:`get_argparse`.
+        executor (concurrent.futures.Executor, optional): If specified, sibling fields that require
+            initialization are initialized concurrently via this executor.
+        lazy (bool): If true, fields that require initialization are passed to the parent as
+            :class:`.LazyObject` proxies, which are initialized on first use.
 
     Returns:
         *   If ``constructor`` is an :class:`.Hparams` class, then an instance of that hparams class is returned.
@@ -154,13 +328,11 @@ def _create(
     cls = ensure_hparams_cls(constructor)
 
     cls.validate_keys(list(data.keys()), allow_missing_keys=True)
-    field_types = get_type_hints(cls)
-    for f in fields(cls):
-        if not f.init:
-            continue
+    plan = get_hparams_plan(cls)
+    for f in plan.fields:
         prefix_with_fname = list(prefix) + [f.name]
         try:
-            ftype = HparamsType(field_types[f.name])
+            ftype = f.hparams_type
             if not allow_recursion and not (isinstance(constructor, type) and issubclass(constructor, Hparams)):
                 # If recursion is not allowed and it's not a hparams subclass
                 # validate that ftype is primitive, json, enum, or an hparams subclass
@@ -190,11 +362,11 @@ def _create(
 
             if not ftype.is_recursive:
                 if argparse_or_yaml_value == MISSING:
-                    if not is_field_required(f):
+                    if not f.required:
                         # if it's a primitive and there's a default value, use it
                         # do not attempt to auto-convert fields if the default value is not specified by the type annotations,
                         # as it may be a custom class or other sentential. Instead, let the static type checkers complain
-                        default_value = get_default_value(f)
+                        default_value = f.get_default_value()
                         kwargs[f.name] = default_value
                     # if the field is required and not specified, then let the hparams constructor
                     # error
@@ -202,7 +374,7 @@ def _create(
                     kwargs[f.name] = ftype.convert(argparse_or_yaml_value, full_name)
             else:
                 # Dataclass or class constructor
-                if cls.hparams_registry is None or f.name not in cls.hparams_registry:
+                if f.registry is None:
                     # concrete, singleton hparams
                     # list of concrete hparams
                     # potentially none
@@ -233,7 +405,7 @@ def _create(
                                 constructor=ftype.type,
                                 data=sub_yaml,
                                 prefix=prefix_with_fname,
-                                parser_args=retrieve_args(
+                                parser_args=None if cli_args is None else retrieve_args(
                                     constructor=ftype.type,
                                     prefix=prefix_with_fname,
                                     argparse_name_registry=argparse_name_registry,
@@ -250,52 +422,9 @@ def _create(
                         else:
                             # list of concrete hparams
                             # concrete lists not added to argparse, so just load the yaml
-                            sub_yaml = data.get(f.name, [])
-
-                            if isinstance(sub_yaml, dict):
-                                # Deprecated syntax, where it is a dict of items. It should be a list of items
-                                warnings.warn(
-                                    DeprecationWarning(
-                                        f"{'.'.join(prefix_with_fname)} should be a list, not a dictionary"))
-                                sub_yaml = list(sub_yaml.values())
-
-                            # check for and unpack phantom keys for backward compatability
-                            if isinstance(sub_yaml, list):
-                                # check all items in list are phantom keys. If old syntax is being used, verify it
-                                # is used everywhere so we don't accidentally unpack a valid yaml based on this
-                                # heuristic
-                                is_list_of_phantom_keys = True
-                                unpacked_sub_yaml = []
-                                for sub_yaml_item in sub_yaml:
-                                    # heuristic for phantom keys: single key dict with dict value
-                                    if isinstance(sub_yaml_item, dict) and len(sub_yaml_item) == 1 and isinstance(
-                                            list(sub_yaml_item.values())[0], dict):
-                                        unpacked_sub_yaml.append(list(sub_yaml_item.values())[0])
-                                    else:
-                                        is_list_of_phantom_keys = False
-                                        break
-                                # unpack phantom keys
-                                if is_list_of_phantom_keys:
-                                    key_list = ', '.join([
-                                        list(sub_yaml_item.keys())[0]
-                                        for sub_yaml_item in sub_yaml
-                                        if isinstance(sub_yaml_item, dict)
-                                    ])
-                                    warnings.warn(
-                                        DeprecationWarning(
-                                            f'Ignoring the following keys: {key_list}. When specifying an object in a yaml, the object should be directly encoded instead of adding a phantom key. See https://stackoverflow.com/questions/33989612/yaml-equivalent-of-array-of-objects-in-json for an extended explanation.'
-                                        ))
-                                    sub_yaml = unpacked_sub_yaml
-
-                            if not isinstance(sub_yaml, list):
-                                raise TypeError(f'{full_name} must be a list in the yaml')
-
                             deferred_calls: List[_DeferredCreateCall] = []
-                            for i, sub_yaml_item in enumerate(sub_yaml):
-                                if sub_yaml_item is None:
-                                    sub_yaml_item = {}
-                                if not isinstance(sub_yaml_item, dict):
-                                    raise TypeError(f'{full_name} must be a dict in the yaml')
+                            for i, sub_yaml_item in enumerate(_iter_concrete_list_items(
+                                    data.get(f.name, []), full_name)):
                                 assert issubclass(ftype.type, Hparams)
                                 deferred_calls.append(
                                     _DeferredCreateCall(
@@ -319,47 +448,22 @@ def _create(
                             kwargs[f.name] = None
                         else:
                             # abstract, singleton hparams
-                            # look up type in the registry
-                            # should only have one key in the dict
-                            # argparse_or_yaml_value is a str if argparse, or a dict if yaml
                             if argparse_or_yaml_value == MISSING:
                                 # use the hparams default
                                 continue
-                            if argparse_or_yaml_value is None:
-                                raise ValueError(f'Field {full_name} is required and cannot be None.')
-                            if isinstance(argparse_or_yaml_value, str):
-                                key = argparse_or_yaml_value
-                            else:
-                                if not isinstance(argparse_or_yaml_value, dict):
-                                    raise ValueError(
-                                        f'Field {full_name} must be a dict with just one key if specified in the yaml')
-                                try:
-                                    key, _ = extract_only_item_from_dict(argparse_or_yaml_value)
-                                except ValueError as e:
-                                    raise ValueError(f'Field {full_name} ' + e.args[0])
-                            yaml_val = data.get(f.name)
-                            if yaml_val is None:
-                                yaml_val = {}
-                            if not isinstance(yaml_val, dict):
-                                raise ValueError(
-                                    f"Field {'.'.join(prefix_with_fname)} must be a dict if specified in the yaml")
-                            yaml_val = yaml_val.get(key)
-                            if yaml_val is None:
-                                yaml_val = {}
-                            if not isinstance(yaml_val, dict):
-                                raise ValueError(
-                                    f"Field {'.'.join(prefix_with_fname + [key])} must be a dict if specified in the yaml"
-                                )
+                            key, yaml_val = _get_registry_key_and_data(argparse_or_yaml_value, data.get(f.name),
+                                                                       full_name)
                             deferred_create_calls[f.name] = _DeferredCreateCall(
-                                constructor=cls.hparams_registry[f.name][key],
+                                constructor=f.registry[key],
                                 prefix=prefix_with_fname + [key],
                                 data=yaml_val,
-                                parser_args=retrieve_args(
-                                    constructor=cls.hparams_registry[f.name][key],
+                                parser_args=None if cli_args is None else retrieve_args(
+                                    constructor=f.registry[key],
                                     prefix=prefix_with_fname + [key],
                                     argparse_name_registry=argparse_name_registry,
                                 ),
                                 initialize=not (isinstance(ftype.type, type) and issubclass(ftype.type, Hparams)),
+                                registry_key=key,
                             )
                     else:
                         # list of abstract hparams
@@ -374,55 +478,24 @@ def _create(
                                 # use the hparams default
                                 continue
 
-                            # First get the keys
-                            # Argparse has precedence. If there are keys defined in argparse, use only those
-                            # These keys will determine what is loaded
-                            if argparse_or_yaml_value is None:
-                                raise ValueError(f'Field {full_name} is required and cannot be None.')
-                            if isinstance(argparse_or_yaml_value, list):
-                                # Convert from list of single element dictionaries to dict, preserving duplicates
-                                argparse_or_yaml_value = list_to_deduplicated_dict(argparse_or_yaml_value,
-                                                                                   allow_str=True)
-
-                            if not isinstance(argparse_or_yaml_value, dict):
-                                raise ValueError(f'Field {full_name} should be a dict')
-
-                            keys = list(argparse_or_yaml_value.keys())
-
-                            # Now, load the values for these keys
-                            yaml_val = data.get(f.name)
-                            if yaml_val is None:
-                                yaml_val = {}
-                            if isinstance(yaml_val, list):
-                                yaml_val = list_to_deduplicated_dict(yaml_val)
-                            if not isinstance(yaml_val, dict):
-                                raise ValueError(
-                                    f"Field {'.'.join(prefix_with_fname)} must be a dict if specified in the yaml")
-
                             deferred_calls: List[_DeferredCreateCall] = []
 
-                            for key in keys:
-                                # Use the order of keys
-                                key_yaml = yaml_val.get(key)
-                                if key_yaml is None:
-                                    key_yaml = {}
-                                if not isinstance(key_yaml, dict):
-                                    raise ValueError(
-                                        textwrap.dedent(f"""Field {'.'.join(prefix_with_fname + [key])}
-                                        must be a dict if specified in the yaml"""))
+                            for key, key_yaml in _iter_registry_list_items(argparse_or_yaml_value, data.get(f.name),
+                                                                           full_name):
                                 split_key, _ = _get_split_key(key)
                                 deferred_calls.append(
                                     _DeferredCreateCall(
-                                        constructor=cls.hparams_registry[f.name][split_key],
+                                        constructor=f.registry[split_key],
                                         prefix=prefix_with_fname + [key],
                                         data=key_yaml,
-                                        parser_args=retrieve_args(
-                                            constructor=cls.hparams_registry[f.name][split_key],
+                                        parser_args=None if cli_args is None else retrieve_args(
+                                            constructor=f.registry[split_key],
                                             prefix=prefix_with_fname + [key],
                                             argparse_name_registry=argparse_name_registry,
                                         ),
                                         initialize=not (isinstance(ftype.type, type) and
                                                         issubclass(ftype.type, Hparams)),
+                                        registry_key=split_key,
                                     ))
                             deferred_create_calls[f.name] = deferred_calls
         except _MissingRequiredFieldException as e:
@@ -431,37 +504,31 @@ def _create(
 
     allow_recursion = isinstance(constructor, type) and issubclass(constructor, Hparams)
 
+    # Constructors can opt in to receiving thunks, rather than initialized objects, for some fields
+    thunk_fields = getattr(constructor, 'hparams_thunk_fields', ())
+
+    # (create call, hparams, initialized object or future), in the order of ``deferred_create_calls``
+    initialized_objs: List[Tuple[_DeferredCreateCall, Hparams, Union[object, concurrent.futures.Future]]] = []
     if cli_args is None:
         for fname, create_calls in deferred_create_calls.items():
-            registry = None
-            if cls.hparams_registry is not None and fname in cls.hparams_registry:
-                registry = cls.hparams_registry[fname]
-                inverted_registry = {v: k for (k, v) in registry.items()}
-            else:
-                inverted_registry = {}
-            sub_hparams = []
             for create_call in ensure_tuple(create_calls):
-                obj = _construct_object_from_deferred_create(
+                obj_hparams = _create_hparams_from_deferred_create(
                     create_call=create_call,
                     argparse_name_registry=argparse_name_registry,
                     parsed_arg_dict={},
                     argparsers=argparsers,
                     cli_args=cli_args,
                     allow_recursion=allow_recursion,
+                    lazy_argparse=lazy_argparse,
+                    executor=executor,
+                    lazy=lazy,
                 )
-
-                sub_hparams.append(obj)
-                if registry is not None:
-                    register_hparams_registry_key_for_instance(
-                        obj,
-                        registry,
-                        inverted_registry[create_call.constructor],
-                    )
-
-            if isinstance(create_calls, list):
-                kwargs[fname] = sub_hparams
-            else:
-                kwargs[fname] = sub_hparams[0]
+                initialized_objs.append((create_call, obj_hparams,
+                                         _initialize_deferred_create(create_call,
+                                                                     obj_hparams,
+                                                                     executor,
+                                                                     lazy,
+                                                                     thunk=fname in thunk_fields)))
     else:
         all_args: List[ParserArgument] = []
         for fname, create_calls in deferred_create_calls.items():
@@ -471,49 +538,61 @@ def _create(
         argparse_name_registry.assign_shortnames()
         for fname, create_calls in deferred_create_calls.items():
             # TODO parse args from
-            registry = None
-            if cls.hparams_registry is not None and fname in cls.hparams_registry:
-                registry = cls.hparams_registry[fname]
-                inverted_registry = {v: k for (k, v) in registry.items()}
-            else:
-                inverted_registry = {}
-            sub_hparams: List[Hparams] = []
             for create_call in ensure_tuple(create_calls):
                 if create_call.parser_args is None:
                     parsed_arg_dict = {}
                 else:
-                    parser = argparse.ArgumentParser(add_help=False)
-                    argparsers.append(parser)
-                    group = parser.add_argument_group(title='.'.join(create_call.prefix),
-                                                      description=create_call.constructor.__name__)
-                    for args in create_call.parser_args:
-                        for arg in ensure_tuple(args):
-                            arg.add_to_argparse(group)
-                    parsed_arg_namespace, cli_args[:] = parser.parse_known_args(cli_args)
-                    parsed_arg_dict = vars(parsed_arg_namespace)
-                obj = _construct_object_from_deferred_create(
+                    parsed_arg_dict = _parse_cli_args(
+                        parser_args=create_call.parser_args,
+                        title='.'.join(create_call.prefix),
+                        description=create_call.constructor.__name__,
+                        cli_args=cli_args,
+                        argparsers=argparsers,
+                        lazy_argparse=lazy_argparse,
+                    )
+                obj_hparams = _create_hparams_from_deferred_create(
                     create_call=create_call,
                     argparse_name_registry=argparse_name_registry,
                     parsed_arg_dict=parsed_arg_dict,
                     argparsers=argparsers,
                     cli_args=cli_args,
                     allow_recursion=allow_recursion,
+                    lazy_argparse=lazy_argparse,
+                    executor=executor,
+                    lazy=lazy,
                 )
-                sub_hparams.append(obj)
-                if registry is not None:
-                    register_hparams_registry_key_for_instance(sub_hparams[-1], registry,
-                                                               inverted_registry[create_call.constructor])
-            if isinstance(create_calls, list):
-                kwargs[fname] = sub_hparams
-            else:
-                kwargs[fname] = sub_hparams[0]
+                initialized_objs.append((create_call, obj_hparams,
+                                         _initialize_deferred_create(create_call,
+                                                                     obj_hparams,
+                                                                     executor,
+                                                                     lazy,
+                                                                     thunk=fname in thunk_fields)))
+
+    # Gather the initialized objects. If an executor was used, then siblings were initialized concurrently,
+    # but the results are collected in order.
+    initialized_objs_iter = iter(initialized_objs)
+    for fname, create_calls in deferred_create_calls.items():
+        registry = plan.by_name[fname].registry
+        sub_hparams = []
+        for create_call in ensure_tuple(create_calls):
+            _, obj_hparams, obj = next(initialized_objs_iter)
+            if not is_lazy(obj) and isinstance(obj, concurrent.futures.Future):
+                obj = obj.result()
+            if is_lazy(obj) or not isinstance(obj, Hparams):
+                register_hparams_for_instance(obj, obj_hparams)
+            sub_hparams.append(obj)
+            if registry is not None:
+                assert create_call.registry_key is not None
+                register_hparams_registry_key_for_instance(obj, registry, create_call.registry_key)
+        if isinstance(create_calls, list):
+            kwargs[fname] = sub_hparams
+        else:
+            kwargs[fname] = sub_hparams[0]
 
-    for f in fields(cls):
-        if not f.init:
-            continue
+    for f in plan.fields:
         prefix_with_fname = '.'.join(list(prefix) + [f.name])
         if f.name not in kwargs:
-            if f.default == MISSING and f.default_factory == MISSING:
+            if f.field.default == MISSING and f.field.default_factory == MISSING:
                 missing_required_fields.append(prefix_with_fname)
     if len(missing_required_fields) > 0:
         # if there are any missing fields from this class, or optional but partially-filled-in subclasses,
@@ -530,6 +609,9 @@ def _add_help(argparsers: Sequence[argparse.ArgumentParser], cli_args: Sequence[
         argparsers (Sequence[argparse.ArgumentParser]): List of :class:`~argparse.ArgumentParser`s
             to extend.
     """
+    if len(argparsers) == 0 or not is_help_requested(cli_args):
+        # Only build the help parser if it will be used
+        return
     help_argparser = argparse.ArgumentParser(parents=argparsers)
     help_argparser.parse_known_args(args=cli_args)  # Will print help and exit if the "--help" flag is present
 
@@ -547,6 +629,8 @@ def create(
     data: Optional[Dict[str, JSON]] = None,
     f: Union[str, TextIO, pathlib.PurePath, None] = None,
     cli_args: Union[List[str], bool] = True,
+    executor: Optional[concurrent.futures.Executor] = None,
+    lazy: bool = False,
 ) -> TObject:
     """Create a class or invoke a function with arguments coming from a dictionary, YAML string or file, or the CLI.
 
@@ -616,17 +700,70 @@ def create(
             True (the default) to load CLI arguments from ``sys.argv``,
             or False to not use any CLI arguments.
 
+            If there are no CLI arguments, then no :class:`~argparse.ArgumentParser` is constructed, and the
+            ``constructor`` is built directly from ``data`` or ``f``.
+        executor (concurrent.futures.Executor, optional): If specified, sibling fields that are not
+            :class:`.Hparams` (e.g. a dataset and a model) are initialized concurrently via this executor,
+            such as a :class:`~concurrent.futures.ThreadPoolExecutor`. Each object is still initialized
+            after its own fields, and the results are assigned in a deterministic order. If None (the default),
+            objects are initialized one at a time.
+        lazy (bool, optional): If True, nested objects that are not :class:`.Hparams` are passed to their parent
+            as :class:`.LazyObject` proxies, and are only initialized when first used. The returned object itself
+            is always initialized. (default: ``False``)
+
+            Independently of ``lazy``, a constructor can opt in to receiving a :class:`.Thunk` -- a callable that
+            initializes the object on the first call -- for some parameters, by listing them in an
+            ``hparams_thunk_fields`` attribute. For example:
+
+            .. testcode::
+
+                class Callback:
+                    '''Callback Docstring
+
+                    Args:
+                        name (str): Name
+                    '''
+
+                    def __init__(self, name: str):
+                        self.name = name
+
+                class Trainer:
+                    '''Trainer Docstring
+
+                    Args:
+                        eval_callback (Callback): Only used for evaluation.
+                    '''
+
+                    hparams_thunk_fields = ('eval_callback',)
+
+                    def __init__(self, eval_callback: Callback):
+                        self.get_eval_callback = eval_callback
+
+            .. doctest::
+
+                >>> trainer = hp.create(Trainer, data={'eval_callback': {'name': 'eval'}}, cli_args=False)
+                >>> trainer.get_eval_callback().name
+                'eval'
+
     Returns:
         The constructed object.
     """
     argparsers: List[argparse.ArgumentParser] = []
     remaining_cli_args = _get_remaining_cli_args(cli_args)
     try:
-        hparams, output_f = _get_hparams(constructor=constructor,
-                                         data=data,
-                                         f=f,
-                                         remaining_cli_args=remaining_cli_args,
-                                         argparsers=argparsers)
+        if len(remaining_cli_args) == 0:
+            hparams = _get_hparams_from_data(constructor=constructor, data=data, f=f, executor=executor, lazy=lazy)
+            output_f = None
+        else:
+            # Parsers (and help text) are only needed for every class if help will be printed
+            hparams, output_f = _get_hparams(constructor=constructor,
+                                             data=data,
+                                             f=f,
+                                             remaining_cli_args=remaining_cli_args,
+                                             argparsers=argparsers,
+                                             lazy_argparse=not is_help_requested(remaining_cli_args),
+                                             executor=executor,
+                                             lazy=lazy)
     except _MissingRequiredFieldException as e:
         _add_help(argparsers, remaining_cli_args)
         missing_fields = f"{', '.join(e.args)}"
@@ -647,7 +784,10 @@ def create(
             print(hparams.to_yaml(), file=sys.stderr)
         else:
             with open(output_f, 'x') as f:
-                f.write(hparams.to_yaml())
+                if get_file_format(output_f) == 'json':
+                    f.write(hparams.to_json(indent=2))
+                else:
+                    f.write(hparams.to_yaml())
         sys.exit(0)
 
     if isinstance(constructor, type) and issubclass(constructor, Hparams):
@@ -658,12 +798,63 @@ def create(
         return constructed_obj
 
 
+def _load_data(
+    data: Optional[Dict[str, JSON]],
+    f: Union[str, TextIO, pathlib.PurePath, None],
+    cli_f: Optional[str],
+) -> Dict[str, JSON]:
+    if f is not None:
+        if data is not None:
+            raise ValueError(
+                textwrap.dedent(f"""Since a hparams file was specified via
+                {'function arguments' if cli_f is None else 'the CLI'}, `data` must be None."""))
+        if isinstance(f, pathlib.PurePath):
+            f = str(f)
+        if isinstance(f, str):
+            data = load_yaml_with_inheritance(f)
+        elif get_file_format(f) == 'json':
+            data = json.load(f)
+        else:
+            data = yaml_helpers.full_load(f)
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        raise TypeError('`data` must be a dict or None')
+    return data
+
+
+def _get_hparams_from_data(
+    constructor: Union[Type[TObject], Callable[..., TObject]],
+    data: Optional[Dict[str, JSON]],
+    f: Union[str, TextIO, pathlib.PurePath, None],
+    executor: Optional[concurrent.futures.Executor],
+    lazy: bool,
+) -> Hparams:
+    # When no CLI args are in play, skip all argparse machinery and go straight from the data to the hparams
+    return _create(
+        constructor=constructor,
+        data=_load_data(data=data, f=f, cli_f=None),
+        cli_args=None,
+        prefix=[],
+        parsed_args={},
+        argparse_name_registry=ArgparseNameRegistry(),
+        argparsers=[],
+        allow_recursion=True,
+        lazy_argparse=True,
+        executor=executor,
+        lazy=lazy,
+    )
+
+
 def _get_hparams(
     constructor: Union[Type[TObject], Callable[..., TObject]],
     data: Optional[Dict[str, JSON]],
     f: Union[str, TextIO, pathlib.PurePath, None],
     remaining_cli_args: List[str],
     argparsers: List[argparse.ArgumentParser],
+    lazy_argparse: bool,
+    executor: Optional[concurrent.futures.Executor],
+    lazy: bool,
 ) -> Tuple[Hparams, Optional[str]]:
     argparse_name_registry = ArgparseNameRegistry()
 
@@ -671,6 +862,7 @@ def _get_hparams(
         cli_args=remaining_cli_args,
         argparse_name_registry=argparse_name_registry,
         argument_parsers=argparsers,
+        lazy=lazy_argparse,
     )
     if cm_options is not None:
         output_file, interactive, add_docs = cm_options
@@ -689,7 +881,8 @@ def _get_hparams(
 
     cli_f, output_f, validate = get_hparams_file_from_cli(cli_args=remaining_cli_args,
                                                           argparse_name_registry=argparse_name_registry,
-                                                          argument_parsers=argparsers)
+                                                          argument_parsers=argparsers,
+                                                          lazy=lazy_argparse)
 
     if cli_f is not None:
         if f is not None:
@@ -705,31 +898,18 @@ def _get_hparams(
         print('\nSuccessfully validated YAML!')
         sys.exit(0)
 
-    if f is not None:
-        if data is not None:
-            raise ValueError(
-                textwrap.dedent(f"""Since a hparams file was specified via
-                {'function arguments' if cli_f is None else 'the CLI'}, `data` must be None."""))
-        if isinstance(f, pathlib.PurePath):
-            f = str(f)
-        if isinstance(f, str):
-            data = load_yaml_with_inheritance(f)
-        else:
-            data = yaml.full_load(f)
-    if data is None:
-        data = {}
-    if not isinstance(data, dict):
-        raise TypeError('`data` must be a dict or None')
+    data = _load_data(data=data, f=f, cli_f=cli_f)
 
     # Parse args based on class definition
     main_args = retrieve_args(constructor=constructor, prefix=[], argparse_name_registry=argparse_name_registry)
-    parser = argparse.ArgumentParser(add_help=False)
-    argparsers.append(parser)
-    group = parser.add_argument_group(title=constructor.__name__)
-    for arg in main_args:
-        arg.add_to_argparse(group)
-    parsed_arg_namespace, remaining_cli_args[:] = parser.parse_known_args(remaining_cli_args)
-    parsed_arg_dict = vars(parsed_arg_namespace)
+    parsed_arg_dict = _parse_cli_args(
+        parser_args=main_args,
+        title=constructor.__name__,
+        description=None,
+        cli_args=remaining_cli_args,
+        argparsers=argparsers,
+        lazy_argparse=lazy_argparse,
+    )
 
     hparams = _create(
         constructor=constructor,
@@ -740,6 +920,9 @@ def _get_hparams(
         argparse_name_registry=argparse_name_registry,
         argparsers=argparsers,
         allow_recursion=True,
+        lazy_argparse=lazy_argparse,
+        executor=executor,
+        lazy=lazy,
     )
     return hparams, output_f
 
@@ -831,6 +1014,9 @@ def get_argparse(
             f=f,
             remaining_cli_args=remaining_cli_args,
             argparsers=argparsers,
+            lazy_argparse=False,
+            executor=None,
+            lazy=False,
         )
     except _MissingRequiredFieldException:
         pass
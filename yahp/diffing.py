@@ -0,0 +1,280 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+"""Structural diffs between :class:`.Hparams` trees, e.g. for comparing the configs of a sweep against a baseline."""
+
+from __future__ import annotations
+
+import json
+import marshal
+import weakref
+from dataclasses import fields
+from typing import TYPE_CHECKING, Any, Dict, List, MutableMapping, NamedTuple, Optional, Tuple, Type
+
+from yahp.hparams import Hparams, get_registry_version
+from yahp.lazy import LazyObject
+from yahp.serialization import (get_hparams_for_instance, get_key_for_instance_and_registry, is_primitive, serialize,
+                                serialize_field_value)
+from yahp.utils.iter_helpers import list_to_deduplicated_dict
+from yahp.utils.registry_index import RegistryIndex, get_registry_index
+
+if TYPE_CHECKING:
+    from yahp.types import JSON
+
+__all__ = ['diff']
+
+
+class _Item(NamedTuple):
+    """A value in a field, with its registry key (if any), which is either a nested hparams or serialized data."""
+    key: Optional[str]
+    hparams: Optional[Hparams]
+    data: JSON
+
+
+class _Entry(NamedTuple):
+    """The value of a field that is in the registry or contains hparams: a single :class:`_Item`, or a list of them."""
+    items: Tuple[_Item, ...]
+    is_list: bool
+    is_registry: bool
+
+
+# Maps each hparams class to the registry version, the registry, and the ``(field name, registry index)`` pairs
+_class_fields_cache: MutableMapping[type, Tuple[int, Any, Tuple[Tuple[str, Optional[RegistryIndex]], ...]]]
+_class_fields_cache = weakref.WeakKeyDictionary()
+
+# Reused, as ``json.dumps`` constructs a new encoder for every call with non-default arguments
+_canonical_encoder = json.JSONEncoder(sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def _canonical_json(data: Any) -> str:
+    return _canonical_encoder.encode(data)
+
+
+def _get_item_hparams(x: object) -> Optional[Hparams]:
+    # Returns the hparams whose node represents ``x``, or None if ``x`` must be serialized
+    if type(x) is LazyObject or not isinstance(x, Hparams):
+        hparams = get_hparams_for_instance(x)
+    else:
+        hparams = x
+    if hparams is not None and type(hparams).to_dict is not Hparams.to_dict:
+        # The node would not match the custom serialization
+        return None
+    return hparams
+
+
+def _get_item(x: object, registry_index: Optional[RegistryIndex]) -> _Item:
+    key = None
+    if registry_index is not None:
+        key = get_key_for_instance_and_registry(x, registry_index.registry)
+        if key is None:
+            key = registry_index.get_key(type(x))
+    hparams = _get_item_hparams(x)
+    if hparams is not None:
+        return _Item(key, hparams, None)
+    return _Item(key, None, serialize(x) if registry_index is not None else serialize_field_value(x))
+
+
+def _get_entry_or_data(value: object, registry_index: Optional[RegistryIndex]) -> Any:
+    if type(value) is not LazyObject and isinstance(value, list):
+        if registry_index is None and all([is_primitive(x) for x in value]):
+            # Serialized as-is, so it is compared as data
+            return value
+        items = tuple([_get_item(x, registry_index) for x in value])
+        if registry_index is None and all([item.hparams is None for item in items]):
+            return [item.data for item in items]
+        return _Entry(items, True, registry_index is not None)
+    item = _get_item(value, registry_index)
+    if registry_index is None and item.hparams is None:
+        return item.data
+    return _Entry((item,), False, registry_index is not None)
+
+
+def _get_class_fields(cls: Type[Hparams]) -> Tuple[Tuple[str, Optional[RegistryIndex]], ...]:
+    # Resolved once per class, and again if the registry is modified, as in ``get_to_dict_serializer``
+    version = get_registry_version()
+    cached = _class_fields_cache.get(cls)
+    if cached is None or cached[0] != version or cached[1] is not cls.hparams_registry:
+        registry = cls.hparams_registry
+        class_fields = tuple(
+            (f.name, get_registry_index(cls, f.name) if registry is not None and f.name in registry else None)
+            for f in fields(cls)
+            if f.init)
+        cached = (version, registry, class_fields)
+        _class_fields_cache[cls] = cached
+    return cached[2]
+
+
+def _join(path: str, name: str) -> str:
+    return f'{path}.{name}' if path else name
+
+
+def _item_data(item: _Item) -> JSON:
+    return item.data if item.hparams is None else item.hparams.to_dict()
+
+
+def _value_data(value: Any) -> JSON:
+    # The serialized form of the field, as in ``Hparams.to_dict``
+    if type(value) is not _Entry:
+        return value
+    datas = [_item_data(item) if item.key is None else {item.key: _item_data(item)} for item in value.items]
+    if not value.is_list:
+        return datas[0]
+    if value.is_registry:
+        return list_to_deduplicated_dict(datas)
+    return datas
+
+
+def _get_item_names(entry: _Entry) -> Optional[List[str]]:
+    # The path components for the items of a list, or None if they cannot be determined
+    if not entry.is_registry:
+        return [str(i) for i in range(len(entry.items))]
+    counts: Dict[str, int] = {}
+    names = []
+    for item in entry.items:
+        if item.key is None:
+            return None
+        count = counts.get(item.key, 0)
+        counts[item.key] = count + 1
+        names.append(item.key if count == 0 else f'{item.key}+{count}')
+    return names
+
+
+def _is_same_data(x: JSON, y: JSON) -> bool:
+    # Whether ``x`` and ``y`` have the same canonical JSON, as hashed by ``Hparams.fingerprint``. So ``1`` and ``1.0``
+    # differ, but NaN is the same as NaN. The common cases are compared without encoding.
+    if x is y:
+        return True
+    x_type = type(x)
+    if x_type is type(y):
+        if x_type is str or x_type is int or x_type is bool:
+            return x == y
+        if x_type is float:
+            if x == y:
+                # ``0.0`` and ``-0.0`` are equal, but are encoded differently
+                return x != 0.0 or repr(x) == repr(y)
+            return x != x and y != y
+        if x_type is list or x_type is dict:
+            try:
+                # Equal bytes mean equal values of the same types, which have the same JSON. Unlike later versions,
+                # version 2 does not depend on string interning or reference counts.
+                if marshal.dumps(x, 2) == marshal.dumps(y, 2):
+                    return True
+            except ValueError:
+                # The data contains objects that cannot be marshalled
+                pass
+        if x_type is list:
+            return len(x) == len(y) and all([_is_same_data(u, v) for u, v in zip(x, y)])
+        if x_type is dict and x.keys() == y.keys() and all([type(k) is str for k in x]):
+            return all([_is_same_data(v, y[k]) for k, v in x.items()])
+    try:
+        return _canonical_json(x) == _canonical_json(y)
+    except (TypeError, ValueError):
+        # E.g. the keys of a dict cannot be sorted
+        return False
+
+
+def _diff_data(x: JSON, y: JSON, path: str, out: List[str]) -> None:
+    if _is_same_data(x, y):
+        return
+    if isinstance(x, dict) and isinstance(y, dict):
+        for k, v in x.items():
+            if k in y:
+                _diff_data(v, y[k], _join(path, str(k)), out)
+            else:
+                out.append(_join(path, str(k)))
+        out.extend(_join(path, str(k)) for k in y if k not in x)
+    elif isinstance(x, list) and isinstance(y, list) and len(x) == len(y):
+        for i, (u, v) in enumerate(zip(x, y)):
+            _diff_data(u, v, _join(path, str(i)), out)
+    else:
+        out.append(path)
+
+
+def _diff_items(x: _Item, y: _Item, path: str, out: List[str]) -> None:
+    if x.hparams is not None and y.hparams is not None:
+        _diff_hparams(x.hparams, y.hparams, path, out)
+    else:
+        _diff_data(_item_data(x), _item_data(y), path, out)
+
+
+def _diff_entries(x: _Entry, y: _Entry, path: str, out: List[str]) -> None:
+    keys = [item.key for item in x.items]
+    if x.is_list == y.is_list and keys == [item.key for item in y.items]:
+        if not x.is_list:
+            key = keys[0]
+            _diff_items(x.items[0], y.items[0], path if key is None else _join(path, key), out)
+            return
+        names = _get_item_names(x)
+        if names is not None:
+            for name, x_item, y_item in zip(names, x.items, y.items):
+                _diff_items(x_item, y_item, _join(path, name), out)
+            return
+    _diff_data(_value_data(x), _value_data(y), path, out)
+
+
+def _diff_hparams(a: Hparams, b: Hparams, path: str, out: List[str]) -> None:
+    if a is b:
+        return
+    cls = type(a)
+    if cls is not type(b) or cls.to_dict is not Hparams.to_dict:
+        _diff_data(a.to_dict(), b.to_dict(), path, out)
+        return
+    for name, registry_index in _get_class_fields(cls):
+        x, y = getattr(a, name), getattr(b, name)
+        if x is y:
+            continue
+        if registry_index is None and is_primitive(x) and is_primitive(y):
+            if not _is_same_data(x, y):
+                _diff_data(x, y, _join(path, name), out)
+            continue
+        x_value, y_value = _get_entry_or_data(x, registry_index), _get_entry_or_data(y, registry_index)
+        if type(x_value) is _Entry and type(y_value) is _Entry:
+            _diff_entries(x_value, y_value, _join(path, name), out)
+        elif type(x_value) is _Entry or type(y_value) is _Entry or not _is_same_data(x_value, y_value):
+            _diff_data(_value_data(x_value), _value_data(y_value), _join(path, name), out)
+
+
+def diff(a: Hparams, b: Hparams) -> List[str]:
+    """Returns the dotted paths at which the serialized forms (see :meth:`.Hparams.to_dict`) of ``a`` and ``b`` differ.
+
+    Paths follow the structure of :meth:`.Hparams.to_dict`, so they include the registry keys of nested hparams
+    (e.g. ``'optimizer.sgd.lr'``), and the index of items in lists of concrete hparams (e.g. ``'callbacks.0.name'``).
+    A path that is present in only one of ``a`` and ``b`` is included. For example:
+
+    .. testcode::
+
+        from dataclasses import dataclass
+
+        import yahp as hp
+
+        @dataclass
+        class OptimizerHparams(hp.Hparams):
+            lr: float = hp.optional('Learning rate', default=0.1)
+            momentum: float = hp.optional('Momentum', default=0.9)
+
+        @dataclass
+        class TrainerHparams(hp.Hparams):
+            optimizer: OptimizerHparams = hp.optional('Optimizer', default_factory=OptimizerHparams)
+            epochs: int = hp.optional('Epochs', default=10)
+
+    .. doctest::
+
+        >>> baseline = TrainerHparams()
+        >>> trial = TrainerHparams(optimizer=OptimizerHparams(lr=0.01))
+        >>> hp.diff(baseline, trial)
+        ['optimizer.lr']
+
+    ``a`` and ``b`` are walked together, comparing the values of their fields directly, so nested hparams are not
+    serialized unless they differ. Values are compared by their canonical JSON, as hashed by
+    :meth:`.Hparams.fingerprint`, so e.g. ``1`` and ``1.0`` differ, and the diff is empty exactly when the canonical
+    JSON of ``a.to_dict()`` and ``b.to_dict()`` is the same. Nothing is cached between calls, so modified instances
+    can be diffed again.
+
+    Args:
+        a (Hparams): The first hparams.
+        b (Hparams): The second hparams.
+
+    Returns:
+        List[str]: The paths that differ, in the order of the fields. Empty if ``a`` and ``b`` are equivalent.
+    """
+    out: List[str] = []
+    _diff_hparams(a, b, '', out)
+    return out
@@ -5,14 +5,15 @@ from __future__ import annotations
 import inspect
 import logging
 import warnings
+import weakref
 from dataclasses import _MISSING_TYPE, MISSING, field
-from typing import Any, Callable, Optional, TypeVar, Union, overload
+from typing import Any, Callable, Dict, MutableMapping, Optional, Tuple, TypeVar, Union, overload
 
 import docstring_parser
 
 logger = logging.getLogger(__name__)
 
-__all__ = ['required', 'optional', 'auto']
+__all__ = ['required', 'optional', 'auto', 'auto_fields']
 
 TObject = TypeVar('TObject')
 
@@ -84,25 +85,84 @@ def optional(doc: str, *, default: Any = MISSING, default_factory: Union[_MISSIN
     )
 
 
-def _extract_doc_from_docstring(docstring: str, arg_name: str):
-    # Extract the documentation from the docstring
+# Maps a constructor to its docstring and the parsed ``{arg_name: description}`` params (or the parse error
+# message) for that docstring. Entries are re-parsed if the docstring changes, and are dropped once the
+# constructor is garbage collected.
+_DocstringParams = Union[Dict[str, Optional[str]], str]
+_docstring_params_cache: MutableMapping[Callable, Tuple[str, _DocstringParams]] = weakref.WeakKeyDictionary()
 
-    parsed_docstring = docstring_parser.parse(docstring)
-    docstring_params = parsed_docstring.params
-    doc = None
-    for param in docstring_params:
-        if param.arg_name == arg_name:
-            doc = param.description
-    if doc is None:
-        raise ValueError(f'Argument {arg_name} is not in the docstring')
+
+def _get_docstring(constructor: Callable) -> Optional[str]:
+    docstring = constructor.__doc__
+    if type(constructor) == type and constructor.__init__.__doc__ is not None:
+        # If `constructor` is a class, then the docstring may be under `__init__`
+        docstring = constructor.__init__.__doc__
+    return docstring
+
+
+def _parse_docstring_params(docstring: str) -> _DocstringParams:
+    try:
+        parsed_docstring = docstring_parser.parse(docstring)
+    except docstring_parser.ParseError as e:
+        return str(e)
+    # If an argument is documented more than once, the last entry wins
+    return {param.arg_name: param.description for param in parsed_docstring.params}
+
+
+def _get_docstring_params(constructor: Callable, docstring: str) -> Dict[str, Optional[str]]:
+    # Parse the docstring once per constructor, rather than once per argument
+    try:
+        cached = _docstring_params_cache.get(constructor)
+    except TypeError:
+        # Constructor is not hashable or cannot be weakly referenced
+        params = _parse_docstring_params(docstring)
+    else:
+        if cached is not None and cached[0] is docstring:
+            params = cached[1]
+        else:
+            params = _parse_docstring_params(docstring)
+            _docstring_params_cache[constructor] = (docstring, params)
+    if isinstance(params, str):
+        raise docstring_parser.ParseError(params)
+    return params
+
+
+def _extract_doc(constructor: Callable, arg_name: str, ignore_docstring_errors: bool) -> str:
+    docstring = _get_docstring(constructor)
+    if docstring is None:
+        msg = f'{constructor.__name__} has no docstring. Argument {arg_name} will be undocumented.'
+        if ignore_docstring_errors:
+            warnings.warn(msg)
+        else:
+            raise ValueError(msg)
+        return arg_name
+    try:
+        doc = _get_docstring_params(constructor, docstring).get(arg_name)
+        if doc is None:
+            raise ValueError(f'Argument {arg_name} is not in the docstring')
+    except (docstring_parser.ParseError, ValueError) as e:
+        msg = (f'Unable to extract docstring for argument {arg_name} from {constructor.__name__}. '
+               f'Argument {arg_name} will be undocumented.')
+        if ignore_docstring_errors:
+            warnings.warn(f'{msg}: {e}')
+            return arg_name
+        raise ValueError(msg) from e
     return doc
 
 
+def _make_auto_field(parameter: inspect.Parameter, doc: str):
+    if parameter.default == inspect.Parameter.empty:
+        return required(doc)
+    else:
+        return optional(doc, default=parameter.default)
+
+
 def auto(constructor: Callable, arg_name: str, doc: Optional[str] = None, ignore_docstring_errors: bool = False):
     """A field automatically inferred from the docstring and signature.
 
     This helper will automatically parse the docstring and signature of a class or function to determine
-    the documentation entry and default value for a field.
+    the documentation entry and default value for a field. The docstring is parsed once per ``constructor``,
+    so calling :func:`auto` for each argument of the same ``constructor`` is inexpensive.
 
     For example:
 
@@ -146,32 +206,47 @@ def auto(constructor: Callable, arg_name: str, doc: Optional[str] = None, ignore
         raise ValueError(f'Constructor {constructor} does not have an argument named {arg_name}')
 
     if doc is None:
-        docstring = constructor.__doc__
-        if type(constructor) == type and constructor.__init__.__doc__ is not None:
-            # If `constructor` is a class, then the docstring may be under `__init__`
-            docstring = constructor.__init__.__doc__
-
-        if docstring is None:
-            msg = f'{constructor.__name__} has no docstring. Argument {arg_name} will be undocumented.'
-            if ignore_docstring_errors:
-                warnings.warn(msg)
-            else:
-                raise ValueError(msg)
-            doc = arg_name
-        else:
-            try:
-                doc = _extract_doc_from_docstring(docstring=docstring, arg_name=arg_name)
-            except (docstring_parser.ParseError, ValueError) as e:
-                msg = (f'Unable to extract docstring for argument {arg_name} from {constructor.__name__}. '
-                       f'Argument {arg_name} will be undocumented.')
-                if ignore_docstring_errors:
-                    warnings.warn(f'{msg}: {e}')
-                    doc = arg_name
-                else:
-                    raise ValueError(msg) from e
-
-    assert doc is not None, 'doc was set above'
-    if parameter.default == inspect.Parameter.empty:
-        return required(doc)
-    else:
-        return optional(doc, default=parameter.default)
+        doc = _extract_doc(constructor, arg_name, ignore_docstring_errors)
+
+    return _make_auto_field(parameter, doc)
+
+
+def auto_fields(constructor: Callable, ignore_docstring_errors: bool = False) -> Dict[str, Any]:
+    """Fields for every argument of a class or function, inferred from the docstring and signature.
+
+    This is equivalent to calling :func:`auto` for each argument in the signature of ``constructor``,
+    but the signature is inspected only once.
+
+    For example:
+
+    .. testcode::
+
+        import yahp as hp
+
+        class Foo:
+            '''Foo.
+
+            Args:
+                bar (str): Required parameter.
+                baz (int, optional): Optional parameter.
+            '''
+
+            def __init__(self, bar: str, baz: int = 42):
+                self.bar = bar
+                self.baz = baz
+
+        fields = hp.auto_fields(Foo)  # Equivalent to {'bar': hp.auto(Foo, 'bar'), 'baz': hp.auto(Foo, 'baz')}
+
+    Args:
+        constructor (Callable): The class or function.
+        ignore_docstring_errors (bool, optional): If False, ignore any errors from parsing the docstring.
+            Useful if the ``constructor`` is in a third-party library.
+
+    Returns:
+        Dict[str, Any]: A yahp field for each argument, keyed by argument name, in signature order.
+    """
+    sig = inspect.signature(constructor)
+    return {
+        arg_name: _make_auto_field(parameter, _extract_doc(constructor, arg_name, ignore_docstring_errors))
+        for arg_name, parameter in sig.parameters.items()
+    }
@@ -3,24 +3,26 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import copy
 import json
 import logging
 import pathlib
 import textwrap
 import warnings
+import weakref
 from abc import ABC
 from dataclasses import dataclass, fields
-from enum import Enum
 from io import StringIO, TextIOWrapper
-from typing import (TYPE_CHECKING, Any, Callable, Dict, List, Optional, TextIO, Type, TypeVar, Union, cast,
-                    get_type_hints)
+from typing import (TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, MutableMapping, Optional, TextIO,
+                    Tuple, Type, TypeVar, Union, cast)
 
 import jsonschema
-import yaml
 
-from yahp.utils import type_helpers
-from yahp.utils.iter_helpers import list_to_deduplicated_dict
-from yahp.utils.json_schema_helpers import get_registry_json_schema, get_type_json_schema
+from yahp.utils import yaml_helpers
+from yahp.utils.field_plan import get_hparams_plan
+from yahp.utils.json_schema_helpers import get_registry_json_schema, get_type_json_schema, get_validator
+from yahp.utils.registry_index import clear_registry_indices, get_registry_index
 
 if TYPE_CHECKING:
     from yahp.types import JSON
@@ -36,6 +38,36 @@ logger = logging.getLogger(__name__)
 TDefault = TypeVar('TDefault')
 THparams = TypeVar('THparams', bound='Hparams')
 
+# Incremented by :meth:`Hparams.register_class`, to invalidate anything derived from the registries of any class
+_registry_version = 0
+
+# Maps each class to (registry version, hparams_registry, schema) for its cached JSON schema
+_json_schema_cache: MutableMapping[type, Tuple[int, Any, Dict[str, Any]]] = weakref.WeakKeyDictionary()
+
+# Maps each class to (schema, validator) for its cached validator. The validator is rebuilt if the schema is.
+_validator_cache: MutableMapping[type, Tuple[Dict[str, Any], Any]] = weakref.WeakKeyDictionary()
+
+
+def get_registry_version() -> int:
+    """Returns a counter that is incremented whenever :meth:`Hparams.register_class` modifies a registry.
+
+    Caches derived from the ``hparams_registry`` of a class, or of any class reachable from it, can compare the
+    counter to detect that they may be stale.
+    """
+    return _registry_version
+
+
+def clear_json_schema_cache() -> None:
+    """Invalidate the schemas cached by :meth:`Hparams.get_json_schema`, and the registry indices (see
+    :func:`.get_registry_index`).
+
+    Both are updated automatically by :meth:`Hparams.register_class`. Call this function after modifying an
+    ``hparams_registry`` directly.
+    """
+    global _registry_version
+    _registry_version += 1
+    clear_registry_indices()
+
 
 @dataclass
 class Hparams(ABC):
@@ -81,11 +113,10 @@ class Hparams(ABC):
             ValueError: Raised if there are missing or extra keys.
         """
         keys_in_yaml = set(keys)
-        keys_in_class = set([f.name for f in fields(cls) if f.init])
-        required_keys_in_class = set(f.name for f in fields(cls) if f.init and type_helpers.is_field_required(f))
+        plan = get_hparams_plan(cls)
 
-        extra_keys = list(keys_in_yaml - keys_in_class)
-        missing_keys = list(required_keys_in_class - keys_in_yaml)
+        extra_keys = list(keys_in_yaml - plan.names)
+        missing_keys = list(plan.required_names - keys_in_yaml)
 
         if not allow_missing_keys and len(missing_keys) > 0:
             raise ValueError(f'Required keys missing in {cls.__name__}', missing_keys)
@@ -99,6 +130,8 @@ class Hparams(ABC):
         f: Union[str, None, TextIO, pathlib.PurePath] = None,
         data: Optional[Dict[str, JSON]] = None,
         cli_args: Union[List[str], bool] = True,
+        executor: Optional[concurrent.futures.Executor] = None,
+        lazy: bool = False,
     ) -> THparams:
         """Create a instance of :class:`Hparams`.
 
@@ -114,12 +147,36 @@ class Hparams(ABC):
                 CLI argument overrides.
                 If True (the default), load CLI arguments from `sys.argv`.
                 If False, then do not use any CLI arguments.
+            executor (concurrent.futures.Executor, optional): If specified, initialize sibling fields
+                that are not :class:`Hparams` concurrently via this executor. See :func:`.create`.
+            lazy (bool, optional): If True, nested objects that are not :class:`Hparams` are only initialized
+                when first used. See :func:`.create`.
 
         Returns:
             Hparams: An instance of the class.
         """
         from yahp.create_object.create_object import create
-        return create(cls, data=data, f=f, cli_args=cli_args)
+        return create(cls, data=data, f=f, cli_args=cli_args, executor=executor, lazy=lazy)
+
+    @classmethod
+    def create_stream(
+        cls: Type[THparams],
+        f: Union[str, TextIO, pathlib.PurePath],
+        file_format: Optional[str] = None,
+    ) -> Iterator[THparams]:
+        """Lazily create an instance of :class:`Hparams` for each document in a multi-document YAML or JSON-lines
+        file, or in a JSON file. See :func:`.create_iter`.
+
+        Args:
+            f (Union[str, TextIO, pathlib.PurePath]): A filepath or file-like object.
+            file_format (str, optional): ``'yaml'``, ``'jsonl'``, or ``'json'``. (default: inferred from the file
+                extension)
+
+        Returns:
+            Iterator[Hparams]: An iterator over the instances, in the order of the documents.
+        """
+        from yahp.create_object.create_many import create_iter
+        return create_iter(cls, f, file_format=file_format)
 
     @classmethod
     def get_argparse(
@@ -135,12 +192,29 @@ class Hparams(ABC):
         """Serialize the object to a YAML string.
 
         Args:
-            yaml_args: Extra arguments to pass into :func:`yaml.dump`.
+            yaml_args: Extra arguments to pass into :func:`yaml.dump`. The libyaml dumper is used if available;
+                see :mod:`yahp.utils.yaml_helpers`.
 
         Returns:
             The object, as a yaml string.
         """
-        return cast(str, yaml.dump(self.to_dict(), **yaml_args))
+        return cast(str, yaml_helpers.dump(self.to_dict(), **yaml_args))
+
+    def to_json(self, **json_args: Any) -> str:
+        """Serialize the object to a JSON string.
+
+        This is much faster than :meth:`to_yaml`, so prefer it for machine-facing output, such as logging the
+        configuration of a run. The output can be loaded by :meth:`create` from a ``.json`` file.
+
+        Args:
+            json_args: Extra arguments to pass into :func:`json.dumps`. By default, values that are not JSON
+                serializable are converted with :class:`str`.
+
+        Returns:
+            The object, as a JSON string.
+        """
+        json_args.setdefault('default', str)
+        return json.dumps(self.to_dict(), **json_args)
 
     def to_dict(self) -> Dict[str, JSON]:
         """
@@ -149,65 +223,33 @@ class Hparams(ABC):
         Returns:
             The instance, as a JSON dictionary.
         """
-        from yahp.serialization import get_key_for_instance_and_registry, serialize
-
-        res: Dict[str, JSON] = {}
-        for f in fields(self):
-            if not f.init:
-                continue
-            attr = getattr(self, f.name)
-            if attr is None:  # first, take care of the optionals
-                res[f.name] = None
-                continue
-
-            # Is the field in the hparams registry?
-            if self.hparams_registry is not None and f.name in self.hparams_registry:
-                inverted_registry = {v: k for (k, v) in self.hparams_registry[f.name].items()}
-                if isinstance(attr, list):
-                    field_list: List[JSON] = []
-                    for x in attr:
-                        x_type = type(x)
-                        key = get_key_for_instance_and_registry(x, self.hparams_registry[f.name])
-                        if key is not None:
-                            field_list.append({key: serialize(x)})
-                        elif x_type in inverted_registry:
-                            field_name = inverted_registry[x_type]
-                            field_list.append({field_name: serialize(x)})
-                        else:
-                            # Cannot determine the key from the type
-                            field_list.append(serialize(x))
-                    res[f.name] = list_to_deduplicated_dict(field_list)
-                else:
-                    field_dict = {}
-                    attr_type = type(attr)
-                    key = get_key_for_instance_and_registry(attr, self.hparams_registry[f.name])
-                    if key is not None:
-                        field_dict[key] = serialize(attr)
-                    elif attr_type in inverted_registry:
-                        field_name = inverted_registry[type(attr)]
-                        # Generic hparams. Make sure to index by the key in the hparams registry
-                        field_dict[field_name] = serialize(attr)
-                    else:
-                        # Cannot determine the key from the type
-                        field_dict = serialize(attr)
-                    res[f.name] = field_dict
+        from yahp.serialization import get_to_dict_serializer
+        return get_to_dict_serializer(type(self))(self)
 
-            else:
-                # If it's not in the registry, then it must be specific
-                is_list = isinstance(attr, list)
-                if not is_list:
-                    attr = [attr]
-                ans = []
-                for x in attr:
-                    if x is None or isinstance(x, (str, float, bool, int, Enum, dict)):
-                        ans.append(x.name if isinstance(x, Enum) else x)
-                    else:
-                        ans.append(serialize(x))
-                if not is_list:
-                    ans = ans[0]
-                res[f.name] = ans
+    def fingerprint(self) -> str:
+        """Returns a stable hash of the contents of this object.
 
-        return res
+        The fingerprint is the SHA-256 hex digest of a canonical JSON encoding of the class name and
+        :meth:`to_dict`, with sorted keys. It includes the registry keys that nested objects were created with, and
+        does not depend on the order of keys in the original YAML, so it can be used to deduplicate configs or to key
+        caches of results, including across processes. For example:
+
+        .. code-block:: python
+
+            results_by_config = {}
+            for hparams in sweep:
+                if hparams.fingerprint() not in results_by_config:
+                    results_by_config[hparams.fingerprint()] = train(hparams)
+
+        The fingerprint is computed on the first call, and cached for the instance (but not for copies of it).
+        Modifying the instance (or any nested value) afterwards does not update the fingerprint, so derive modified
+        configs with :func:`dataclasses.replace` or :func:`copy.deepcopy` instead.
+
+        Returns:
+            str: The fingerprint, as 64 hexadecimal characters.
+        """
+        from yahp.serialization import get_fingerprint
+        return get_fingerprint(self)
 
     def initialize_object(self, *args: Any, **kwargs: Any) -> Any:
         """
@@ -320,7 +362,11 @@ class Hparams(ABC):
                 "registry for class: {sub_registry[field]}. Make sure you register new classes with a unique name"""))
 
         logger.info(f'Successfully registered: {register_class.__name__} for key: {class_key} in {cls.__name__}')
+        registry_index = get_registry_index(cls, field)
         sub_registry[class_key] = register_class
+        registry_index.add(class_key, register_class)
+        global _registry_version
+        _registry_version += 1
 
     def validate(self):
         """Validate is deprecated"""
@@ -344,25 +390,20 @@ class Hparams(ABC):
             'properties': {},
             'additionalProperties': False,
         }
-        class_type_hints = get_type_hints(cls)
-        for f in sorted(fields(cls), key=lambda f: f.name):
-            if not f.init:
-                continue
-
+        for f in sorted(get_hparams_plan(cls).fields, key=lambda f: f.name):
             # Required field
-            if type_helpers.is_field_required(f):
+            if f.required:
                 if 'required' not in res.keys():
                     res['required'] = []
                 res['required'].append(f.name)
 
-            hparams_type = type_helpers.HparamsType(class_type_hints[f.name])
             # Name is found in registry, set possible values as types in a union type
-            if cls.hparams_registry and f.name in cls.hparams_registry and len(cls.hparams_registry[f.name].keys()) > 0:
-                res['properties'][f.name] = get_registry_json_schema(hparams_type, cls.hparams_registry[f.name],
-                                                                     _cls_def, allow_recursion)
+            if f.registry:
+                res['properties'][f.name] = get_registry_json_schema(f.hparams_type, f.registry, _cls_def,
+                                                                     allow_recursion)
             else:
-                res['properties'][f.name] = get_type_json_schema(hparams_type, _cls_def, allow_recursion)
-            res['properties'][f.name]['description'] = f.metadata['doc']
+                res['properties'][f.name] = get_type_json_schema(f.hparams_type, _cls_def, allow_recursion)
+            res['properties'][f.name]['description'] = f.field.metadata['doc']
 
         # Add schema to _cls_def. Hparams classes are always inserted into defs and referenced to
         # in built schemas. If this function was called from `get_type_json_schema``, that function
@@ -372,7 +413,24 @@ class Hparams(ABC):
 
     @classmethod
     def get_json_schema(cls: Type[THparams]) -> Dict[str, Any]:
-        """Generates and returns a JSONSchema dictionary."""
+        """Generates and returns a JSONSchema dictionary.
+
+        The schema is cached per class, and rebuilt after :meth:`register_class` is called for any class (or
+        :func:`clear_json_schema_cache`). The returned dictionary is a copy, so it can be safely modified.
+        """
+        return copy.deepcopy(cls._get_cached_json_schema())
+
+    @classmethod
+    def _get_cached_json_schema(cls: Type[THparams]) -> Dict[str, Any]:
+        """Returns the cached JSONSchema dictionary, which must not be modified."""
+        cached = _json_schema_cache.get(cls)
+        if cached is None or cached[0] != _registry_version or cached[1] is not cls.hparams_registry:
+            cached = (_registry_version, cls.hparams_registry, cls._generate_json_schema())
+            _json_schema_cache[cls] = cached
+        return cached[2]
+
+    @classmethod
+    def _generate_json_schema(cls: Type[THparams]) -> Dict[str, Any]:
         _cls_def = {}
         cls._build_json_schema(_cls_def=_cls_def, allow_recursion=True)
         res = _cls_def[cls.__qualname__]
@@ -398,10 +456,33 @@ class Hparams(ABC):
             kwargs: (Any): Keyword args to be passed to `json.dump`.
         """
         if isinstance(f, TextIO) or isinstance(f, TextIOWrapper):
-            json.dump(cls.get_json_schema(), f, **kwargs)
+            json.dump(cls._get_cached_json_schema(), f, **kwargs)
         else:
             with open(f, 'w') as file:
-                json.dump(cls.get_json_schema(), file, **kwargs)
+                json.dump(cls._get_cached_json_schema(), file, **kwargs)
+
+    @classmethod
+    def get_validator(cls: Type[THparams]) -> Any:
+        """Returns a validator for the :meth:`get_json_schema` of the class.
+
+        The validator is cached per class, and the schema is checked only once, when the validator is built. It is
+        rebuilt whenever the cached schema is (see :meth:`get_json_schema`). For example:
+
+        .. code-block:: python
+
+            validator = MyHparams.get_validator()
+            for error in validator.iter_errors(data):
+                print(error.message)
+
+        Returns:
+            jsonschema.protocols.Validator: The validator.
+        """
+        schema = cls._get_cached_json_schema()
+        cached = _validator_cache.get(cls)
+        if cached is None or cached[0] is not schema:
+            cached = (schema, get_validator(schema))
+            _validator_cache[cls] = cached
+        return cached[1]
 
     @classmethod
     def validate_yaml(cls: Type[THparams],
@@ -421,18 +502,50 @@ class Hparams(ABC):
         if f and data:
             raise ValueError('File and data cannot both be specified.')
         elif f:
-            if isinstance(f, TextIO) or isinstance(f, TextIOWrapper):
-                jsonschema.validate(yaml.safe_load(f), cls.get_json_schema())
-            else:
-                with open(f) as file:
-                    jsonschema.validate(yaml.safe_load(file), cls.get_json_schema())
-        elif data:
-            jsonschema.validate(data, cls.get_json_schema())
-        else:
+            data = _load_yaml_for_validation(f)
+        elif not data:
             raise ValueError('Neither file nor data were provided, so there is no YAML to validate.')
+        error = jsonschema.exceptions.best_match(cls.get_validator().iter_errors(data))
+        if error is not None:
+            raise error
+
+    @classmethod
+    def validate_many(
+        cls: Type[THparams],
+        paths_or_dicts: Iterable[Union[str, TextIO, pathlib.PurePath, Dict[str, Any]]],
+    ) -> List[Optional[jsonschema.ValidationError]]:
+        """Validate many YAML files or data dictionaries against the JSON schema.
+
+        Unlike :meth:`validate_yaml`, this method does not raise on the first invalid item. The schema and
+        validator are built once (see :meth:`get_validator`), so the cost per item is just the data check.
+
+        Args:
+            paths_or_dicts (Iterable[Union[str, TextIO, pathlib.PurePath, Dict[str, Any]]]): YAML filepaths,
+                file-like objects, or data dictionaries to validate.
+
+        Returns:
+            List[Optional[jsonschema.ValidationError]]: For each item, in order, the most relevant validation error
+            (the one :meth:`validate_yaml` would raise), or None if the item is valid.
+        """
+        validator = cls.get_validator()
+        errors: List[Optional[jsonschema.ValidationError]] = []
+        for item in paths_or_dicts:
+            if not isinstance(item, dict):
+                item = _load_yaml_for_validation(item)
+            errors.append(jsonschema.exceptions.best_match(validator.iter_errors(item)))
+        return errors
 
     def __str__(self) -> str:
-        yaml_str = self.to_yaml().strip()
-        yaml_str = textwrap.indent(yaml_str, '  ')
+        if type(self).to_yaml is Hparams.to_yaml:
+            yaml_str = yaml_helpers.dump_indented(self.to_dict(), '  ')
+        else:
+            yaml_str = textwrap.indent(self.to_yaml().strip(), '  ')
         output = f'{self.__class__.__name__}:\n{yaml_str}'
         return output
+
+
+def _load_yaml_for_validation(f: Union[str, TextIO, pathlib.PurePath]) -> Any:
+    if isinstance(f, TextIO) or isinstance(f, TextIOWrapper):
+        return yaml_helpers.safe_load(f)
+    with open(f) as file:
+        return yaml_helpers.safe_load(file)
@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 import collections.abc
+import concurrent.futures
+import hashlib
+import json
 import logging
 import os
-from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union, cast
-
-import yaml
+import pathlib
+import tempfile
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Sequence, TextIO, Tuple, Union, cast
 
+from yahp.utils import yaml_helpers
 from yahp.utils.iter_helpers import ListOfSingleItemDict, is_list_of_single_item_dicts
 
 logger = logging.getLogger(__name__)
@@ -17,6 +21,66 @@ if TYPE_CHECKING:
     from yahp.types import JSON
     JSON_NAMESPACE = Union[Dict[str, JSON], ListOfSingleItemDict]
 
+# (absolute path, mtime in nanoseconds, size in bytes). A file is considered unchanged if its stat key is unchanged.
+_StatKey = Tuple[str, int, int]
+
+
+class _ResolvedYaml(NamedTuple):
+    """A YAML file with inheritance resolved, along with the stat keys of every file that it was resolved from.
+
+    ``data`` is shared between all users of the cache, so it must never be mutated. Use :func:`_copy_json`.
+    """
+    data: Dict[str, JSON]
+    dependencies: Tuple[_StatKey, ...]
+
+
+# Resolved YAML files, shared between calls to ``load_yaml_with_inheritance(..., cache='process')``
+_process_yaml_cache: Dict[str, _ResolvedYaml] = {}
+
+_CACHE_SCOPES = ('none', 'call', 'process')
+
+_STREAM_FORMATS = ('yaml', 'json', 'jsonl')
+
+# File extensions of JSON files, which are parsed with the json module rather than as YAML
+_JSON_EXTENSIONS = ('.json',)
+
+# File extensions of JSON-lines files
+_JSON_LINES_EXTENSIONS = ('.jsonl', '.ndjson')
+
+# Environment variable for the directory of the persistent cache of resolved YAML files
+_CACHE_DIR_ENV_VAR = 'YAHP_CACHE_DIR'
+
+# Bump when the format of the entries in the persistent cache changes
+_CACHE_DIR_FORMAT_VERSION = 2
+
+
+def clear_yaml_cache() -> None:
+    """Clear the process-wide cache used by ``load_yaml_with_inheritance(..., cache='process')``."""
+    _process_yaml_cache.clear()
+
+
+def _hash_content(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def _copy_json(data: JSON) -> JSON:
+    # Much faster than copy.deepcopy for the dicts, lists, and scalars produced by the YAML loader
+    if isinstance(data, dict):
+        return {k: _copy_json(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [_copy_json(v) for v in data]
+    return data
+
+
+def _is_plain_json(data: JSON) -> bool:
+    # Whether ``data`` survives a round trip through the json module unchanged. The full YAML loader can also produce
+    # e.g. dates, tuples, sets, and non-string keys, which JSON would silently convert or reject.
+    if isinstance(data, dict):
+        return all(type(k) is str and _is_plain_json(v) for k, v in data.items())
+    if type(data) is list:
+        return all(_is_plain_json(v) for v in data)
+    return data is None or type(data) in (str, int, float, bool)
+
 
 def _get_inherits_paths(
     namespace: Dict[str, JSON],
@@ -65,105 +129,389 @@ def _data_by_path(
     return namespace
 
 
-def _ensure_path_exists(namespace: JSON, argument_path: Sequence[Union[int, str]]) -> None:
-    for key in argument_path:
-        if isinstance(namespace, dict):
-            assert isinstance(key, str)
-            namespace = namespace.setdefault(key, {})
-        elif is_list_of_single_item_dicts(namespace):  #type: ignore
-            assert isinstance(key, str)
-            namespace = ListOfSingleItemDict(namespace)  # type: ignore
-            if key not in namespace:
-                namespace[key] = {}
-            namespace = namespace[key]
-        elif isinstance(namespace, list):
-            assert isinstance(key, int)
-            # TODO: try except to verify key in range
-            namespace = namespace[key]  # type: ignore
-        else:
-            raise ValueError('Path must be empty unless if list or dict')
+def _as_branch(val: JSON) -> Optional[JSON_NAMESPACE]:
+    """Returns ``val`` as a namespace that inherited data can be merged into, or None if ``val`` is a leaf."""
+    if isinstance(val, dict):
+        return val
+    if is_list_of_single_item_dicts(val):
+        return ListOfSingleItemDict(cast(list, val))
+    return None
 
 
-class _OverriddenValue:
+def _get_container(namespace: JSON_NAMESPACE) -> JSON:
+    """Returns the object that holds the items of ``namespace``, for identifying positions in the data."""
+    if isinstance(namespace, ListOfSingleItemDict):
+        return namespace._list
+    return namespace
 
-    def __init__(self, val: JSON):
-        self.val = val
 
+class _InheritanceMerger:
+    """Merges inherited data into a YAML document.
 
-def _unwrap_overridden_value_dict(data: Dict[str, JSON]):
-    for key, val in data.items():
-        if isinstance(val, collections.abc.Mapping):
-            _unwrap_overridden_value_dict(val)
-        elif is_list_of_single_item_dicts(val):
-            for item in val:  # type: ignore
-                _unwrap_overridden_value_dict(item)
-        elif isinstance(val, _OverriddenValue):
-            data[key] = val.val
+    Each inherited subtree is merged in a single recursive pass that keeps a cursor into the document, so the total
+    cost is linear in the size of the inherited data. The precedence rules are:
 
+    *   Values specified in the document are kept, unless they are null or a dict that still has ``inherits``.
+    *   Values inherited from other files are overridden by values inherited later.
+    *   Inherited branches (dicts) replace values that are not branches.
 
-def _recursively_update_leaf_data_items(
-    update_namespace: Dict[str, JSON],
-    update_data: JSON,
-    update_argument_path: List[str],
-):
-    if isinstance(update_data, collections.abc.Mapping):
-        # This is still a branch point
-        _ensure_path_exists(update_namespace, update_argument_path)
-        for key, val in update_data.items():
-            _recursively_update_leaf_data_items(
-                update_namespace=update_namespace,
-                update_data=val,
-                update_argument_path=update_argument_path + [key],
-            )
-    else:
-        # Must be a leaf
-        inner_namespace = update_namespace
+    Rather than wrapping inherited values and unwrapping them in a final pass, the positions of inherited
+    values are recorded in ``self._inherited``.
 
-        # Traverse the tree to the final branch
+    Args:
+        data (Dict[str, JSON]): The document to merge into, which is modified in place.
+    """
+
+    def __init__(self, data: Dict[str, JSON]) -> None:
+        self.data = data
+        # Maps (id(container), key) -> container for each inherited value. The container is stored to keep it
+        # alive, so its id cannot be reused by a different object
+        self._inherited: Dict[Tuple[int, str], JSON] = {}
+
+    def merge(self, update_data: JSON, update_argument_path: List[str]) -> None:
+        """Merge ``update_data`` into the document at ``update_argument_path``."""
+        namespace: Optional[JSON_NAMESPACE] = self.data
+        if not update_argument_path:
+            assert isinstance(update_data, collections.abc.Mapping)
+            self._merge_children(self.data, update_data)
+            return
         for key in update_argument_path[:-1]:
-            key_element: Optional[JSON_NAMESPACE] = None
-            if isinstance(inner_namespace, collections.abc.Mapping):
-                # Simple dict
-                key_element = inner_namespace.get(key)  # type: ignore
-            elif is_list_of_single_item_dicts(inner_namespace):
-                # List of single-item dicts
-                assert isinstance(inner_namespace, list)  # ensure type for pyright
-                inner_namespace = ListOfSingleItemDict(inner_namespace)
-                if key in inner_namespace:
-                    key_element = inner_namespace[key]
-            # key_element is None otherwise
-
-            # This needs to be a branch, so make it an empty dict
-            # This overrides simple types if the inheritance specifies a branch
-            if key_element is None or not (isinstance(key_element, dict) or is_list_of_single_item_dicts(key_element)):
-                key_element = {}
-                inner_namespace[key] = key_element
-
-            assert isinstance(key_element, dict) or is_list_of_single_item_dicts(key_element)
-            inner_namespace = key_element
-
-        key = update_argument_path[-1]
-        if isinstance(inner_namespace, collections.abc.Mapping):
-            existing_value = inner_namespace.get(key)
-        else:
-            # List of single-item dicts
-            assert isinstance(inner_namespace, list)
-            inner_namespace = ListOfSingleItemDict(inner_namespace)
-            if key in inner_namespace:
-                existing_value = inner_namespace[key]
-            else:
-                existing_value = None
+            namespace = self._get_child_namespace(namespace, key, is_leaf_update=True)
+        assert namespace is not None
+        self._merge_item(namespace, update_argument_path[-1], update_data)
+
+    def remove_inherits(self, argument_path: List[str]) -> None:
+        """Remove the ``inherits`` key at ``argument_path``, once all of its files have been merged."""
+        val: JSON = self.data
+        for key in argument_path:
+            namespace = _as_branch(val)
+            if namespace is None or key not in namespace:
+                return
+            val = namespace[key]
+        if isinstance(val, dict) and 'inherits' in val:
+            del val['inherits']
+
+    def _is_inherited(self, namespace: JSON_NAMESPACE, key: str) -> bool:
+        return (id(_get_container(namespace)), key) in self._inherited
+
+    def _get_child_namespace(self, namespace: JSON_NAMESPACE, key: str,
+                             is_leaf_update: bool) -> Optional[JSON_NAMESPACE]:
+        """Returns ``namespace[key]`` as a namespace, creating it if it does not exist.
+
+        If ``namespace[key]`` is a leaf (including an inherited value), it is replaced with an empty dict if
+        ``is_leaf_update`` (i.e. data will be inserted below it); otherwise, it is kept, and None is returned.
+        """
+        if key not in namespace:
+            child: JSON = {}
+            namespace[key] = child
+            return child
+        if not self._is_inherited(namespace, key):
+            child_namespace = _as_branch(namespace[key])
+            if child_namespace is not None:
+                return child_namespace
+        if not is_leaf_update:
+            return None
+        # This needs to be a branch, so make it an empty dict
+        # This overrides simple types if the inheritance specifies a branch
+        child = {}
+        namespace[key] = child
+        self._inherited.pop((id(_get_container(namespace)), key), None)
+        return child
+
+    def _merge_item(self, namespace: JSON_NAMESPACE, key: str, update_data: JSON) -> None:
+        if isinstance(update_data, collections.abc.Mapping):
+            # This is still a branch point
+            child_namespace = self._get_child_namespace(namespace, key, is_leaf_update=len(update_data) > 0)
+            if child_namespace is not None:
+                self._merge_children(child_namespace, update_data)
+            return
 
+        # Must be a leaf
+        existing_value = namespace[key] if key in namespace else None
         is_empty = (existing_value is None)  # Empty values should be filled in
-        is_lower_priority = isinstance(existing_value, _OverriddenValue)  # Further inheritance should override previous
-        is_inherits_dict = isinstance(existing_value,
-                                      dict) and 'inherits' in existing_value  # Not sure about this one...
+        is_lower_priority = self._is_inherited(namespace, key)  # Further inheritance should override previous
+        is_inherits_dict = isinstance(existing_value, dict) and 'inherits' in existing_value
 
         if is_empty or is_lower_priority or is_inherits_dict:
-            inner_namespace[key] = _OverriddenValue(update_data)  # type: ignore
+            # The inherited data may be cached, so copy it before it is inserted
+            namespace[key] = _copy_json(update_data)
+            container = _get_container(namespace)
+            self._inherited[(id(container), key)] = container
+
+    def _merge_children(self, namespace: JSON_NAMESPACE, update_data: collections.abc.Mapping) -> None:
+        for key, val in update_data.items():
+            self._merge_item(namespace, key, val)
+
 
+def _get_inherit_abs_path(abs_path: str, inherit_yaml: str) -> str:
+    """Returns the absolute path of ``inherit_yaml``, which is inherited by the file at ``abs_path``."""
+    if not os.path.isabs(inherit_yaml):
+        # Allow paths relative to the provided YAML
+        inherit_yaml = os.path.join(os.path.dirname(abs_path), inherit_yaml)
+    return os.path.abspath(inherit_yaml)
 
-def load_yaml_with_inheritance(yaml_path: str) -> Dict[str, JSON]:
+
+class _YamlLoader:
+    """Loads YAML files with inheritance for a single call to :func:`load_yaml_with_inheritance`.
+
+    Each file is stat-ed and resolved at most once per call, so bases shared by several files (or inherited at
+    several nested paths) are read and parsed only once.
+
+    Args:
+        cache (str): The cache scope. See :func:`load_yaml_with_inheritance`.
+        num_workers (int): The number of threads for reading files. See :func:`load_yaml_with_inheritance`.
+    """
+
+    def __init__(self, cache: str, num_workers: int = 0) -> None:
+        if cache not in _CACHE_SCOPES:
+            raise ValueError(f'cache must be one of {_CACHE_SCOPES}; got {cache!r}')
+        if num_workers < 0:
+            raise ValueError(f'num_workers must be non-negative; got {num_workers}')
+        self.cache = cache
+        self.num_workers = num_workers
+        # Files that were read and parsed ahead of time by ``prefetch``. Each is consumed by ``_resolve``.
+        self._prefetched: Dict[str, concurrent.futures.Future] = {}
+        self.cache_dir: Optional[str] = None
+        if cache != 'none':
+            self.cache_dir = os.environ.get(_CACHE_DIR_ENV_VAR) or None
+        self._stat_keys: Dict[str, _StatKey] = {}
+        self._content_hashes: Dict[str, str] = {}
+        self._resolved: Dict[str, _ResolvedYaml] = {}
+
+    def _stat(self, abs_path: str) -> _StatKey:
+        try:
+            return self._stat_keys[abs_path]
+        except KeyError:
+            stat = os.stat(abs_path)
+            stat_key = (abs_path, stat.st_mtime_ns, stat.st_size)
+            self._stat_keys[abs_path] = stat_key
+            return stat_key
+
+    def _is_up_to_date(self, resolved: _ResolvedYaml) -> bool:
+        try:
+            return all(self._stat(dependency[0]) == dependency for dependency in resolved.dependencies)
+        except OSError:
+            return False
+
+    def _get_content_hash(self, abs_path: str) -> str:
+        try:
+            return self._content_hashes[abs_path]
+        except KeyError:
+            with open(abs_path, 'r') as f:
+                content_hash = _hash_content(f.read())
+            self._content_hashes[abs_path] = content_hash
+            return content_hash
+
+    def _get_cache_entry_path(self, abs_path: str) -> str:
+        assert self.cache_dir is not None
+        return os.path.join(self.cache_dir, hashlib.sha256(abs_path.encode('utf-8')).hexdigest() + '.json')
+
+    def _load_from_cache_dir(self, abs_path: str) -> Optional[_ResolvedYaml]:
+        """Load ``abs_path`` from the persistent cache, if it has an entry that is up to date."""
+        entry_path = self._get_cache_entry_path(abs_path)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                format_version, entry_dependencies, data = json.load(f)
+            if format_version != _CACHE_DIR_FORMAT_VERSION:
+                return None
+            entry_dependencies = [(str(path), int(mtime_ns), int(size), str(content_hash))
+                                  for path, mtime_ns, size, content_hash in entry_dependencies]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f'Ignoring the unreadable YAML cache entry {entry_path}: {e}')
+            return None
+        dependencies: List[_StatKey] = []
+        is_stale = False
+        for dependency_path, mtime_ns, size, content_hash in entry_dependencies:
+            try:
+                stat_key = self._stat(dependency_path)
+                if stat_key != (dependency_path, mtime_ns, size):
+                    # The file was touched, but it may not have changed
+                    if self._get_content_hash(dependency_path) != content_hash:
+                        return None
+                    is_stale = True
+            except OSError:
+                return None
+            dependencies.append(stat_key)
+        resolved = _ResolvedYaml(data, tuple(dependencies))
+        if is_stale:
+            # Record the new stat keys, so the next lookup only needs to stat the files
+            self._save_to_cache_dir(abs_path, resolved)
+        return resolved
+
+    def _save_to_cache_dir(self, abs_path: str, resolved: _ResolvedYaml) -> None:
+        assert self.cache_dir is not None
+        if not _is_plain_json(resolved.data):
+            # Entries are stored as JSON, rather than pickled, so that reading them can never execute code
+            return
+        try:
+            entry_dependencies = [(*stat_key, self._get_content_hash(stat_key[0])) for stat_key in resolved.dependencies
+                                 ]
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            # Write to a temporary file, then rename, so concurrent readers never see a partial entry
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.cache_dir, suffix='.tmp',
+                                             delete=False) as f:
+                try:
+                    json.dump([_CACHE_DIR_FORMAT_VERSION, entry_dependencies, resolved.data], f)
+                except BaseException:
+                    os.remove(f.name)
+                    raise
+            os.replace(f.name, self._get_cache_entry_path(abs_path))
+        except Exception as e:
+            logger.warning(f'Failed to write {abs_path} to the YAML cache in {self.cache_dir}: {e}')
+
+    def _get_cached(self, abs_path: str) -> Optional[_ResolvedYaml]:
+        """Returns ``abs_path`` from the process-wide or persistent cache, or None if it is not cached."""
+        resolved = None
+        if self.cache == 'process':
+            resolved = _process_yaml_cache.get(abs_path)
+            if resolved is not None and not self._is_up_to_date(resolved):
+                resolved = None
+        if resolved is None and self.cache_dir is not None:
+            resolved = self._load_from_cache_dir(abs_path)
+        return resolved
+
+    def _read(self, abs_path: str) -> JSON:
+        """Read and parse ``abs_path``, without resolving inheritance."""
+        if self.cache != 'none':
+            # Stat before reading, so a concurrent modification is detected by the next lookup
+            self._stat(abs_path)
+        with open(abs_path, 'r') as f:
+            content = f.read()
+        if self.cache_dir is not None:
+            self._content_hashes[abs_path] = _hash_content(content)
+        if get_file_format(abs_path) == 'json':
+            return json.loads(content)
+        return yaml_helpers.full_load(content)
+
+    def _prefetch_one(self, abs_path: str) -> Tuple[Optional[_ResolvedYaml], JSON]:
+        if self.cache != 'none':
+            resolved = self._get_cached(abs_path)
+            if resolved is not None:
+                return resolved, None
+        return None, self._read(abs_path)
+
+    def prefetch(self, abs_path: str) -> None:
+        """Read and parse ``abs_path`` and every file that it inherits from, concurrently.
+
+        Files are read on a pool of ``self.num_workers`` threads. As each file is parsed, the files that it inherits
+        from are submitted to the pool. Cached files are looked up (rather than read) by the pool, and the files
+        they inherit from are not read at all. Inheritance is then resolved by :meth:`load`, in the usual order.
+        Errors are raised by :meth:`load`, when (and if) the file is needed.
+        """
+        seen = set()
+        pending: Dict[concurrent.futures.Future, str] = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+
+            def submit(abs_path: str):
+                if abs_path in seen or abs_path in self._resolved:
+                    return
+                seen.add(abs_path)
+                pending[executor.submit(self._prefetch_one, abs_path)] = abs_path
+
+            submit(abs_path)
+            while pending:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    abs_path = pending.pop(future)
+                    if future.exception() is not None:
+                        self._prefetched[abs_path] = future
+                        continue
+                    resolved, data = future.result()
+                    if resolved is not None:
+                        self._set_resolved(abs_path, resolved)
+                        continue
+                    data_future = concurrent.futures.Future()
+                    data_future.set_result(data)
+                    self._prefetched[abs_path] = data_future
+                    if isinstance(data, dict):
+                        for _, inherit_yamls in _get_inherits_paths(data, []):
+                            for inherit_yaml in inherit_yamls:
+                                submit(_get_inherit_abs_path(abs_path, inherit_yaml))
+
+    def load(self, abs_path: str) -> _ResolvedYaml:
+        """Load ``abs_path`` with inheritance resolved. The returned data must not be mutated."""
+        if self.cache == 'none':
+            return self._resolve(abs_path)
+        try:
+            return self._resolved[abs_path]
+        except KeyError:
+            pass
+        resolved = None
+        if abs_path not in self._prefetched:
+            # Otherwise, the file was already looked up in the caches by ``prefetch``
+            resolved = self._get_cached(abs_path)
+        if resolved is None:
+            resolved = self._resolve(abs_path)
+            if self.cache_dir is not None:
+                self._save_to_cache_dir(abs_path, resolved)
+        self._set_resolved(abs_path, resolved)
+        return resolved
+
+    def _set_resolved(self, abs_path: str, resolved: _ResolvedYaml) -> None:
+        if self.cache == 'process':
+            _process_yaml_cache[abs_path] = resolved
+        self._resolved[abs_path] = resolved
+
+    def _resolve(self, abs_path: str) -> _ResolvedYaml:
+        prefetched = self._prefetched.pop(abs_path, None)
+        if prefetched is None:
+            data: JSON = self._read(abs_path)
+        else:
+            data = prefetched.result()
+        dependencies = [self._stat(abs_path)] if self.cache != 'none' else []
+
+        if data is None:
+            data = {}
+
+        assert isinstance(data, dict)
+        return self.resolve_data(data, abs_path, dependencies)
+
+    def resolve_data(self,
+                     data: Dict[str, JSON],
+                     abs_path: str,
+                     dependencies: Optional[List[_StatKey]] = None) -> _ResolvedYaml:
+        """Resolve inheritance in ``data``, which is modified in place.
+
+        Args:
+            data (Dict[str, JSON]): The data, as read from ``abs_path``.
+            abs_path (str): The path of the file that ``data`` was read from. Relative paths in ``inherits``
+                are relative to its directory.
+            dependencies (List[_StatKey], optional): The stat keys of the files that ``data`` depends on, which
+                is extended with the files that it inherits from.
+        """
+        if dependencies is None:
+            dependencies = []
+
+        # Get all instances of 'inherits' in the YAML, sorted by depth in the nested dict
+        inherit_paths = sorted(_get_inherits_paths(data, []), key=lambda x: len(x[0]))
+
+        merger = _InheritanceMerger(data)
+        for nested_keys, inherit_yamls in inherit_paths:
+            for inherit_yaml in inherit_yamls:
+                inherit_yaml = _get_inherit_abs_path(abs_path, inherit_yaml)
+
+                # Recursively load the YAML to inherit from
+                inherit_resolved = self.load(inherit_yaml)
+                dependencies.extend(inherit_resolved.dependencies)
+                try:
+                    # Select out just the portion specified by nested_keys
+                    inherit_data = _data_by_path(namespace=inherit_resolved.data, argument_path=nested_keys)
+                except KeyError:
+                    logger.warning(f'Failed to load item from inherited YAML file: {inherit_yaml}')
+                    continue
+
+                # Insert any new keys from inherit_data into data
+                merger.merge(update_data=inherit_data, update_argument_path=nested_keys)
+
+            # Carefully remove the 'inherits' key from the nested data dict
+            merger.remove_inherits(nested_keys)
+
+        return _ResolvedYaml(data, tuple(dict.fromkeys(dependencies)))
+
+
+def load_yaml_with_inheritance(yaml_path: str, cache: str = 'call', num_workers: int = 0) -> Dict[str, JSON]:
     """Loads a YAML file with inheritance.
 
     Inheritance allows one YAML file to include data from another yaml file.
@@ -204,55 +552,111 @@ def load_yaml_with_inheritance(yaml_path: str) -> Dict[str, JSON]:
             },
         }
 
+    Files are resolved at most once per call, even if they are inherited by several files or at several nested
+    paths. With ``cache='process'``, resolved files are also cached across calls, which avoids re-reading
+    shared base files when loading many configs (e.g. for a sweep, or on a slow network file system).
+    A cached file is reused only if the path, modification time, and size of it and of every file it inherits
+    from are unchanged. Use :func:`clear_yaml_cache` to drop the process-wide cache.
+
+    To also cache resolved files on disk, across processes, set the ``YAHP_CACHE_DIR`` environment variable to a
+    directory. Like ``.pyc`` files for Python modules, each entry records the content hashes of the file and of
+    every file that it (transitively) inherits from. If those files are unchanged, the entry is used, and YAML
+    parsing and inheritance resolution are skipped entirely. Files whose modification time and size are unchanged
+    are assumed to be unchanged; otherwise, their contents are hashed. The persistent cache is not used with
+    ``cache='none'``. It is safe to share the directory between concurrent processes. Entries are stored as
+    JSON, so reading them never executes code; files whose data is not plain JSON (e.g. that contain dates) are
+    not cached on disk.
+
     Args:
         yaml_path (str): The filepath to the yaml to load.
+        cache (str, optional): The cache scope. One of ``'none'`` (read every file each time it is inherited),
+            ``'call'`` (cache within this call), or ``'process'`` (cache across calls). (default: ``'call'``)
+        num_workers (int, optional): If positive, read and parse the file and all files that it (transitively)
+            inherits from concurrently, on a pool of this many threads, before resolving inheritance. This helps
+            when file reads are slow, e.g. on a network file system. The result is the same as when
+            ``num_workers`` is ``0``. (default: ``0``, to read the files one at a time as they are inherited)
 
     Returns:
         JSON Dictionary: The flattened YAML, with inheritance stripped.
     """
+    loader = _YamlLoader(cache, num_workers=num_workers)
     abs_path = os.path.abspath(yaml_path)
-    file_directory = os.path.dirname(abs_path)
-    with open(abs_path, 'r') as f:
-        data: JSON = yaml.full_load(f)
-
-    if data is None:
-        data = {}
+    if num_workers > 0:
+        loader.prefetch(abs_path)
+    # Always return a copy, so callers can't corrupt the cached data
+    return cast(Dict[str, 'JSON'], _copy_json(loader.load(abs_path).data))
 
-    assert isinstance(data, dict)
 
-    # Get all instances of 'inherits' in the YAML, sorted by depth in the nested dict
-    inherit_paths = sorted(_get_inherits_paths(data, []), key=lambda x: len(x[0]))
+def get_file_format(f: Union[str, TextIO, pathlib.PurePath]) -> str:
+    """Returns the format of a file from its extension: ``'json'`` for JSON, ``'jsonl'`` for JSON lines, otherwise
+    ``'yaml'``.
 
-    for nested_keys, inherit_yamls in inherit_paths:
-        for inherit_yaml in inherit_yamls:
-            if not os.path.isabs(inherit_yaml):
-                # Allow paths relative to the provided YAML
-                inherit_yaml = os.path.abspath(os.path.join(file_directory, inherit_yaml))
-
-            # Recursively load the YAML to inherit from
-            inherit_data_full = load_yaml_with_inheritance(yaml_path=inherit_yaml)
-            try:
-                # Select out just the portion specified by nested_keys
-                inherit_data = _data_by_path(namespace=inherit_data_full, argument_path=nested_keys)
-            except KeyError:
-                logger.warn(f'Failed to load item from inherited YAML file: {inherit_yaml}')
-                continue
-
-            # Insert any new keys from inherit_data into data
-            _recursively_update_leaf_data_items(
-                update_namespace=data,
-                update_data=inherit_data,
-                update_argument_path=nested_keys,
-            )
+    Args:
+        f (str | TextIO | pathlib.PurePath): A filepath or file-like object. For a file-like object, the extension
+            of its ``name`` attribute, if any, is used.
+    """
+    if not isinstance(f, (str, pathlib.PurePath)):
+        f = getattr(f, 'name', '')
+    assert isinstance(f, (str, pathlib.PurePath))
+    extension = os.path.splitext(f)[1].lower()
+    if extension in _JSON_EXTENSIONS:
+        return 'json'
+    if extension in _JSON_LINES_EXTENSIONS:
+        return 'jsonl'
+    return 'yaml'
+
+
+def iter_yaml_with_inheritance(
+    f: Union[str, TextIO, pathlib.PurePath],
+    file_format: Optional[str] = None,
+) -> Iterator[Dict[str, JSON]]:
+    """Lazily loads each document of a multi-document YAML file or JSON-lines file, with inheritance.
+
+    Documents are read and parsed one at a time, as the iterator is consumed, so memory usage does not grow with
+    the number of documents. Each document can use ``inherits``, with paths relative to the directory of the
+    file (or to the working directory, for a file-like object without a path). Inherited files are read and
+    resolved at most once, no matter how many documents inherit from them. Empty YAML documents and blank lines
+    are skipped.
 
-        # Carefully remove the 'inherits' key from the nested data dict
-        inherits_key_dict = _data_by_path(namespace=data, argument_path=nested_keys)
-        if isinstance(inherits_key_dict, dict) and 'inherits' in inherits_key_dict:
-            del inherits_key_dict['inherits']
+    Args:
+        f (str | TextIO | pathlib.PurePath): A filepath or file-like object. A file opened from a filepath is
+            closed when the iterator is exhausted (or closed).
+        file_format (str, optional): ``'yaml'`` for a multi-document YAML stream (documents separated by
+            ``---``), ``'jsonl'`` for JSON lines (one JSON object per line), or ``'json'`` for a single JSON
+            document. (default: inferred by :func:`get_file_format`)
 
-    # Resolve all newly added values in data
-    _unwrap_overridden_value_dict(data)
-    return data
+    Returns:
+        Iterator[Dict[str, JSON]]: An iterator over the documents, with inheritance resolved.
+    """
+    if file_format is None:
+        file_format = get_file_format(f)
+    if file_format not in _STREAM_FORMATS:
+        raise ValueError(f'file_format must be one of {_STREAM_FORMATS}; got {file_format!r}')
+    if isinstance(f, pathlib.PurePath):
+        f = str(f)
+    return _iter_yaml_with_inheritance(f, file_format)
+
+
+def _iter_yaml_with_inheritance(f: Union[str, TextIO], file_format: str) -> Iterator[Dict[str, JSON]]:
+    if isinstance(f, str):
+        with open(f, 'r') as stream:
+            yield from _iter_yaml_with_inheritance(stream, file_format)
+        return
+    abs_path = os.path.abspath(getattr(f, 'name', None) or os.path.join(os.getcwd(), '<stream>'))
+    if file_format == 'jsonl':
+        documents = (json.loads(line) for line in f if line.strip())
+    elif file_format == 'json':
+        documents = iter((json.load(f),))
+    else:
+        documents = yaml_helpers.full_load_all(f)
+    # Share the loader between documents, so inherited files are read once
+    loader = _YamlLoader('call')
+    for i, data in enumerate(documents):
+        if data is None:
+            continue
+        if not isinstance(data, dict):
+            raise TypeError(f'Document {i} of {abs_path} must be a dict; got {type(data).__name__}')
+        yield loader.resolve_data(data, abs_path).data
 
 
 def preprocess_yaml_with_inheritance(yaml_path: str, output_yaml_path: str) -> None:
@@ -266,4 +670,5 @@ def preprocess_yaml_with_inheritance(yaml_path: str, output_yaml_path: str) -> N
     """
     data = load_yaml_with_inheritance(yaml_path)
     with open(output_yaml_path, 'w+') as f:
-        yaml.dump(data, f, explicit_end=False, explicit_start=False, indent=2, default_flow_style=False)  # type: ignore
+        yaml_helpers.dump(data, f, explicit_end=False, explicit_start=False, indent=2,
+                          default_flow_style=False)  # type: ignore
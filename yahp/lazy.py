@@ -0,0 +1,260 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+"""Lazily initialized objects, for deferring the construction of rarely used components."""
+
+from __future__ import annotations
+
+import operator
+import threading
+from typing import Any, Callable, Generic, Iterator, Optional, TypeVar
+
+__all__ = ['Thunk', 'LazyObject', 'is_lazy', 'resolve']
+
+TObject = TypeVar('TObject')
+
+_UNSET = object()
+
+
+class Thunk(Generic[TObject]):
+    """A zero-argument callable that initializes an object on the first call, and returns the same object afterwards.
+
+    Constructors can opt in to receiving a :class:`Thunk` for a parameter, rather than the initialized object,
+    by listing the parameter in an ``hparams_thunk_fields`` attribute. See :func:`.create`.
+
+    Args:
+        factory (Callable[[], TObject]): Function that initializes the object.
+
+    Raises:
+        RuntimeError: If the thunk is called by its own factory (directly, or through a cycle of thunks), which would
+            otherwise never return.
+    """
+
+    __slots__ = ('_factory', '_obj', '_lock', '_owner', '__weakref__')
+
+    def __init__(self, factory: Callable[[], TObject]) -> None:
+        self._factory = factory
+        self._obj: Any = _UNSET
+        self._lock = threading.Lock()
+        # The id of the thread that is running the factory, if any
+        self._owner: Optional[int] = None
+
+    @property
+    def initialized(self) -> bool:
+        """Whether the object has been initialized."""
+        return self._obj is not _UNSET
+
+    def __call__(self) -> TObject:
+        if self._obj is _UNSET:
+            if self._owner == threading.get_ident():
+                raise RuntimeError('The thunk was called while initializing its own object, e.g. via a cycle of '
+                                   'thunks or lazy objects')
+            with self._lock:
+                if self._obj is _UNSET:
+                    self._owner = threading.get_ident()
+                    try:
+                        self._obj = self._factory()
+                    finally:
+                        self._owner = None
+                    # Release the factory (and everything it references)
+                    self._factory = None
+        return self._obj
+
+    def __repr__(self) -> str:
+        if self.initialized:
+            return f'Thunk({self._obj!r})'
+        return 'Thunk(<uninitialized>)'
+
+
+def _forward(func: Callable[..., Any]) -> Callable[..., Any]:
+    # A method that applies ``func`` to the underlying object and the arguments
+    def method(self: LazyObject, *args: Any) -> Any:
+        return func(self._yahp_resolve(), *args)
+
+    return method
+
+
+def _forward_reflected(func: Callable[[Any, Any], Any]) -> Callable[..., Any]:
+    # A method that applies ``func`` to the other operand and the underlying object
+    def method(self: LazyObject, other: Any) -> Any:
+        return func(other, self._yahp_resolve())
+
+    return method
+
+
+def _forward_inplace(func: Callable[[Any, Any], Any]) -> Callable[..., Any]:
+
+    def method(self: LazyObject, other: Any) -> Any:
+        obj = self._yahp_resolve()
+        result = func(obj, other)
+        # Keep the proxy if the object was modified in place, e.g. by ``+=`` on a list
+        return self if result is obj else result
+
+    return method
+
+
+class LazyObject:
+    """A transparent proxy for an object that is initialized on first use.
+
+    Attribute access, calls, operators (including comparisons, arithmetic, and in-place operators), conversions
+    (e.g. :func:`int`), container access, iteration, and :func:`isinstance` checks are forwarded to the underlying
+    object, initializing it if needed. Unlike the underlying object, a :class:`LazyObject` is always hashable by
+    identity, so it can be used with :func:`.serialize` without being initialized. Use :func:`resolve` to get the
+    underlying object.
+
+    Args:
+        thunk (Thunk): The thunk that initializes the underlying object.
+    """
+
+    __slots__ = ('_yahp_thunk', '__weakref__')
+
+    def __init__(self, thunk: Thunk) -> None:
+        object.__setattr__(self, '_yahp_thunk', thunk)
+
+    def _yahp_resolve(self) -> Any:
+        return object.__getattribute__(self, '_yahp_thunk')()
+
+    @property  # type: ignore
+    def __class__(self):
+        return type(self._yahp_resolve())
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._yahp_resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._yahp_resolve(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self._yahp_resolve(), name)
+
+    def __dir__(self):
+        return dir(self._yahp_resolve())
+
+    def __repr__(self) -> str:
+        thunk = object.__getattribute__(self, '_yahp_thunk')
+        if thunk.initialized:
+            return repr(thunk())
+        return '<LazyObject (uninitialized)>'
+
+    def __str__(self) -> str:
+        return str(self._yahp_resolve())
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self._yahp_resolve(), format_spec)
+
+    # Hash by identity, so the proxy can be registered for serialization without being initialized
+    __hash__ = object.__hash__
+
+    def __eq__(self, other: object) -> bool:
+        if other is self:
+            return True
+        return self._yahp_resolve() == other
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __bool__(self) -> bool:
+        return bool(self._yahp_resolve())
+
+    def __len__(self) -> int:
+        return len(self._yahp_resolve())
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._yahp_resolve())
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._yahp_resolve()
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._yahp_resolve()[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._yahp_resolve()[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        del self._yahp_resolve()[key]
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._yahp_resolve()(*args, **kwargs)
+
+    def __enter__(self) -> Any:
+        return self._yahp_resolve().__enter__()
+
+    def __exit__(self, *args: Any) -> Any:
+        return self._yahp_resolve().__exit__(*args)
+
+    __lt__ = _forward(operator.lt)
+    __le__ = _forward(operator.le)
+    __gt__ = _forward(operator.gt)
+    __ge__ = _forward(operator.ge)
+
+    __add__ = _forward(operator.add)
+    __sub__ = _forward(operator.sub)
+    __mul__ = _forward(operator.mul)
+    __matmul__ = _forward(operator.matmul)
+    __truediv__ = _forward(operator.truediv)
+    __floordiv__ = _forward(operator.floordiv)
+    __mod__ = _forward(operator.mod)
+    __divmod__ = _forward(divmod)
+    __pow__ = _forward(pow)
+    __lshift__ = _forward(operator.lshift)
+    __rshift__ = _forward(operator.rshift)
+    __and__ = _forward(operator.and_)
+    __or__ = _forward(operator.or_)
+    __xor__ = _forward(operator.xor)
+
+    __radd__ = _forward_reflected(operator.add)
+    __rsub__ = _forward_reflected(operator.sub)
+    __rmul__ = _forward_reflected(operator.mul)
+    __rmatmul__ = _forward_reflected(operator.matmul)
+    __rtruediv__ = _forward_reflected(operator.truediv)
+    __rfloordiv__ = _forward_reflected(operator.floordiv)
+    __rmod__ = _forward_reflected(operator.mod)
+    __rdivmod__ = _forward_reflected(divmod)
+    __rpow__ = _forward_reflected(pow)
+    __rlshift__ = _forward_reflected(operator.lshift)
+    __rrshift__ = _forward_reflected(operator.rshift)
+    __rand__ = _forward_reflected(operator.and_)
+    __ror__ = _forward_reflected(operator.or_)
+    __rxor__ = _forward_reflected(operator.xor)
+
+    __iadd__ = _forward_inplace(operator.iadd)
+    __isub__ = _forward_inplace(operator.isub)
+    __imul__ = _forward_inplace(operator.imul)
+    __imatmul__ = _forward_inplace(operator.imatmul)
+    __itruediv__ = _forward_inplace(operator.itruediv)
+    __ifloordiv__ = _forward_inplace(operator.ifloordiv)
+    __imod__ = _forward_inplace(operator.imod)
+    __ipow__ = _forward_inplace(operator.ipow)
+    __ilshift__ = _forward_inplace(operator.ilshift)
+    __irshift__ = _forward_inplace(operator.irshift)
+    __iand__ = _forward_inplace(operator.iand)
+    __ior__ = _forward_inplace(operator.ior)
+    __ixor__ = _forward_inplace(operator.ixor)
+
+    __neg__ = _forward(operator.neg)
+    __pos__ = _forward(operator.pos)
+    __abs__ = _forward(abs)
+    __invert__ = _forward(operator.invert)
+    __int__ = _forward(int)
+    __float__ = _forward(float)
+    __complex__ = _forward(complex)
+    __index__ = _forward(operator.index)
+    __round__ = _forward(round)
+    __bytes__ = _forward(bytes)
+    __reversed__ = _forward(reversed)
+
+
+def is_lazy(x: object) -> bool:
+    """Whether ``x`` is a :class:`LazyObject`. Unlike :func:`isinstance`, this does not initialize ``x``."""
+    return type(x) is LazyObject
+
+
+def resolve(x: object) -> Any:
+    """Return the underlying object if ``x`` is a :class:`LazyObject` or :class:`Thunk`, initializing it if needed.
+
+    Otherwise, ``x`` is returned as-is.
+    """
+    if is_lazy(x):
+        return x._yahp_resolve()  # type: ignore
+    if isinstance(x, Thunk):
+        return x()
+    return x
@@ -2,15 +2,89 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
 import weakref
-from typing import Callable, Dict, MutableMapping
+from dataclasses import fields
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generic, List, MutableMapping, Optional, Tuple, Type, TypeVar
 
-from yahp.hparams import Hparams
+from yahp.hparams import Hparams, get_registry_version
+from yahp.lazy import LazyObject, is_lazy
+from yahp.utils.iter_helpers import list_to_deduplicated_dict
+from yahp.utils.registry_index import RegistryIndex, get_registry_index
 
-_initialized_object_to_hparams_instance: MutableMapping[object, Hparams] = weakref.WeakKeyDictionary()
-_object_registry_key_tracker: MutableMapping[int, MutableMapping[object, str]] = {}
+if TYPE_CHECKING:
+    from yahp.types import JSON
 
-__all__ = ['serialize', 'register_hparams_for_instance']
+TValue = TypeVar('TValue')
+
+
+class _IdentityWeakMap(Generic[TValue]):
+    """A mapping from objects, by identity, to values, which does not keep the objects alive.
+
+    Unlike :class:`weakref.WeakKeyDictionary`, the objects do not need to be hashable (e.g. dataclasses), and equal
+    objects are distinct keys. An entry is removed as soon as its object is garbage collected, so the memory is
+    bounded by the number of live objects, and the id of a collected object is never mistaken for a new object.
+    The objects must support weak references.
+    """
+
+    __slots__ = ('_data', '_remove', '__weakref__')
+
+    def __init__(self) -> None:
+        self._data: Dict[int, Tuple[weakref.ref, TValue]] = {}
+
+        def remove(key: int, ref: weakref.ref, self_ref: weakref.ref = weakref.ref(self)) -> None:
+            self = self_ref()
+            if self is not None:
+                entry = self._data.get(key)
+                # The id may already have been reused by a new object, in which case the entry must be kept
+                if entry is not None and entry[0] is ref:
+                    del self._data[key]
+
+        self._remove = remove
+
+    def get(self, obj: object) -> Optional[TValue]:
+        """Returns the value for ``obj``, or None if it has none."""
+        entry = self._data.get(id(obj))
+        if entry is None or entry[0]() is not obj:
+            return None
+        return entry[1]
+
+    def set(self, obj: object, value: TValue) -> None:
+        """Set the value for ``obj``.
+
+        Raises:
+            TypeError: If ``obj`` does not support weak references.
+        """
+        key = id(obj)
+        # A partial, rather than a ``weakref.KeyedRef``, as it is much faster to construct
+        self._data[key] = (weakref.ref(obj, functools.partial(self._remove, key)), value)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Maps each object created via yahp to the hparams it was created from
+_initialized_object_to_hparams_instance: _IdentityWeakMap[Hparams] = _IdentityWeakMap()
+
+# Maps each hparams instance to its fingerprint. Copies of an instance are distinct keys, so they do not share it.
+_fingerprint_cache: _IdentityWeakMap[str] = _IdentityWeakMap()
+
+# Maps each object created via yahp from an ``hparams_registry`` entry to the ((registry, key), ...) it was created
+# from. The registries are referenced by the entries, rather than by id, so an id cannot be reused while it is tracked.
+_object_registry_keys: _IdentityWeakMap[Tuple[Tuple[Dict[str, Callable], str], ...]] = _IdentityWeakMap()
+
+_ToDictSerializer = Callable[[Hparams], Dict[str, 'JSON']]
+
+# Maps each class to (registry version, hparams_registry, serializer) for its cached ``to_dict`` serializer
+_to_dict_serializer_cache: MutableMapping[type, Tuple[int, Any, _ToDictSerializer]] = weakref.WeakKeyDictionary()
+
+# Values of these exact types are serialized as-is, without any further checks
+_PRIMITIVE_TYPES = frozenset((str, float, bool, int, dict, type(None)))
+
+__all__ = ['serialize', 'register_hparams_for_instance', 'get_hparams_for_instance']
 
 
 def serialize(x: object):
@@ -23,28 +97,54 @@ def serialize(x: object):
     Returns:
         The serialization of ``x``, either as a dictionary or as a string.
     """
-    if not isinstance(x, Hparams):
+    # Check for lazy objects first, so they are serialized without being initialized
+    if is_lazy(x) or not isinstance(x, Hparams):
         # See if yahp knows the underlying hparams class
-        try:
-            hparams_instance = _initialized_object_to_hparams_instance[x]
-        except (TypeError, KeyError):
-            # TypeError is raised if x is not hashable
-            # KeyError is raised if it does not exist.
+        hparams_instance = _initialized_object_to_hparams_instance.get(x)
+        if hparams_instance is None:
             # Impossible to convert a class back into its hparams
             # Best that can be done is use the string representation
             return str(x)
-        else:
-            return hparams_instance.to_dict()
+        return hparams_instance.to_dict()
     return x.to_dict()
 
 
+def get_fingerprint(hparams: Hparams) -> str:
+    """Returns the fingerprint of ``hparams``. See :meth:`.Hparams.fingerprint`."""
+    fingerprint = _fingerprint_cache.get(hparams)
+    if fingerprint is None:
+        cls = type(hparams)
+        canonical = json.dumps(
+            [f'{cls.__module__}.{cls.__qualname__}', hparams.to_dict()],
+            sort_keys=True,
+            separators=(',', ':'),
+            ensure_ascii=False,
+            default=str,
+        )
+        fingerprint = hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+        _fingerprint_cache.set(hparams, fingerprint)
+    return fingerprint
+
+
 def get_key_for_instance_and_registry(instance: object, registry: Dict[str, Callable]):
-    try:
-        return _object_registry_key_tracker[id(registry)][instance]
-    except (KeyError, TypeError):
-        # TypeError is raised if x is not hashable
-        # KeyError is raised if it does not exist.
-        return None
+    registry_keys = _object_registry_keys.get(instance)
+    if registry_keys is not None:
+        for tracked_registry, key in registry_keys:
+            if tracked_registry is registry:
+                return key
+    return None
+
+
+def get_hparams_for_instance(instance: object) -> Optional[Hparams]:
+    """Returns the hparams registered for ``instance`` via :func:`register_hparams_for_instance`, if any.
+
+    Args:
+        instance (object): The instance.
+
+    Returns:
+        Optional[Hparams]: The hparams that ``instance`` was created from, or None if it is not known.
+    """
+    return _initialized_object_to_hparams_instance.get(instance)
 
 
 def register_hparams_for_instance(instance: object, hparams: Hparams):
@@ -52,16 +152,16 @@ def register_hparams_for_instance(instance: object, hparams: Hparams):
 
     This function associates the original hparams class for an instance, so it
     is possible to serialize the object to its YAML representation
-    via :func:`.serialize`.
+    via :func:`.serialize`. The association does not keep ``instance`` alive.
 
     Args:
         instance (object): The instance.
         hparams (Hparams): The hparams.
     """
     try:
-        _initialized_object_to_hparams_instance[instance] = hparams
+        _initialized_object_to_hparams_instance.set(instance, hparams)
     except TypeError:
-        # some types, such as dataclasses, are not hashable
+        # some types, such as ints and lists, cannot be weakly referenced
         # ignore it
         pass
 
@@ -71,18 +171,130 @@ def register_hparams_registry_key_for_instance(instance: object, registry: Dict[
 
     This function associates the key in an hparams registry for an instance, so it
     is possible to serialize the object to its YAML representation
-    via :func:`.serialize`.
+    via :func:`.serialize`. The association does not keep ``instance`` alive.
 
     Args:
         instance (object): The instance.
         registry (Dict[str, Dict[str, Callable]]): The registry.
         key (str): The key.
     """
-    if id(registry) not in _object_registry_key_tracker:
-        _object_registry_key_tracker[id(registry)] = weakref.WeakKeyDictionary()
+    registry_keys = _object_registry_keys.get(instance) or ()
+    registry_keys = tuple(x for x in registry_keys if x[0] is not registry) + ((registry, key),)
     try:
-        _object_registry_key_tracker[id(registry)][instance] = key
+        _object_registry_keys.set(instance, registry_keys)
     except TypeError:
-        # some types, such as dataclasses, are not hashable
+        # some types, such as ints and lists, cannot be weakly referenced
         # ignore it
         pass
+
+
+def _serialize_object(x: object) -> JSON:
+    # Equivalent to ``serialize(x)``, but uses the cached serializer for hparams that do not override ``to_dict``
+    if type(x) is not LazyObject and isinstance(x, Hparams) and type(x).to_dict is Hparams.to_dict:
+        return get_to_dict_serializer(type(x))(x)
+    return serialize(x)
+
+
+def is_primitive(x: object) -> bool:
+    """Returns whether ``x`` is a value that :meth:`.Hparams.to_dict` serializes as-is, without any further checks.
+
+    Such values are never hparams, nor objects created via yahp.
+    """
+    return type(x) in _PRIMITIVE_TYPES
+
+
+def serialize_field_value(x: object) -> JSON:
+    """Serialize ``x``, the value (or an item in the list value) of a field that is not in the ``hparams_registry``,
+    as in :meth:`.Hparams.to_dict`.
+
+    Args:
+        x (object): The value.
+
+    Returns:
+        JSON: The serialized value.
+    """
+    x_type = type(x)
+    if x_type in _PRIMITIVE_TYPES:
+        return x  # type: ignore
+    # Lazy objects are checked by type, so they are serialized without being initialized
+    if x_type is LazyObject:
+        return serialize(x)
+    if isinstance(x, Enum):
+        return x.name
+    if isinstance(x, (str, float, bool, int, dict)):
+        return x
+    return _serialize_object(x)
+
+
+def _serialize_list_or_value(attr: object) -> JSON:
+    if type(attr) is not LazyObject and isinstance(attr, list):
+        return [serialize_field_value(x) for x in attr]
+    return serialize_field_value(attr)
+
+
+class _RegistryFieldSerializer:
+    """Serializes the value of a field in the ``hparams_registry``, keyed by its registry key."""
+
+    __slots__ = ('registry', 'registry_index')
+
+    def __init__(self, registry_index: RegistryIndex) -> None:
+        self.registry = registry_index.registry
+        self.registry_index = registry_index
+
+    def _serialize_item(self, x: object) -> JSON:
+        key = get_key_for_instance_and_registry(x, self.registry)
+        if key is None:
+            key = self.registry_index.get_key(type(x))
+        if key is None:
+            # Cannot determine the key from the type
+            return _serialize_object(x)
+        return {key: _serialize_object(x)}
+
+    def __call__(self, attr: object) -> JSON:
+        # Lazy objects are checked first, so they are serialized without being initialized
+        if type(attr) is not LazyObject and isinstance(attr, list):
+            return list_to_deduplicated_dict([self._serialize_item(x) for x in attr])  # type: ignore
+        return self._serialize_item(attr)
+
+
+def _build_to_dict_serializer(cls: Type[Hparams]) -> _ToDictSerializer:
+    registry = cls.hparams_registry
+    field_serializers: List[Tuple[str, Callable[[Any], JSON]]] = []
+    for f in fields(cls):
+        if not f.init:
+            continue
+        if registry is not None and f.name in registry:
+            field_serializers.append((f.name, _RegistryFieldSerializer(get_registry_index(cls, f.name))))
+        else:
+            # If it's not in the registry, then it must be specific
+            field_serializers.append((f.name, _serialize_list_or_value))
+
+    def to_dict(instance: Hparams) -> Dict[str, JSON]:
+        res: Dict[str, JSON] = {}
+        for name, serialize_field in field_serializers:
+            attr = getattr(instance, name)
+            res[name] = None if attr is None else serialize_field(attr)
+        return res
+
+    return to_dict
+
+
+def get_to_dict_serializer(cls: Type[Hparams]) -> _ToDictSerializer:
+    """Returns the cached function that implements :meth:`.Hparams.to_dict` for instances of ``cls``.
+
+    The fields of the class, and which are in the registry, are resolved once, so serializing an instance only has
+    to check the values. The serializer is rebuilt if the registry is modified via
+    :meth:`.Hparams.register_class` or reassigned.
+
+    Args:
+        cls (Type[Hparams]): The hparams class.
+
+    Returns:
+        Callable[[Hparams], Dict[str, JSON]]: The serializer.
+    """
+    version = get_registry_version()
+    cached = _to_dict_serializer_cache.get(cls)
+    if cached is None or cached[0] != version or cached[1] is not cls.hparams_registry:
+        cached = (version, cls.hparams_registry, _build_to_dict_serializer(cls))
+        _to_dict_serializer_cache[cls] = cached
+    return cached[2]
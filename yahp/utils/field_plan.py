@@ -0,0 +1,124 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+"""Cached, per-class introspection of :class:`~yahp.hparams.Hparams` fields."""
+
+from __future__ import annotations
+
+import weakref
+from dataclasses import Field, dataclass, fields
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, Mapping, MutableMapping, Optional, Tuple, Type, get_type_hints
+
+from yahp.utils.type_helpers import HparamsType, get_default_value, is_field_required
+
+__all__ = ['FieldPlan', 'HparamsPlan', 'get_hparams_plan', 'clear_hparams_plan_cache']
+
+
+@dataclass(frozen=True)
+class FieldPlan:
+    """The resolved type, requiredness, documentation, and registry for a field of an
+    :class:`~yahp.hparams.Hparams` class.
+
+    Attributes:
+        name (str): The field name.
+        field (Field): The dataclass field.
+        annotation (type): The resolved type annotation for the field.
+        hparams_type (HparamsType): The parsed type annotation.
+        required (bool): Whether the field is required (i.e. does not have a default value).
+        doc (str, optional): The documentation for the field, if any.
+        registry (Dict[str, Callable], optional): The ``hparams_registry`` entry for the field,
+            or None if the field is not in the registry.
+    """
+    name: str
+    field: Field
+    annotation: Any
+    hparams_type: HparamsType
+    required: bool
+    doc: Optional[str]
+    registry: Optional[Dict[str, Callable]]
+
+    def get_default_value(self) -> Any:
+        """Returns an instance of the default value for the field.
+
+        The default is not cached, as a ``default_factory`` may return a new object on each invocation.
+        """
+        return get_default_value(self.field)
+
+
+@dataclass(frozen=True)
+class HparamsPlan:
+    """The :class:`FieldPlan` for every ``init`` field of an :class:`~yahp.hparams.Hparams` class.
+
+    Attributes:
+        fields (Tuple[FieldPlan, ...]): Plans for the ``init`` fields, in declaration order.
+        by_name (Mapping[str, FieldPlan]): Plans for the ``init`` fields, indexed by field name.
+        names (FrozenSet[str]): The names of the ``init`` fields.
+        required_names (FrozenSet[str]): The names of the required ``init`` fields.
+        hparams_registry (Dict[str, Dict[str, Callable]], optional): The registry the plan was built from.
+    """
+    fields: Tuple[FieldPlan, ...]
+    by_name: Mapping[str, FieldPlan]
+    names: FrozenSet[str]
+    required_names: FrozenSet[str]
+    hparams_registry: Optional[Dict[str, Dict[str, Callable]]]
+
+
+_hparams_plan_cache: MutableMapping[type, HparamsPlan] = weakref.WeakKeyDictionary()
+
+
+def _build_hparams_plan(cls: Type[Any]) -> HparamsPlan:
+    registry = cls.hparams_registry
+    type_hints = get_type_hints(cls)
+    field_plans = []
+    for f in fields(cls):
+        if not f.init:
+            continue
+        field_plans.append(
+            FieldPlan(
+                name=f.name,
+                field=f,
+                annotation=type_hints[f.name],
+                hparams_type=HparamsType(type_hints[f.name]),
+                required=is_field_required(f),
+                doc=f.metadata.get('doc'),
+                registry=registry[f.name] if registry is not None and f.name in registry else None,
+            ))
+    return HparamsPlan(
+        fields=tuple(field_plans),
+        by_name=MappingProxyType({x.name: x for x in field_plans}),
+        names=frozenset(x.name for x in field_plans),
+        required_names=frozenset(x.name for x in field_plans if x.required),
+        hparams_registry=registry,
+    )
+
+
+def get_hparams_plan(cls: Type[Any]) -> HparamsPlan:
+    """Returns the cached :class:`HparamsPlan` for an :class:`~yahp.hparams.Hparams` class.
+
+    The plan is built on first use. It is rebuilt if ``cls.hparams_registry`` is reassigned; entries added to
+    an existing registry (e.g. via :meth:`~yahp.hparams.Hparams.register_class`) are visible without a rebuild,
+    as the plan references the registry dictionaries directly.
+
+    Args:
+        cls (Type[Hparams]): The hparams class.
+
+    Returns:
+        HparamsPlan: The plan for ``cls``.
+    """
+    plan = _hparams_plan_cache.get(cls)
+    if plan is None or plan.hparams_registry is not cls.hparams_registry:
+        plan = _build_hparams_plan(cls)
+        _hparams_plan_cache[cls] = plan
+    return plan
+
+
+def clear_hparams_plan_cache(cls: Optional[Type[Any]] = None) -> None:
+    """Invalidate the plans cached by :func:`get_hparams_plan`.
+
+    Args:
+        cls (Type[Hparams], optional): If specified, only invalidate the plan for this class.
+            Otherwise, invalidate all plans.
+    """
+    if cls is None:
+        _hparams_plan_cache.clear()
+    else:
+        _hparams_plan_cache.pop(cls, None)
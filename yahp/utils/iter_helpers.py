@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Dict, List, Tuple, TypeVar, Union, cast
+import collections
+import concurrent.futures
+import itertools
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, Iterator, List, Tuple, TypeVar, Union, cast
 
 if TYPE_CHECKING:
     from yahp.types import JSON
@@ -34,6 +37,56 @@ def ensure_tuple(x: Union[T, Tuple[T, ...], List[T], Dict[Any, T]]) -> Tuple[T,
 
 K = TypeVar('K')
 V = TypeVar('V')
+R = TypeVar('R')
+
+
+def _apply_to_chunk(fn: Callable[[T], R], chunk: List[T]) -> List[R]:
+    return [fn(x) for x in chunk]
+
+
+def executor_map_bounded(
+    executor: concurrent.futures.Executor,
+    fn: Callable[[T], R],
+    iterable: Iterable[T],
+    *,
+    max_pending: int,
+    chunksize: int = 1,
+) -> Iterator[R]:
+    """Like :meth:`concurrent.futures.Executor.map`, but only submits work as the results are consumed.
+
+    :meth:`~concurrent.futures.Executor.map` consumes all of ``iterable`` and submits every item upfront, so it
+    holds every future and result in memory, and never returns for an unbounded iterable. Instead, at most
+    ``max_pending`` chunks of ``chunksize`` items are submitted ahead of the item being yielded.
+
+    Args:
+        executor (concurrent.futures.Executor): The executor. For process pools, ``fn`` and the items must be
+            picklable.
+        fn (Callable): The function to apply to each item.
+        iterable (Iterable): The items.
+        max_pending (int): The maximum number of chunks that are submitted but not yet yielded.
+        chunksize (int, optional): The number of items submitted to the executor at a time. (default: ``1``)
+
+    Returns:
+        Iterator: An iterator over ``fn(item)`` for each item, in order.
+    """
+    if max_pending < 1:
+        raise ValueError(f'max_pending must be positive; got {max_pending}')
+    if chunksize < 1:
+        raise ValueError(f'chunksize must be positive; got {chunksize}')
+    items = iter(iterable)
+    # If the iterator is closed early, the pending chunks are left to finish, rather than cancelled, as cancelling
+    # queued work can hang the shutdown of a ``ProcessPoolExecutor`` on some Python versions. At most
+    # ``max_pending`` chunks are wasted.
+    pending: Deque[concurrent.futures.Future] = collections.deque()
+    while True:
+        while len(pending) < max_pending:
+            chunk = list(itertools.islice(items, chunksize))
+            if not chunk:
+                break
+            pending.append(executor.submit(_apply_to_chunk, fn, chunk))
+        if not pending:
+            return
+        yield from pending.popleft().result()
 
 
 def extract_only_item_from_dict(val: Dict[K, V]) -> Tuple[K, V]:
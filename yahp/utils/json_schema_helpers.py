@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import copy
+import functools
 import inspect
 import re
 from enum import Enum
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Pattern
+
+import jsonschema
 
 from yahp.utils import type_helpers
 
@@ -146,3 +149,36 @@ def _check_for_list_and_optional(f_type: type_helpers.HparamsType, schema: Dict[
         res['oneOf'].append({'type': 'null'})
 
     return res
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_pattern(pattern: str) -> Pattern:
+    return re.compile(pattern)
+
+
+def _pattern(validator: Any, pattern: str, instance: Any, schema: Dict[str, Any]) -> Iterator[Any]:
+    # Same as the jsonschema ``pattern`` keyword, but compiles each pattern once, rather than relying on the
+    # bounded cache of the re module
+    if validator.is_type(instance, 'string') and not _compile_pattern(pattern).search(instance):
+        yield jsonschema.ValidationError(f'{instance!r} does not match {pattern!r}')
+
+
+def get_validator(schema: Dict[str, Any]) -> Any:
+    """Check ``schema``, and return a validator for it.
+
+    The validator class is chosen from the schema's ``$schema``, as in :func:`jsonschema.validate`, and extended to
+    compile each ``pattern`` (e.g. for the case-insensitive enums) only once.
+
+    Args:
+        schema (Dict[str, Any]): The JSON schema. It must not be modified while the validator is in use.
+
+    Raises:
+        jsonschema.SchemaError: If the schema is invalid.
+
+    Returns:
+        jsonschema.protocols.Validator: The validator.
+    """
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    validator_cls = jsonschema.validators.extend(validator_cls, {'pattern': _pattern})
+    return validator_cls(schema)
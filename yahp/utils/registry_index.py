@@ -0,0 +1,101 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+"""Class-to-key indices of the entries of an ``hparams_registry``, for finding the key of a class without inverting
+the registry."""
+
+from __future__ import annotations
+
+import weakref
+from typing import Callable, Dict, List, MutableMapping, Optional, Tuple
+
+__all__ = ['RegistryIndex', 'get_registry_index', 'clear_registry_indices']
+
+
+class RegistryIndex:
+    """Maps each class (or callable) in an ``hparams_registry`` entry to the keys it is registered under.
+
+    Use :func:`get_registry_index` to get the index for a field of an hparams class. The index is kept up to date by
+    :meth:`.Hparams.register_class`. If the registry is modified directly, then the index is rebuilt when its size
+    no longer matches the registry, or when a looked-up key no longer maps to the class. For other direct
+    modifications (e.g. replacing the class for an existing key), call :func:`.clear_json_schema_cache`.
+
+    Args:
+        registry (Dict[str, Callable]): The registry entry, which maps keys to classes.
+    """
+
+    __slots__ = ('registry', '_keys', '_size')
+
+    def __init__(self, registry: Dict[str, Callable]) -> None:
+        self.registry = registry
+        self._keys: Dict[Callable, List[str]] = {}
+        self._size = 0
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        self._keys = {}
+        for key, constructor in self.registry.items():
+            self._keys.setdefault(constructor, []).append(key)
+        self._size = len(self.registry)
+
+    def add(self, key: str, constructor: Callable) -> None:
+        """Update the index after ``registry[key] = constructor`` is added to the registry."""
+        if self._size != len(self.registry) - 1:
+            # The registry was also modified directly
+            self._rebuild()
+            return
+        self._keys.setdefault(constructor, []).append(key)
+        self._size += 1
+
+    def _get_valid_keys(self, constructor: Callable) -> Optional[List[str]]:
+        if self._size != len(self.registry):
+            self._rebuild()
+        keys = self._keys.get(constructor)
+        if keys is not None and self.registry.get(keys[-1]) is not constructor:
+            self._rebuild()
+            keys = self._keys.get(constructor)
+        return keys
+
+    def get_keys(self, constructor: Callable) -> Tuple[str, ...]:
+        """Returns every key that ``constructor`` is registered under, in registration order."""
+        keys = self._get_valid_keys(constructor)
+        return () if keys is None else tuple(keys)
+
+    def get_key(self, constructor: Callable) -> Optional[str]:
+        """Returns the key for ``constructor``, or None if it is not in the registry.
+
+        If ``constructor`` is registered under several keys, the most recently registered key is returned.
+        """
+        keys = self._get_valid_keys(constructor)
+        return None if keys is None else keys[-1]
+
+
+# Maps each hparams class to the indices of its registry entries, by field name. The indices are stored per class,
+# rather than keyed by the (unhashable, not weakly referenceable) registry dicts, so they are released with the class.
+_registry_indices: MutableMapping[type, Dict[str, RegistryIndex]] = weakref.WeakKeyDictionary()
+
+
+def get_registry_index(cls: type, field_name: str) -> RegistryIndex:
+    """Returns the :class:`RegistryIndex` for ``cls.hparams_registry[field_name]``, building it on first use.
+
+    Args:
+        cls (type): The hparams class that owns the registry.
+        field_name (str): The name of the field in the registry.
+
+    Returns:
+        RegistryIndex: The index.
+    """
+    registry = cls.hparams_registry[field_name]  # type: ignore
+    indices = _registry_indices.get(cls)
+    if indices is None:
+        indices = {}
+        _registry_indices[cls] = indices
+    index = indices.get(field_name)
+    if index is None or index.registry is not registry:
+        # Not built yet, or the registry was reassigned
+        index = RegistryIndex(registry)
+        indices[field_name] = index
+    return index
+
+
+def clear_registry_indices() -> None:
+    """Discard every :class:`RegistryIndex`, so they are rebuilt on next use."""
+    _registry_indices.clear()
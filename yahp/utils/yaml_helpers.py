@@ -0,0 +1,260 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+"""YAML loading and dumping, using the libyaml C bindings when available.
+
+PyYAML ships pure-Python and libyaml-backed (C) implementations of each loader and dumper, which produce the
+same results, but the C implementations are much faster. The C implementations are used if PyYAML was built
+with libyaml; otherwise, the pure-Python implementations are used.
+
+To force one or the other, set the ``YAHP_YAML_IMPL`` environment variable to ``'c'`` or ``'python'`` before
+importing yahp, or call :func:`set_yaml_implementation`.
+
+:func:`dump` and :func:`dump_indented` also have a fast path for the data that configs are made of -- dictionaries
+with string keys, lists, and simple scalars -- which writes the YAML directly, without going through PyYAML. It
+produces the same output as :func:`yaml.dump`; data that it cannot handle identically is dumped by PyYAML.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import re
+import textwrap
+from typing import IO, Any, Iterator, List, Optional, Set, Union
+
+import yaml
+import yaml.resolver
+
+__all__ = [
+    'full_load', 'full_load_all', 'safe_load', 'dump', 'dump_indented', 'get_yaml_implementation',
+    'set_yaml_implementation'
+]
+
+_YAML_IMPLEMENTATIONS = ('auto', 'c', 'python')
+
+try:
+    from yaml import CDumper, CFullLoader, CSafeLoader
+except ImportError:
+    _has_libyaml = False
+else:
+    _has_libyaml = True
+
+_FullLoader: Any = yaml.FullLoader
+_SafeLoader: Any = yaml.SafeLoader
+_Dumper: Any = yaml.Dumper
+_implementation = 'python'
+
+
+def get_yaml_implementation() -> str:
+    """Returns the YAML implementation in use: ``'c'`` (libyaml) or ``'python'``."""
+    return _implementation
+
+
+def set_yaml_implementation(implementation: str) -> None:
+    """Set the YAML implementation used to load and dump YAML.
+
+    Args:
+        implementation (str): One of ``'auto'`` (use libyaml if available), ``'c'`` (require libyaml), or
+            ``'python'`` (use the pure-Python implementation).
+
+    Raises:
+        ValueError: If ``implementation`` is ``'c'`` and PyYAML was built without libyaml.
+    """
+    global _FullLoader, _SafeLoader, _Dumper, _implementation
+    if implementation not in _YAML_IMPLEMENTATIONS:
+        raise ValueError(f'The YAML implementation must be one of {_YAML_IMPLEMENTATIONS}; got {implementation!r}')
+    if implementation == 'c' and not _has_libyaml:
+        raise ValueError('The C YAML implementation was requested, but PyYAML was built without libyaml.')
+    if implementation == 'python' or not _has_libyaml:
+        _FullLoader, _SafeLoader, _Dumper = yaml.FullLoader, yaml.SafeLoader, yaml.Dumper
+        _implementation = 'python'
+    else:
+        _FullLoader, _SafeLoader, _Dumper = CFullLoader, CSafeLoader, CDumper
+        _implementation = 'c'
+
+
+def full_load(stream: Union[str, bytes, IO]) -> Any:
+    """Equivalent to :func:`yaml.full_load`, but uses libyaml if available."""
+    return yaml.load(stream, Loader=_FullLoader)
+
+
+def full_load_all(stream: Union[str, bytes, IO]) -> Iterator[Any]:
+    """Equivalent to :func:`yaml.full_load_all`, but uses libyaml if available.
+
+    Documents are parsed lazily, one at a time, as the iterator is consumed.
+    """
+    return yaml.load_all(stream, Loader=_FullLoader)
+
+
+def safe_load(stream: Union[str, bytes, IO]) -> Any:
+    """Equivalent to :func:`yaml.safe_load`, but uses libyaml if available."""
+    return yaml.load(stream, Loader=_SafeLoader)
+
+
+def dump(data: Any, stream: Optional[IO] = None, **kwargs: Any) -> Any:
+    """Equivalent to :func:`yaml.dump`, but uses libyaml if available.
+
+    If no ``kwargs`` are given, and ``data`` is a dictionary that the fast path supports, the YAML is written
+    directly, without going through PyYAML.
+
+    Args:
+        data (Any): The data to dump.
+        stream (IO, optional): If specified, the stream to write to. Otherwise, the YAML is returned as a string.
+        **kwargs: Extra arguments to pass into :func:`yaml.dump`.
+    """
+    if not kwargs:
+        lines = _emit_document(data)
+        if lines is not None:
+            text = '\n'.join(lines) + '\n'
+            if stream is None:
+                return text
+            stream.write(text)
+            return None
+    kwargs.setdefault('Dumper', _Dumper)
+    return yaml.dump(data, stream, **kwargs)
+
+
+def dump_indented(data: Any, prefix: str) -> str:
+    """Equivalent to ``textwrap.indent(dump(data).strip(), prefix)``, but faster.
+
+    Args:
+        data (Any): The data to dump.
+        prefix (str): The prefix for each (non-blank) line.
+    """
+    lines = _emit_document(data)
+    if lines is None:
+        return textwrap.indent(dump(data).strip(), prefix)
+    return '\n'.join(prefix + line for line in lines)
+
+
+# The line width at which PyYAML folds plain scalars that contain spaces
+_BEST_WIDTH = 80
+
+# The longest string key that PyYAML writes as a simple (``key: value``) key. PyYAML counts the length of the
+# (implicit, so unwritten) ``!!str`` tag towards its limit of 127 characters.
+_MAX_SIMPLE_KEY_LENGTH = 122
+
+# Strings that may be plain scalars, if they are not resolved to another type (e.g. ``true`` or ``1e5``): they
+# start with a character that is not a YAML indicator, and contain no characters that could start a comment, end
+# a key, or need escaping. Single spaces between words are allowed; see ``_format_str``.
+_PLAIN_STR_RE = re.compile(r'[A-Za-z0-9_][A-Za-z0-9_./+=-]*(?: [A-Za-z0-9_./+=-]+)*\Z')
+
+_STR_TAG = 'tag:yaml.org,2002:str'
+
+_resolver = yaml.resolver.Resolver()
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_plain_str(value: str) -> bool:
+    return (_PLAIN_STR_RE.match(value) is not None and _resolver.resolve(yaml.ScalarNode, value,
+                                                                         (True, False)) == _STR_TAG)
+
+
+def _format_float(value: float) -> str:
+    # Same as ``yaml.representer.SafeRepresenter.represent_float``
+    if value != value:
+        return '.nan'
+    if value == float('inf'):
+        return '.inf'
+    if value == -float('inf'):
+        return '-.inf'
+    text = repr(value).lower()
+    if '.' not in text and 'e' in text:
+        text = text.replace('e', '.0e', 1)
+    return text
+
+
+class _Unsupported(Exception):
+    """Raised by the fast path for data that it does not dump identically to PyYAML."""
+
+
+class _Emitter:
+    """Writes YAML for dictionaries, lists, and scalars, in the block style of :func:`yaml.dump`.
+
+    The output is a list of lines. Anything whose formatting depends on more than the value and its column -- such as
+    strings that must be quoted, or a list or dictionary that appears more than once (which PyYAML writes as an
+    anchor and alias) -- raises :class:`_Unsupported`.
+    """
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self._seen: Set[int] = set()
+
+    def _check_collection(self, value: Any) -> None:
+        if id(value) in self._seen:
+            raise _Unsupported
+        self._seen.add(id(value))
+
+    def _format_scalar(self, value: Any, column: int) -> Optional[str]:
+        # Returns the scalar as it would be written at ``column``, or None if ``value`` is a non-empty collection
+        value_type = type(value)
+        if value_type is str:
+            if not _is_plain_str(value) or (' ' in value and column + len(value) > _BEST_WIDTH):
+                raise _Unsupported
+            return value
+        if value_type is bool:
+            return 'true' if value else 'false'
+        if value_type is int:
+            return str(value)
+        if value_type is float:
+            return _format_float(value)
+        if value is None:
+            return 'null'
+        if value_type is dict or value_type is list:
+            self._check_collection(value)
+            if len(value) == 0:
+                return '{}' if value_type is dict else '[]'
+            return None
+        raise _Unsupported
+
+    def _format_key(self, key: Any) -> str:
+        if type(key) is not str or len(key) > _MAX_SIMPLE_KEY_LENGTH or not _is_plain_str(key):
+            raise _Unsupported
+        return key
+
+    def emit_mapping(self, mapping: dict, indent: int, line: str) -> None:
+        # ``line`` is the start of the line for the first key, e.g. ``'- '`` for a mapping in a sequence
+        # The keys are checked before they are sorted, as keys of mixed types cannot be sorted
+        for key in sorted([self._format_key(key) for key in mapping]):
+            key_text = line + key + ':'
+            value = mapping[key]
+            scalar = self._format_scalar(value, len(key_text) + 1)
+            if scalar is not None:
+                self.lines.append(key_text + ' ' + scalar)
+            elif type(value) is dict:
+                self.lines.append(key_text)
+                self.emit_mapping(value, indent + 2, ' ' * (indent + 2))
+            else:
+                # Sequences in a mapping are not indented
+                self.lines.append(key_text)
+                self.emit_sequence(value, indent, ' ' * indent)
+            line = ' ' * indent
+
+    def emit_sequence(self, sequence: list, indent: int, line: str) -> None:
+        # ``line`` is the start of the line for the first item
+        for item in sequence:
+            item_line = line + '- '
+            scalar = self._format_scalar(item, len(item_line))
+            if scalar is not None:
+                self.lines.append(item_line + scalar)
+            elif type(item) is dict:
+                self.emit_mapping(item, indent + 2, item_line)
+            else:
+                self.emit_sequence(item, indent + 2, item_line)
+            line = ' ' * indent
+
+
+def _emit_document(data: Any) -> Optional[List[str]]:
+    # Returns the lines of ``yaml.dump(data)``, or None if the fast path does not support ``data``
+    if type(data) is not dict:
+        return None
+    emitter = _Emitter()
+    try:
+        if emitter._format_scalar(data, 0) is not None:
+            return ['{}']
+        emitter.emit_mapping(data, 0, '')
+    except _Unsupported:
+        return None
+    return emitter.lines
+
+
+set_yaml_implementation(os.environ.get('YAHP_YAML_IMPL', 'auto'))
@@ -0,0 +1,248 @@
+# Copyright 2021 MosaicML. All Rights Reserved.
+"""Bulk validation of YAML files against the JSON schema of a class, e.g. for validating configs in CI.
+
+This module is also the ``yahp-validate`` console script:
+
+.. code-block:: console
+
+    $ yahp-validate my_package.hparams:TrainerHparams configs/ --jobs 8
+
+It validates every YAML file under the given files and directories, and prints a JSON summary to stdout. The exit
+code is 0 if every file is valid, and 1 otherwise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import fnmatch
+import importlib
+import json
+import os
+import pathlib
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Type, Union
+
+import jsonschema
+
+from yahp.auto_hparams import ensure_hparams_cls
+from yahp.hparams import Hparams
+from yahp.inheritance import load_yaml_with_inheritance
+from yahp.utils.iter_helpers import executor_map_bounded
+
+__all__ = ['FileValidationResult', 'find_yaml_files', 'validate_files', 'main']
+
+_DEFAULT_PATTERNS = ('*.yaml', '*.yml')
+
+# The hparams class for the current worker process. Set by ``_init_worker``.
+_worker_hparams_cls: Optional[Type[Hparams]] = None
+
+# With worker processes, the number of chunks per worker that are submitted ahead of the results being consumed
+_PENDING_CHUNKS_PER_WORKER = 2
+
+
+class FileValidationResult(NamedTuple):
+    """The result of validating a YAML file with :func:`validate_files`.
+
+    Attributes:
+        path (str): The path to the YAML file.
+        error (str, optional): The error message, or None if the file is valid.
+        location (str, optional): For schema violations, the dotted path to the invalid value within the file
+            (``''`` for the top level). None if the file is valid, or if it could not be loaded.
+    """
+    path: str
+    error: Optional[str] = None
+    location: Optional[str] = None
+
+    @property
+    def valid(self) -> bool:
+        """Whether the file is valid."""
+        return self.error is None
+
+
+def find_yaml_files(paths: Iterable[Union[str, pathlib.PurePath]],
+                    patterns: Sequence[str] = _DEFAULT_PATTERNS) -> List[str]:
+    """Find the YAML files in a list of files and directories.
+
+    Files are included as-is. Directories are searched recursively for files whose name matches any of
+    ``patterns``, in sorted order.
+
+    Args:
+        paths (Iterable[str | pathlib.PurePath]): Files and directories.
+        patterns (Sequence[str], optional): Filename patterns, as for :func:`fnmatch.fnmatch`, to match within
+            directories. (default: ``('*.yaml', '*.yml')``)
+
+    Returns:
+        List[str]: The paths to the YAML files.
+    """
+    files: List[str] = []
+    for path in paths:
+        path = str(path)
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        found: List[str] = []
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                if any(fnmatch.fnmatch(filename, pattern) for pattern in patterns):
+                    found.append(os.path.join(dirpath, filename))
+        files.extend(sorted(found))
+    return files
+
+
+def _validate_file(hparams_cls: Type[Hparams], path: str) -> FileValidationResult:
+    try:
+        data = load_yaml_with_inheritance(path, cache='process')
+    except Exception as e:
+        return FileValidationResult(path, error=f'{type(e).__name__}: {e}')
+    error = jsonschema.exceptions.best_match(hparams_cls.get_validator().iter_errors(data))
+    if error is None:
+        return FileValidationResult(path)
+    return FileValidationResult(path, error=error.message, location='.'.join(str(x) for x in error.absolute_path))
+
+
+def _init_worker(constructor: Callable) -> None:
+    global _worker_hparams_cls
+    _worker_hparams_cls = ensure_hparams_cls(constructor)
+    # Build the schema and validator once per worker, rather than on the first file
+    _worker_hparams_cls.get_validator()
+
+
+def _validate_in_worker(path: str) -> FileValidationResult:
+    assert _worker_hparams_cls is not None, 'the worker was not initialized'
+    return _validate_file(_worker_hparams_cls, path)
+
+
+def validate_files(
+    constructor: Callable,
+    paths: Iterable[Union[str, pathlib.PurePath]],
+    *,
+    num_workers: int = 0,
+    chunksize: int = 16,
+) -> Iterator[FileValidationResult]:
+    """Validate many YAML files against the JSON schema of a class.
+
+    Each file is loaded with inheritance resolved (see :func:`.load_yaml_with_inheritance`, with
+    ``cache='process'``), and validated with :meth:`.Hparams.get_validator`, so the schema is built only once per
+    process. Unlike :meth:`.Hparams.validate_yaml`, errors are reported rather than raised, and files that cannot be
+    loaded are reported as invalid.
+
+    Args:
+        constructor (type | callable): The :class:`.Hparams` class, or a class or function that
+            :func:`.ensure_hparams_cls` accepts.
+        paths (Iterable[str | pathlib.PurePath]): The YAML files to validate.
+        num_workers (int, optional): If positive, validate the files in a pool of this many worker processes.
+            The ``constructor`` must be picklable. (default: ``0``, to validate the files in this process)
+        chunksize (int, optional): When using worker processes, the number of files sent to a worker at a time.
+            (default: ``16``)
+
+    Returns:
+        Iterator[FileValidationResult]: An iterator over the results, in the same order as ``paths``.
+    """
+    if num_workers < 0:
+        raise ValueError(f'num_workers must be non-negative; got {num_workers}')
+    if chunksize < 1:
+        raise ValueError(f'chunksize must be positive; got {chunksize}')
+    paths = (str(path) for path in paths)
+    if num_workers == 0:
+        hparams_cls = ensure_hparams_cls(constructor)
+        return (_validate_file(hparams_cls, path) for path in paths)
+    return _validate_files_in_pool(constructor, paths, num_workers=num_workers, chunksize=chunksize)
+
+
+def _validate_files_in_pool(
+    constructor: Callable,
+    paths: Iterable[str],
+    *,
+    num_workers: int,
+    chunksize: int,
+) -> Iterator[FileValidationResult]:
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=num_workers,
+            initializer=_init_worker,
+            initargs=(constructor,),
+    ) as executor:
+        yield from executor_map_bounded(
+            executor,
+            _validate_in_worker,
+            paths,
+            max_pending=num_workers * _PENDING_CHUNKS_PER_WORKER,
+            chunksize=chunksize,
+        )
+
+
+def _import_constructor(target: str) -> Callable:
+    module_name, sep, qualname = target.partition(':')
+    if not sep or not module_name or not qualname:
+        raise ValueError(f'The class must be specified as module:Class; got {target!r}')
+    obj: Any = importlib.import_module(module_name)
+    for attr in qualname.split('.'):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='yahp-validate',
+        description='Validate YAML files, with inheritance resolved, against the JSON schema of a class.',
+    )
+    parser.add_argument('target', help='The class to validate against, as module:Class.')
+    parser.add_argument('paths', nargs='+', help='YAML files, or directories to search recursively for YAML files.')
+    parser.add_argument('-j',
+                        '--jobs',
+                        type=int,
+                        default=1,
+                        help='The number of worker processes. 1 validates in this process. (default: 1)')
+    parser.add_argument('--chunksize',
+                        type=int,
+                        default=16,
+                        help='The number of files sent to a worker process at a time. (default: 16)')
+    parser.add_argument('--pattern',
+                        action='append',
+                        dest='patterns',
+                        help='Filename pattern to match within directories. Can be repeated. '
+                        f'(default: {" ".join(_DEFAULT_PATTERNS)})')
+    return parser
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    """Entry point for the ``yahp-validate`` console script.
+
+    Args:
+        args (Sequence[str], optional): The command-line arguments. (default: ``sys.argv[1:]``)
+
+    Returns:
+        int: The exit code: 0 if every file is valid, and 1 otherwise.
+    """
+    parser = _get_parser()
+    parsed = parser.parse_args(args)
+    if parsed.jobs < 1:
+        parser.error(f'--jobs must be positive; got {parsed.jobs}')
+    if parsed.chunksize < 1:
+        parser.error(f'--chunksize must be positive; got {parsed.chunksize}')
+    try:
+        constructor = _import_constructor(parsed.target)
+    except (ImportError, AttributeError, ValueError) as e:
+        parser.error(f'Could not import {parsed.target!r}: {e}')
+    paths = find_yaml_files(parsed.paths, parsed.patterns or _DEFAULT_PATTERNS)
+    num_workers = parsed.jobs if parsed.jobs > 1 else 0
+    results = list(validate_files(constructor, paths, num_workers=num_workers, chunksize=parsed.chunksize))
+    errors: List[Dict[str, Any]] = [{
+        'path': result.path,
+        'error': result.error,
+        'location': result.location,
+    } for result in results if not result.valid]
+    summary = {
+        'class': parsed.target,
+        'total': len(results),
+        'valid': len(results) - len(errors),
+        'invalid': len(errors),
+        'errors': errors,
+    }
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())